@@ -0,0 +1,283 @@
+"""
+Append-only activity log behind the learning streak.
+
+Every Skill change that matters for learning (created, deleted, hours or
+status changed) becomes an ActivityEvent of the skill's owner. Creates and
+updates also roll up into one ActivityDay row per user and date and into
+the day/week/month rollups of skills/analytics.py. The streak fields on the
+user's UserProfile are derived from their day rows and only move when a new
+day is inserted, so concurrent writers on the same day never touch the
+profile at all.
+"""
+import time
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import analytics, http_cache
+from .models import ActivityDay, ActivityEvent, UserProfile
+
+
+LEARNING_KINDS = ('created', 'updated')
+LOCK_RETRIES = 5
+LOCK_BACKOFF_SECONDS = 0.05
+
+
+def _hours(value):
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+
+def build_events(owner_id, changes, day=None):
+    """
+    Turns (before, after) snapshots of one user's skills into unsaved ActivityEvents.
+    Updates that leave hours and status alone (notes, AI fields...) are not
+    activity and produce no event. Events are dated `day` (today by
+    default), except creates, which fall on the skill's created_date so
+    imported skills land on their historical day.
+    """
+    today = day or timezone.localdate()
+    now = timezone.now()
+    events = []
+    for before, after in changes:
+        if before is None and after is None:
+            continue
+        event_day = today
+        if before is None:
+            kind, delta = 'created', _hours(after['hours_spent'])
+            if day is None and after.get('created_date') is not None:
+                event_day = timezone.localdate(after['created_date'])
+        elif after is None:
+            kind, delta = 'deleted', -_hours(before['hours_spent'])
+        else:
+            delta = _hours(after['hours_spent']) - _hours(before['hours_spent'])
+            if not delta and before['status'] == after['status']:
+                continue
+            kind = 'updated'
+
+        events.append(ActivityEvent(
+            owner_id=owner_id,
+            skill_id=(after or before)['id'],
+            skill_name=(after or before)['skill_name'],
+            category=(after or before)['category'] or '',
+            kind=kind,
+            date=event_day,
+            hours_delta=delta,
+            old_status=before['status'] if before else '',
+            new_status=after['status'] if after else '',
+            created_at=now,
+        ))
+    return events
+
+
+def is_completion(event):
+    return event.new_status == 'completed' and event.old_status != 'completed'
+
+
+def record(owner_id, changes):
+    """Logs one user's changes and rolls them into their day. Called from signals.py"""
+    events = build_events(owner_id, changes)
+    if not events:
+        return
+
+    learning = [event for event in events if event.kind in LEARNING_KINDS]
+    totals = defaultdict(lambda: {'events': 0, 'hours': Decimal('0'), 'completions': 0})
+    for event in learning:
+        bucket = totals[event.date]
+        bucket['events'] += 1
+        bucket['hours'] += event.hours_delta
+        bucket['completions'] += int(is_completion(event))
+
+    with transaction.atomic():
+        ActivityEvent.objects.bulk_create(events)
+        for day, bucket in totals.items():
+            add_to_day(owner_id, day, **bucket)
+        analytics.apply_events(owner_id, learning)
+
+
+def add_to_day(owner_id, day, events=0, hours=0, completions=0):
+    """
+    Adds to the counters of the user's `day` with F() updates, inserting
+    the row first if needed. Returns True when this call created the day.
+    """
+    increments = {
+        'events': F('events') + events,
+        'hours': F('hours') + hours,
+        'completions': F('completions') + completions,
+    }
+    rows = ActivityDay.objects.filter(owner_id=owner_id, date=day)
+    if rows.update(**increments):
+        return False
+
+    try:
+        with transaction.atomic():
+            ActivityDay.objects.create(
+                owner_id=owner_id, date=day, events=events, hours=hours, completions=completions
+            )
+            # Same transaction, so a lock error here doesn't leave the day
+            # counted without its streak step when the caller retries
+            advance_streak(owner_id, day)
+    except IntegrityError:
+        # Another writer inserted the day first; fold our counts into theirs
+        rows.update(**increments)
+        return False
+
+    return True
+
+
+def advance_streak(owner_id, day):
+    """
+    Moves the user's streak forward for a newly active `day`.
+
+    Each transition is a single conditional UPDATE guarded on
+    last_activity_date, so concurrent callers can't both apply it: the
+    first one moves last_activity_date to `day` and the others match no
+    row. Returns True if this call advanced the streak.
+    """
+    UserProfile.objects.get_or_create(owner_id=owner_id)
+    profile = UserProfile.objects.filter(owner_id=owner_id)
+    yesterday = day - timedelta(days=1)
+
+    continued = profile.filter(last_activity_date=yesterday).update(
+        current_streak=F('current_streak') + 1,
+        longest_streak=Greatest(F('longest_streak'), F('current_streak') + 1),
+        total_learning_days=F('total_learning_days') + 1,
+        last_activity_date=day,
+    )
+    if continued:
+        http_cache.bump(owner_id, http_cache.PROFILE)
+        return True
+
+    restarted = profile.filter(
+        Q(last_activity_date__isnull=True) | Q(last_activity_date__lt=yesterday)
+    ).update(
+        current_streak=1,
+        longest_streak=Greatest(F('longest_streak'), 1),
+        total_learning_days=F('total_learning_days') + 1,
+        streak_started_date=day,
+        last_activity_date=day,
+    )
+    if restarted:
+        http_cache.bump(owner_id, http_cache.PROFILE)
+    return bool(restarted)
+
+
+def retry_on_lock(func, *args, attempts=LOCK_RETRIES, **kwargs):
+    """
+    Calls func, retrying with a short backoff while SQLite reports the
+    database as locked. Inside an outer transaction the error is raised
+    as is, since only the caller can retry the whole transaction.
+    """
+    for attempt in range(attempts):
+        try:
+            return func(*args, **kwargs)
+        except OperationalError as e:
+            if 'locked' not in str(e) or attempt == attempts - 1:
+                raise
+            if connection.in_atomic_block:
+                raise
+            time.sleep(LOCK_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def streak_from_days(days):
+    """
+    Derives the profile streak fields from a sorted list of active dates.
+    The current streak is the run ending at the latest active day.
+    """
+    result = {
+        'current_streak': 0,
+        'longest_streak': 0,
+        'total_learning_days': len(days),
+        'last_activity_date': days[-1] if days else None,
+        'streak_started_date': None,
+    }
+    run = 0
+    previous = None
+    for day in days:
+        if previous is not None and day == previous + timedelta(days=1):
+            run += 1
+        else:
+            run = 1
+            result['streak_started_date'] = day
+        result['longest_streak'] = max(result['longest_streak'], run)
+        previous = day
+    result['current_streak'] = run
+    return result
+
+
+def compute_days(owner_id):
+    """Recomputes the user's per-day rollups from the event log"""
+    rows = (
+        ActivityEvent.objects.filter(owner_id=owner_id, kind__in=LEARNING_KINDS)
+        .values('date')
+        .annotate(
+            events=Count('id'),
+            hours=Sum('hours_delta'),
+            completions=Count('id', filter=Q(new_status='completed') & ~Q(old_status='completed')),
+        )
+        .order_by('date')
+    )
+    return {
+        row['date']: {
+            'events': row['events'],
+            'hours': _hours(row['hours']),
+            'completions': row['completions'],
+        }
+        for row in rows
+    }
+
+
+def check_in_days(owner_id, days):
+    """
+    The user's stored days that `days` (from compute_days) lacks and that
+    count no events: days marked active only through update-streak, which
+    has no events behind it
+    """
+    rows = ActivityDay.objects.filter(owner_id=owner_id, events=0)
+    return [day for day in rows.values_list('date', flat=True) if day not in days]
+
+
+def rebuild(owner_id):
+    """
+    Rebuilds the user's ActivityDay rows from their events (keeping the
+    check-in days) and the streak from the days
+    """
+    days = compute_days(owner_id)
+    with transaction.atomic():
+        check_ins = check_in_days(owner_id, days)
+        ActivityDay.objects.filter(owner_id=owner_id).exclude(date__in=check_ins).delete()
+        ActivityDay.objects.bulk_create(
+            [ActivityDay(owner_id=owner_id, date=day, **bucket) for day, bucket in days.items()]
+        )
+        profile, _ = UserProfile.objects.select_for_update().get_or_create(owner_id=owner_id)
+        for field, value in streak_from_days(sorted([*days, *check_ins])).items():
+            setattr(profile, field, value)
+        profile.save()
+    return profile
+
+
+def owner_ids():
+    """Every user with logged activity or a profile"""
+    return sorted(
+        set(ActivityEvent.objects.values_list('owner_id', flat=True).distinct())
+        | set(ActivityDay.objects.values_list('owner_id', flat=True).distinct())
+        | set(UserProfile.objects.values_list('owner_id', flat=True))
+    )
+
+
+def daily_series(owner_id, days=30):
+    """The user's active days within the last `days` days, oldest first"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return [
+        {
+            'date': row.date.isoformat(),
+            'events': row.events,
+            'hours': float(row.hours),
+            'completions': row.completions,
+        }
+        for row in ActivityDay.objects.filter(owner_id=owner_id, date__gte=since).order_by('date')
+    ]
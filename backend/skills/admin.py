@@ -1,16 +1,54 @@
 from django.contrib import admin
-from .models import Skill, UserProfile
+from .models import Skill, UserProfile, AICacheEntry, AIJob, ActivityEvent, ActivityDay, ActivityRollup, AILease
 
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
-    list_display = ['skill_name', 'status', 'difficulty_rating', 'hours_spent', 'category', 'created_date']    
-    list_filter = ['status', 'category', 'difficulty_rating']   
-    search_fields = ['skill_name', 'platform']    
+    list_display = ['skill_name', 'owner', 'status', 'difficulty_rating', 'hours_spent', 'category', 'created_date']    
+    list_filter = ['owner', 'status', 'category', 'difficulty_rating']   
+    search_fields = ['skill_name', 'platform', 'notes']    
     readonly_fields = ['created_date']
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ['current_streak', 'longest_streak', 'total_learning_days', 'last_activity_date']
-    readonly_fields = ['streak_started_date']
\ No newline at end of file
+    list_display = ['owner', 'current_streak', 'longest_streak', 'total_learning_days', 'last_activity_date']
+    readonly_fields = ['streak_started_date']
+
+
+@admin.register(AICacheEntry)
+class AICacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['operation', 'model_name', 'hit_count', 'last_accessed', 'expires_at']
+    list_filter = ['operation', 'model_name']
+    readonly_fields = ['key', 'created_at']
+
+
+@admin.register(AIJob)
+class AIJobAdmin(admin.ModelAdmin):
+    list_display = ['operation', 'skill', 'status', 'attempts', 'run_after', 'updated_at']
+    list_filter = ['operation', 'status']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ['owner', 'kind', 'skill_name', 'category', 'date', 'hours_delta', 'old_status', 'new_status']
+    list_filter = ['kind', 'category', 'date']
+    readonly_fields = ['created_at']
+
+
+@admin.register(ActivityDay)
+class ActivityDayAdmin(admin.ModelAdmin):
+    list_display = ['owner', 'date', 'events', 'hours', 'completions']
+
+
+@admin.register(ActivityRollup)
+class ActivityRollupAdmin(admin.ModelAdmin):
+    list_display = ['owner', 'bucket', 'start', 'category', 'hours', 'skills', 'completions']
+    list_filter = ['bucket', 'category']
+
+
+@admin.register(AILease)
+class AILeaseAdmin(admin.ModelAdmin):
+    list_display = ['key', 'done', 'expires_at', 'updated_at']
+    list_filter = ['done']
@@ -0,0 +1,208 @@
+"""
+Two-tier cache for Gemini responses.
+
+Entries are keyed on (model name, operation, normalized prompt inputs) so two
+skills called "React" and " react " share one generation. Lookups go through a
+small in-process LRU first and then the AICacheEntry table, which survives
+restarts and is shared between gunicorn workers.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+
+DEFAULTS = {
+    'TTL_SECONDS': 60 * 60 * 24 * 7,
+    'MEMORY_MAX_ENTRIES': 512,
+    'DB_MAX_ENTRIES': 10000,
+    # Size eviction on the DB tier runs once every N writes
+    'DB_EVICT_EVERY': 100,
+}
+
+
+def normalize(value):
+    """Lowercases strings and collapses whitespace so equivalent prompts match"""
+    if isinstance(value, str):
+        return ' '.join(value.lower().split())
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+
+def make_key(model_name, operation, **inputs):
+    """Content-addressed cache key for one prompt"""
+    payload = json.dumps(
+        [model_name, operation, normalize(inputs)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= timezone.now():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class AIResponseCache:
+
+    def __init__(self, options=None):
+        self.options = {**DEFAULTS, **(options or {})}
+        self.memory = LRUCache(self.options['MEMORY_MAX_ENTRIES'])
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.counters = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0,
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def get(self, key):
+        """Returns the cached value or None"""
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+
+        from .models import AICacheEntry
+
+        now = timezone.now()
+        try:
+            entry = AICacheEntry.objects.filter(key=key, expires_at__gt=now).first()
+            if entry is not None:
+                AICacheEntry.objects.filter(key=key).update(
+                    last_accessed=now, hit_count=F('hit_count') + 1
+                )
+        except DatabaseError:
+            entry = None
+
+        if entry is None:
+            self._count('misses')
+            return None
+
+        value = json.loads(entry.value)
+        self._count('db_hits')
+        self._count('evictions', self.memory.set(key, value, entry.expires_at))
+        return value
+
+    def set(self, key, value, operation='', model_name=''):
+        from .models import AICacheEntry
+
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=self.options['TTL_SECONDS'])
+        self._count('writes')
+        self._count('evictions', self.memory.set(key, value, expires_at))
+
+        try:
+            AICacheEntry.objects.update_or_create(
+                key=key,
+                defaults={
+                    'operation': operation,
+                    'model_name': model_name,
+                    'value': json.dumps(value),
+                    'expires_at': expires_at,
+                    'last_accessed': now,
+                },
+            )
+        except DatabaseError:
+            return
+
+        with self._lock:
+            self._writes_since_evict += 1
+            due = self._writes_since_evict >= self.options['DB_EVICT_EVERY']
+            if due:
+                self._writes_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """
+        Drops expired rows, then the least recently used rows above
+        DB_MAX_ENTRIES. Returns the number of rows deleted.
+        """
+        from .models import AICacheEntry
+
+        try:
+            deleted, _ = AICacheEntry.objects.filter(
+                expires_at__lte=timezone.now()
+            ).delete()
+
+            overflow = AICacheEntry.objects.order_by('-last_accessed').values_list(
+                'key', flat=True
+            )[self.options['DB_MAX_ENTRIES']:]
+            overflow_keys = list(overflow)
+            if overflow_keys:
+                deleted += AICacheEntry.objects.filter(key__in=overflow_keys).delete()[0]
+        except DatabaseError:
+            return 0
+
+        self._count('evictions', deleted)
+        return deleted
+
+    def clear(self):
+        from .models import AICacheEntry
+
+        self.memory.clear()
+        AICacheEntry.objects.all().delete()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['memory_hits'] + counters['db_hits'] + counters['misses']
+        hits = counters['memory_hits'] + counters['db_hits']
+        counters['memory_entries'] = len(self.memory)
+        counters['hit_rate'] = round(hits / lookups, 3) if lookups else 0.0
+        return counters
+
+
+ai_cache = AIResponseCache(getattr(settings, 'AI_CACHE', None))
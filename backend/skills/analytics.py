@@ -0,0 +1,162 @@
+"""
+Time-series rollups behind GET /api/analytics/timeseries/.
+
+Learning events (see skills/activity.py) are added to one ActivityRollup
+row per (owner, bucket, start, category) for each of day, week and month
+with F() increments, so any range is answered from a few pre-bucketed rows
+of that user instead of scanning Skill. rebuild() recomputes a user's rows
+from the event log.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from . import http_cache
+from .models import ActivityEvent, ActivityRollup
+
+
+BUCKETS = ('day', 'week', 'month')
+METRICS = ('hours', 'skills', 'completions')
+DEFAULT_POINTS = {'day': 30, 'week': 12, 'month': 12}
+MAX_POINTS = 1000
+UNCATEGORIZED = 'other'
+
+
+def bucket_start(day, bucket):
+    """First day of the bucket containing `day`; weeks start on Monday"""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_start(start, bucket):
+    if bucket == 'week':
+        return start + timedelta(days=7)
+    if bucket == 'month':
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def bucket_starts(start, end, bucket):
+    """Every bucket start from the one containing `start` up to `end`"""
+    current = bucket_start(start, bucket)
+    starts = []
+    while current <= end:
+        starts.append(current)
+        current = next_start(current, bucket)
+    return starts
+
+
+def approximate_points(start, end, bucket):
+    """Upper bound on the number of buckets in a range, without walking it"""
+    days_per_bucket = {'day': 1, 'week': 7, 'month': 28}[bucket]
+    return (end - start).days // days_per_bucket + 2
+
+
+def empty_totals():
+    return {'hours': Decimal('0'), 'skills': 0, 'completions': 0}
+
+
+def totals_for(events):
+    """
+    Sums learning events into {(bucket, start, category): totals}. Callers
+    pass only created/updated events; deletes don't undo past learning.
+    """
+    totals = defaultdict(empty_totals)
+    for event in events:
+        category = event.category or UNCATEGORIZED
+        for bucket in BUCKETS:
+            row = totals[(bucket, bucket_start(event.date, bucket), category)]
+            row['hours'] += Decimal(str(event.hours_delta))
+            row['skills'] += int(event.kind == 'created')
+            row['completions'] += int(
+                event.new_status == 'completed' and event.old_status != 'completed'
+            )
+    return totals
+
+
+def apply_events(owner_id, events):
+    """Adds one user's learning events to their rollup rows. Must run in the writer's transaction"""
+    for (bucket, start, category), values in totals_for(events).items():
+        increments = {field: F(field) + value for field, value in values.items()}
+        rows = ActivityRollup.objects.filter(
+            owner_id=owner_id, bucket=bucket, start=start, category=category
+        )
+        if rows.update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                ActivityRollup.objects.create(
+                    owner_id=owner_id, bucket=bucket, start=start, category=category, **values
+                )
+        except IntegrityError:
+            # Inserted concurrently; add to the row that won
+            rows.update(**increments)
+
+
+def compute(owner_id):
+    """Recomputes the user's rollup rows from the event log"""
+    events = ActivityEvent.objects.filter(owner_id=owner_id).exclude(kind='deleted').only(
+        'date', 'category', 'kind', 'hours_delta', 'old_status', 'new_status'
+    )
+    return totals_for(events.iterator(chunk_size=2000))
+
+
+def rebuild(owner_id):
+    totals = compute(owner_id)
+    with transaction.atomic():
+        ActivityRollup.objects.filter(owner_id=owner_id).delete()
+        ActivityRollup.objects.bulk_create(
+            [
+                ActivityRollup(owner_id=owner_id, bucket=bucket, start=start, category=category, **values)
+                for (bucket, start, category), values in totals.items()
+            ],
+            batch_size=1000,
+        )
+        http_cache.bump(owner_id, http_cache.SKILLS)
+    return len(totals)
+
+
+def default_range(bucket, today):
+    """The last DEFAULT_POINTS buckets up to and including today"""
+    start = bucket_start(today, bucket)
+    for _ in range(DEFAULT_POINTS[bucket] - 1):
+        start = bucket_start(start - timedelta(days=1), bucket)
+    return start, today
+
+
+def timeseries(owner_id, bucket, metric, start, end, by_category=False):
+    """
+    Returns one of the user's points per bucket from `start` to `end`, zero-filled, as
+    [{'start': 'YYYY-MM-DD', 'value': n}] plus a per-category dict when
+    by_category is set.
+    """
+    starts = bucket_starts(start, end, bucket)
+    rows = ActivityRollup.objects.filter(
+        owner_id=owner_id, bucket=bucket, start__gte=starts[0] if starts else start, start__lte=end,
+    ).values_list('start', 'category', metric)
+
+    values = defaultdict(dict)
+    for row_start, category, value in rows:
+        values[row_start][category] = value
+
+    points = []
+    for point_start in starts:
+        per_category = values.get(point_start, {})
+        total = sum(per_category.values(), Decimal('0') if metric == 'hours' else 0)
+        point = {
+            'start': point_start.isoformat(),
+            'value': float(total) if metric == 'hours' else total,
+        }
+        if by_category:
+            point['by_category'] = {
+                category: float(value) if metric == 'hours' else value
+                for category, value in sorted(per_category.items())
+            }
+        points.append(point)
+    return points
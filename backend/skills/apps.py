@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class SkillsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'skills'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from skillstack.database import configure_sqlite
+        from . import metrics, providers
+        from . import signals  # noqa: F401 - connects the Skill write hooks
+
+        connection_created.connect(configure_sqlite, dispatch_uid='skills.configure_sqlite')
+        connection_created.connect(metrics.install_query_wrapper, dispatch_uid='skills.metrics')
+        providers.add_listener(metrics.record_llm_call)
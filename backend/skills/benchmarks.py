@@ -0,0 +1,281 @@
+"""
+Helpers shared by the benchmark management commands.
+
+Benchmarks run against a throwaway test database (never db.sqlite3), seeded
+with synthetic skills. fake_gemini() swaps the Gemini SDK for a local
+stand-in so AI endpoints can be measured without an API key or network;
+use_provider() routes them to another provider instead.
+"""
+import asyncio
+import json
+import random
+import re
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from . import gemini, owners, providers, stats
+from .models import Skill
+
+
+SKILL_NAMES = [
+    'React', 'Django', 'PostgreSQL', 'Docker', 'Kubernetes', 'Pandas', 'Vue',
+    'FastAPI', 'Terraform', 'TypeScript', 'Rust', 'Go', 'GraphQL', 'Redis',
+    'Spark', 'Airflow', 'Next.js', 'Flask', 'Svelte', 'Ansible',
+]
+PAGE = 50
+
+
+@contextmanager
+def isolated_database(verbosity=0, test_name=None):
+    """
+    Creates and migrates a fresh test database for the duration of the block.
+    SQLite test databases live in memory unless `test_name` gives a file,
+    which is needed to see journal modes and locking between connections.
+    """
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST'].get('NAME')
+    if test_name:
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+
+
+@contextmanager
+def explicit_created_dates():
+    """Lets bulk_create keep the created_date we set instead of now()"""
+    field = Skill._meta.get_field('created_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def build_skill(rng, now, days=365, **overrides):
+    values = {
+        'skill_name': f"{rng.choice(SKILL_NAMES)} {rng.randint(1, 10_000)}",
+        'resource_type': rng.choice(Skill.RESOURCE_TYPE_CHOICES)[0],
+        'platform': rng.choice(['Udemy', 'YouTube', 'Coursera', '']),
+        'status': rng.choice(Skill.STATUS_CHOICES)[0],
+        'hours_spent': Decimal(rng.randint(0, 20_000)) / 100,
+        'difficulty_rating': rng.randint(1, 5),
+        'notes': 'Synthetic benchmark skill. ' * rng.randint(0, 8),
+        'category': rng.choice(Skill.CATEGORY_CHOICES)[0],
+        'created_date': now - timedelta(seconds=rng.randint(0, days * 24 * 3600)),
+    }
+    values.update(overrides)
+    return Skill(**values)
+
+
+def seed_skills(count, batch_size=5000, seed=42, stdout=None, **overrides):
+    """
+    Inserts `count` synthetic skills with bulk_create, owned by the default
+    user unless owner_id is given. Bypasses signals, so derived tables are
+    not maintained; benchmark the raw table only.
+    """
+    if 'owner_id' not in overrides:
+        overrides['owner_id'] = owners.default_owner_id()
+    rng = random.Random(seed)
+    now = timezone.now()
+    created = 0
+    with explicit_created_dates():
+        while created < count:
+            size = min(batch_size, count - created)
+            Skill.objects.bulk_create(
+                [build_skill(rng, now, **overrides) for _ in range(size)],
+                batch_size=size,
+            )
+            created += size
+            if stdout is not None:
+                stdout.write(f'  seeded {created}/{count} skills')
+    return created
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Stands in for genai.GenerativeModel: answers every prompt the app sends
+    with well-formed output after `latency` seconds (plus up to `jitter`),
+    and raises for a `failure_rate` share of calls.
+    """
+
+    def __init__(self, model_name, latency=0.2, jitter=0.1, failure_rate=0.0, seed=None):
+        self.model_name = model_name
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.failure_rate
+        return delay, failed
+
+    def generate_content(self, prompt):
+        delay, failed = self._draw()
+        time.sleep(delay)
+        if failed:
+            raise RuntimeError(f'Fake {self.model_name} failure')
+        return FakeResponse(fake_answer(prompt))
+
+    async def generate_content_async(self, prompt):
+        delay, failed = self._draw()
+        await asyncio.sleep(delay)
+        if failed:
+            raise RuntimeError(f'Fake {self.model_name} failure')
+        return FakeResponse(fake_answer(prompt))
+
+
+def fake_resources(name):
+    slug = '-'.join(name.lower().split())
+    return {
+        'videos': [f'{name} Crash Course - https://www.youtube.com/watch?v={slug}'],
+        'documentation': [f'{name} Docs - https://docs.example.com/{slug}'],
+        'courses': [f'{name} Bootcamp - https://www.udemy.com/course/{slug}'],
+    }
+
+
+def fake_answer(prompt):
+    """A plausible model answer for each prompt in skills/utils.py"""
+    if 'Skills:' in prompt:
+        names = json.loads(re.search(r'Skills:\s*(\[.*?\])\s*\n', prompt, re.S).group(1))
+        if 'Categorize' in prompt:
+            return json.dumps({name: 'other' for name in names})
+        return json.dumps({name: fake_resources(name) for name in names})
+    if 'Categorize the skill' in prompt:
+        return 'other'
+    if 'Learning prediction' in prompt:
+        return json.dumps({
+            'estimated_weeks': 4,
+            'estimated_total_hours': 40,
+            'completion_percentage': 25,
+            'tips': ['Practice daily', 'Build a project', 'Read the docs'],
+            'ai_tools': ['Copilot', 'ChatGPT'],
+        })
+    if 'weekly summary' in prompt:
+        return 'Solid week of learning - keep the streak going! 🚀'
+    match = re.search(r'learning (.+?), provide', prompt)
+    return json.dumps(fake_resources(match.group(1) if match else 'skill'))
+
+
+@contextmanager
+def fake_gemini(latency=0.2, jitter=0.1, failure_rate=0.0, seed=42):
+    """
+    Routes every Gemini call in the block to FakeModel. Also pretends an API
+    key is configured and starts with fresh models and circuit breakers.
+    """
+    def build(model_name):
+        return FakeModel(model_name, latency, jitter, failure_rate, seed)
+
+    original_build = gemini.build_model
+    gemini.build_model = build
+    gemini._models.clear()
+    gemini._breakers.clear()
+    providers.reset()
+    try:
+        with override_settings(GEMINI_API_KEY=settings.GEMINI_API_KEY or 'fake-key'):
+            yield
+    finally:
+        gemini.build_model = original_build
+        gemini._models.clear()
+        gemini._breakers.clear()
+        providers.reset()
+
+
+@contextmanager
+def use_provider(name, replay=None):
+    """
+    Routes every AI operation to provider `name` (see skills/providers.py)
+    for the block, keeping each operation's model. `replay` overrides
+    settings.AI_REPLAY for the 'replay' provider.
+    """
+    operations = {
+        operation: {**config, 'PROVIDER': ''}
+        for operation, config in getattr(settings, 'AI_OPERATIONS', {}).items()
+    }
+    overrides = {'AI_PROVIDER': name, 'AI_OPERATIONS': operations}
+    if replay:
+        overrides['AI_REPLAY'] = {**getattr(settings, 'AI_REPLAY', {}), **replay}
+    providers.reset()
+    try:
+        with override_settings(**overrides):
+            yield
+    finally:
+        providers.reset()
+
+
+def read_dashboard_and_list(owner_id):
+    """What a dashboard poll reads: the user's stats row and their newest page"""
+    stats.get_stats(owner_id)
+    list(Skill.objects.filter(owner_id=owner_id).order_by('-created_date', '-id')[:PAGE])
+
+
+def write_skill(rng, owner_id):
+    """A normal API write: save() in a transaction, so the signals run too"""
+    with transaction.atomic():
+        skill = None
+        if rng.random() >= 0.5:
+            skill = Skill.objects.filter(owner_id=owner_id).order_by('-id').first()
+        if skill is None:
+            Skill.objects.create(
+                owner_id=owner_id,
+                skill_name=f'Bench {rng.randint(1, 10_000)}',
+                resource_type='course',
+                hours_spent=Decimal(rng.randint(0, 500)) / 10,
+                category='backend',
+            )
+        else:
+            skill.hours_spent += Decimal('0.5')
+            skill.save()
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds for a list of durations in seconds"""
+    ms = [sample * 1000 for sample in samples]
+    return {
+        'count': len(ms),
+        'mean_ms': round(statistics.mean(ms), 3) if ms else 0.0,
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'p99_ms': round(percentile(ms, 99), 3),
+        'max_ms': round(max(ms), 3) if ms else 0.0,
+    }
+
+
+def time_call(fn, repeat=20, warmup=2):
+    """Runs fn repeatedly and returns the list of durations in seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
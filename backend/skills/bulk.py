@@ -0,0 +1,106 @@
+"""
+Bulk Skill writes used by the /api/skills/bulk/ endpoints.
+
+Items are validated one by one with SkillSerializer so every item gets its
+own result, then the valid ones are written with bulk_create/bulk_update in
+the caller's transaction. Django sends no signals for bulk writes, so the
+derived tables are updated through record_skill_changes().
+"""
+from rest_framework import serializers
+
+from .models import Skill
+from .serializers import SkillSerializer
+from .signals import collect_skill_changes, record_skill_changes, skill_snapshot
+
+
+MAX_ITEMS = 1000
+
+
+def validate_items(items, instances=None, partial=False):
+    """
+    Validates each item on its own. Returns (valid, errors) where valid is a
+    list of (index, validated_data) and errors a list of (index, errors).
+    """
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append((index, {'non_field_errors': ['Expected an object.']}))
+            continue
+        instance = instances[index] if instances is not None else None
+        serializer = SkillSerializer(instance, data=item, partial=partial)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append((index, serializer.errors))
+    return valid, errors
+
+
+def create_skills(validated_data, owner_id, batch_size=500, created_dates=None):
+    """
+    bulk_create for already validated items owned by `owner_id`; returns
+    the saved skills. `created_dates` (one datetime or None per item)
+    backdates skills, e.g. for imports, before their changes are recorded.
+    """
+    skills = [Skill(owner_id=owner_id, **data) for data in validated_data]
+    for skill, data in zip(skills, validated_data):
+        if 'mastery_prediction' in data:
+            skill.set_mastery_prediction(data['mastery_prediction'])
+    skills = Skill.objects.bulk_create(skills, batch_size=batch_size)
+    if created_dates is not None:
+        # created_date is auto_now_add, so the insert always writes now
+        dated = []
+        for skill, created in zip(skills, created_dates):
+            if created is not None:
+                skill.created_date = created
+                dated.append(skill)
+        if dated:
+            Skill.objects.bulk_update(dated, ['created_date'], batch_size=batch_size)
+    record_skill_changes([(None, skill_snapshot(skill)) for skill in skills])
+    return skills
+
+
+def update_skills(pairs, batch_size=500):
+    """
+    Applies validated partial data to loaded skills with one bulk_update.
+    `pairs` is a list of (skill, validated_data).
+    """
+    if not pairs:
+        return []
+
+    changes = []
+    fields = set()
+    for skill, data in pairs:
+        before = skill_snapshot(skill)
+        for field, value in data.items():
+            setattr(skill, field, value)
+            fields.add(field)
+        if 'mastery_prediction' in data:
+            # Fingerprinted after the other fields, which it depends on
+            skill.set_mastery_prediction(data['mastery_prediction'])
+            fields.add('mastery_fingerprint')
+        changes.append((before, skill_snapshot(skill)))
+
+    skills = [skill for skill, _ in pairs]
+    if fields:
+        Skill.objects.bulk_update(skills, sorted(fields), batch_size=batch_size)
+        record_skill_changes(changes)
+    return skills
+
+
+def delete_skills(ids, owner_id):
+    """Deletes the user's skills among `ids`; returns the set of ids that existed"""
+    skills = Skill.objects.filter(owner_id=owner_id)
+    found = set(skills.filter(id__in=ids).values_list('id', flat=True))
+    if found:
+        # Queryset delete sends post_delete per skill; apply them as one batch
+        with collect_skill_changes():
+            skills.filter(id__in=found).delete()
+    return found
+
+
+def check_size(items):
+    if not isinstance(items, list):
+        raise serializers.ValidationError('Expected a list of items.')
+    if len(items) > MAX_ITEMS:
+        raise serializers.ValidationError(f'At most {MAX_ITEMS} items per request.')
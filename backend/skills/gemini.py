@@ -0,0 +1,274 @@
+"""
+Shared Gemini client, the default provider behind skills/utils.py (see
+skills/providers.py).
+
+The google.generativeai SDK is imported and configured with
+settings.GEMINI_API_KEY on the first call, not at import: it takes longer
+to import than the rest of the app, and migrate, collectstatic and most
+requests never need it. GenerativeModel objects are built once per model name and reused. The
+async path bounds how many generations are in flight per event loop with
+a semaphore, so one ASGI process can hold many slow LLM requests without
+tying up a thread for each.
+
+Every call has a deadline (TIMEOUT_SECONDS): sync calls run on a small
+thread pool and are abandoned when it passes. Each model also has a
+circuit breaker. After FAILURE_THRESHOLD consecutive failures or timeouts
+it opens, and calls fail at once with CircuitOpen (utils.py then serves
+its local fallbacks) instead of waiting out another deadline. After
+RESET_SECONDS a single probe call is let through (half-open); its outcome
+closes the circuit or opens it again. stats() reports the state.
+
+Token counts from the SDK go to providers.report_usage(), which times and
+reports every call for skills/metrics.py.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+from . import providers
+
+
+DEFAULTS = {
+    'MAX_CONCURRENCY': 100,
+    'TIMEOUT_SECONDS': 30,
+    # Threads for blocking calls; a timed-out call keeps its thread until the SDK returns
+    'SYNC_WORKERS': 16,
+    'FAILURE_THRESHOLD': 5,
+    'RESET_SECONDS': 30,
+}
+
+_sdk = None
+_sdk_lock = threading.Lock()
+_models = {}
+_models_lock = threading.Lock()
+_semaphores = weakref.WeakKeyDictionary()
+_breakers = {}
+_executor = None
+
+
+class CircuitOpen(providers.Rejected):
+    """Gemini is failing for this model; the call was not attempted"""
+
+
+def get_setting(name):
+    return getattr(settings, 'GEMINI', {}).get(name, DEFAULTS[name])
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe. Thread-safe."""
+
+    def __init__(self, name):
+        self.name = name
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+        self.counters = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'opened': 0,
+        }
+
+    def before_call(self):
+        """Raises CircuitOpen unless the call may go ahead"""
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < get_setting('RESET_SECONDS'):
+                    self.counters['rejected'] += 1
+                    raise CircuitOpen(f"Gemini circuit open for {self.name}")
+                self.state = 'half_open'
+                self.probing = False
+            if self.state == 'half_open':
+                if self.probing:
+                    self.counters['rejected'] += 1
+                    raise CircuitOpen(f"Gemini circuit half-open for {self.name}, probe in flight")
+                self.probing = True
+            self.counters['calls'] += 1
+
+    def record_success(self):
+        with self._lock:
+            self.counters['successes'] += 1
+            self.state = 'closed'
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self, timed_out=False):
+        with self._lock:
+            self.counters['failures'] += 1
+            if timed_out:
+                self.counters['timeouts'] += 1
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= get_setting('FAILURE_THRESHOLD'):
+                if self.state != 'open':
+                    self.counters['opened'] += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+    def record_cancelled(self):
+        """The caller went away mid-call; lets the next call probe instead"""
+        with self._lock:
+            self.probing = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                **self.counters,
+            }
+
+
+def get_breaker(model_name):
+    breaker = _breakers.get(model_name)
+    if breaker is None:
+        with _models_lock:
+            breaker = _breakers.setdefault(model_name, CircuitBreaker(model_name))
+    return breaker
+
+
+def stats():
+    """Breaker state and counters per model"""
+    return {name: breaker.stats() for name, breaker in list(_breakers.items())}
+
+
+def report_usage(response):
+    """Hands the SDK's token counts to providers.report_usage(); older SDKs (like 0.3) have none"""
+    usage = getattr(response, 'usage_metadata', None)
+    providers.report_usage(
+        getattr(usage, 'prompt_token_count', None),
+        getattr(usage, 'candidates_token_count', None),
+    )
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _models_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_setting('SYNC_WORKERS'), thread_name_prefix='gemini'
+                )
+    return _executor
+
+
+def get_sdk():
+    """google.generativeai, imported and configured on first use"""
+    global _sdk
+    if _sdk is None:
+        with _sdk_lock:
+            if _sdk is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=settings.GEMINI_API_KEY)
+                _sdk = genai
+    return _sdk
+
+
+def build_model(model_name):
+    return get_sdk().GenerativeModel(model_name)
+
+
+def get_model(model_name):
+    """The process-wide GenerativeModel for `model_name`"""
+    model = _models.get(model_name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_name)
+            if model is None:
+                model = _models[model_name] = build_model(model_name)
+    return model
+
+
+def generate(model_name, prompt, timeout=None):
+    """
+    Blocking generation; returns the response text. Raises CircuitOpen
+    without calling Gemini while the model's circuit is open, and
+    TimeoutError after `timeout` seconds (waiting for a thread included).
+    """
+    breaker = get_breaker(model_name)
+    breaker.before_call()
+    timeout = timeout or get_setting('TIMEOUT_SECONDS')
+
+    def call():
+        response = get_model(model_name).generate_content(prompt)
+        return response, response.text
+
+    future = _get_executor().submit(call)
+    try:
+        response, text = future.result(timeout)
+    except FutureTimeoutError:  # only an alias of TimeoutError from Python 3.11
+        future.cancel()
+        breaker.record_failure(timed_out=True)
+        raise TimeoutError(f"Gemini call to {model_name} timed out after {timeout}s") from None
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    report_usage(response)
+    return text
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(get_setting('MAX_CONCURRENCY'))
+    return semaphore
+
+
+async def agenerate(model_name, prompt, timeout=None):
+    """
+    Non-blocking generation; returns the response text. Waiting for a free
+    slot counts against the deadline too, so callers never wait longer
+    than `timeout` seconds in total (asyncio.TimeoutError). Raises
+    CircuitOpen like generate().
+    """
+    breaker = get_breaker(model_name)
+    breaker.before_call()
+    timeout = timeout or get_setting('TIMEOUT_SECONDS')
+
+    async def call():
+        async with _semaphore():
+            response = await get_model(model_name).generate_content_async(prompt)
+            return response, response.text
+
+    try:
+        response, text = await asyncio.wait_for(call(), timeout)
+    except asyncio.CancelledError:
+        breaker.record_cancelled()
+        raise
+    except asyncio.TimeoutError:
+        breaker.record_failure(timed_out=True)
+        raise asyncio.TimeoutError(f"Gemini call to {model_name} timed out after {timeout}s") from None
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    report_usage(response)
+    return text
+
+
+class GeminiProvider:
+    """This module as a provider (see skills/providers.py)"""
+    name = 'gemini'
+    cacheable = True
+    persistable = True
+
+    @property
+    def configured(self):
+        return bool(getattr(settings, 'GEMINI_API_KEY', ''))
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        return generate(model_name, prompt, timeout)
+
+    async def agenerate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        return await agenerate(model_name, prompt, timeout)
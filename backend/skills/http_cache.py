@@ -0,0 +1,122 @@
+"""
+Conditional GET and server-side response caching for read endpoints.
+
+Writers bump a per-table, per-user counter (TableVersion) inside their
+transaction. Views wrapped with cache_by_version() read the requesting
+user's counters in one query and build a strong ETag from them and the
+representation asked for (path, query string and Accept). Successful
+responses are cached under that ETag; once one is known to exist, a
+matching If-None-Match gets a 304 instead of the data, so a missing skill
+is never answered with a 304. A bump changes every key derived from the counter,
+so writes invalidate cached responses without having to find them, and one
+user's writes never invalidate another user's responses.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import owners
+from .models import TableVersion
+
+
+SKILLS = 'skills'
+PROFILE = 'profile'
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'HTTP_CACHE', {}).get(name, DEFAULTS[name])
+
+
+def scoped(owner_id, names):
+    return [f'{name}:{owner_id}' for name in names]
+
+
+def bump(owner_id, *names):
+    """Increments the user's counters of the given tables; call from the writer's transaction"""
+    for name in scoped(owner_id, names):
+        if TableVersion.objects.filter(name=name).update(version=F('version') + 1):
+            continue
+        try:
+            with transaction.atomic():
+                # Start from the clock so a recreated row can't repeat old
+                # versions that may still be cached (file/db backends, flushes)
+                TableVersion.objects.create(name=name, version=time.time_ns() // 1000)
+        except IntegrityError:
+            TableVersion.objects.filter(name=name).update(version=F('version') + 1)
+
+
+def get_versions(owner_id, names):
+    keys = scoped(owner_id, names)
+    versions = dict(TableVersion.objects.filter(name__in=keys).values_list('name', 'version'))
+    missing = [name for name, key in zip(names, keys) if key not in versions]
+    if missing:
+        bump(owner_id, *missing)
+        versions.update(TableVersion.objects.filter(name__in=keys).values_list('name', 'version'))
+    return [versions[key] for key in keys]
+
+
+def make_etag(owner_id, names, versions, request):
+    """One ETag per user, table versions and representation (path, query string, Accept)"""
+    representation = f"{request.get_full_path()}|{request.headers.get('Accept', '')}"
+    digest = hashlib.sha256(representation.encode('utf-8')).hexdigest()[:32]
+    parts = [f'u{owner_id}'] + [f'{name}-{version}' for name, version in zip(names, versions)]
+    return '"' + '.'.join(parts + [digest]) + '"'
+
+
+def cache_key(etag):
+    return 'http:' + etag.strip('"')
+
+
+def cache_by_version(*names, timeout=None):
+    """
+    Decorator for DRF views (use method_decorator on viewset methods).
+    The versions are read before the view runs, so a write landing in
+    between can only make the cached data newer than its key, never older.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            owner_id = owners.owner_id_for(request)
+            etag = make_etag(owner_id, names, get_versions(owner_id, names), request)
+            cache = caches[get_setting('CACHE_ALIAS')]
+            key = cache_key(etag)
+            data = cache.get(key)
+            if data is None:
+                # Only a successful response is cached or gets the ETag
+                response = view(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cache.set(key, response.data, timeout or get_setting('TIMEOUT'))
+                cache_status = 'MISS'
+            else:
+                response = Response(data)
+                cache_status = 'HIT'
+
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['X-Cache'] = cache_status
+            response['ETag'] = etag
+            # Browsers keep the response but revalidate it with If-None-Match
+            patch_cache_control(response, private=True, no_cache=True)
+            # The user comes from the session cookie or basic auth
+            patch_vary_headers(response, ['Accept', 'Cookie', 'Authorization'])
+            return response
+        return wrapper
+    return decorator
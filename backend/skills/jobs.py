@@ -0,0 +1,253 @@
+"""
+SQLite-backed job queue for Gemini calls.
+
+The AI endpoints enqueue an AIJob and return 202 straight away; the
+`run_ai_worker` management command claims queued jobs, calls Gemini and
+writes the result back onto the Skill row.
+"""
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import http_cache, singleflight
+from .models import AIJob, Skill
+
+
+DEFAULTS = {
+    'CONCURRENCY': 4,
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF_SECONDS': 5,
+    'MAX_BACKOFF_SECONDS': 300,
+    'POLL_INTERVAL': 1.0,
+    # Running jobs whose worker died are requeued after this long
+    'STALE_AFTER_SECONDS': 600,
+    # Run jobs inside the request instead of queueing (local dev without a worker)
+    'EAGER': False,
+}
+
+# The provider operation (skills/providers.py) that fills each AI field
+FIELD_OPERATIONS = {
+    'recommended_resources': 'resources',
+    'mastery_prediction': 'mastery',
+}
+
+
+def get_option(name):
+    return {**DEFAULTS, **getattr(settings, 'AI_JOBS', {})}[name]
+
+
+def enqueue(skill, operation, refresh=False):
+    """
+    Queues `operation` for `skill`, reusing a queued or running job for the
+    same pair so repeated clicks don't pile up duplicate generations.
+    refresh=True makes the job skip the AI response cache; it upgrades a
+    reused queued job, and a running job that would answer from the cache
+    is not reused.
+    """
+    with transaction.atomic():
+        pending = AIJob.objects.filter(
+            skill=skill,
+            operation=operation,
+            status__in=['queued', 'running'],
+        )
+        if refresh:
+            pending = pending.filter(Q(status='queued') | Q(refresh=True))
+        job = pending.order_by('id').first()
+        if job is not None and refresh and not job.refresh:
+            # Upgrade it, unless a worker claimed it in between
+            if AIJob.objects.filter(pk=job.pk, status='queued').update(refresh=True):
+                job.refresh = True
+            else:
+                job = None
+        if job is None:
+            job = AIJob.objects.create(
+                skill=skill,
+                operation=operation,
+                refresh=refresh,
+                max_attempts=get_option('MAX_ATTEMPTS'),
+            )
+
+    if get_option('EAGER') and job.status == 'queued':
+        job = claim(job.pk, worker_id='eager') or job
+        if job.status == 'running':
+            run_job(job)
+    return job
+
+
+def claim(job_id, worker_id):
+    """Atomically moves one queued job to running. Returns None if we lost the race."""
+    claimed = AIJob.objects.filter(pk=job_id, status='queued').update(
+        status='running',
+        locked_by=worker_id,
+        locked_at=timezone.now(),
+        attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return None
+    return AIJob.objects.select_related('skill').get(pk=job_id)
+
+
+def claim_next(worker_id):
+    """Claims the oldest job that is due, or returns None when the queue is empty"""
+    while True:
+        job_id = AIJob.objects.filter(
+            status='queued',
+            run_after__lte=timezone.now(),
+        ).order_by('run_after', 'id').values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+        job = claim(job_id, worker_id)
+        if job is not None:
+            return job
+
+
+def requeue_stale():
+    """Puts running jobs back on the queue when their worker died mid-run"""
+    cutoff = timezone.now() - timedelta(seconds=get_option('STALE_AFTER_SECONDS'))
+    return AIJob.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='queued',
+        locked_by='',
+        locked_at=None,
+    )
+
+
+def backoff_delay(attempts):
+    """Exponential backoff: BACKOFF_SECONDS, then x2 per attempt, capped"""
+    delay = get_option('BACKOFF_SECONDS') * (2 ** max(0, attempts - 1))
+    return min(delay, get_option('MAX_BACKOFF_SECONDS'))
+
+
+def execute(job):
+    """
+    Calls Gemini for the job and persists the result onto the skill.
+    Gemini errors are raised so run_job can retry them. Concurrent runs for
+    the same skill and operation share one call (skills/singleflight.py).
+    """
+    from . import utils
+
+    skill = job.skill
+
+    if job.operation == 'ai_resources':
+        def generate():
+            result = utils.get_ai_resources(skill.skill_name, skill.resource_type, strict=True)
+            skill.set_recommended_resources(result)
+            save_result(skill, 'recommended_resources')
+            return result
+    elif job.operation == 'mastery_predict':
+        def generate():
+            result = utils.predict_mastery(
+                skill.skill_name,
+                skill.difficulty_rating,
+                float(skill.hours_spent),
+                strict=True,
+                refresh=job.refresh,
+            )
+            skill.set_mastery_prediction(result)
+            save_result(skill, 'mastery_prediction', 'mastery_fingerprint')
+            return result
+    else:
+        raise ValueError(f"Unknown AI job operation: {job.operation}")
+
+    return singleflight.run(singleflight.skill_key(skill.pk, job.operation), generate)
+
+
+def save_result(skill, *fields):
+    """Writes the AI fields of `skill` without touching the rest of the row"""
+    from . import utils
+
+    # Without a real model behind the operation these are placeholder
+    # results (fallbacks, offline rules, replays); keep trying later
+    if utils.ai_persistable(FIELD_OPERATIONS[fields[0]]):
+        with transaction.atomic():
+            Skill.objects.filter(pk=skill.pk).update(**{field: getattr(skill, field) for field in fields})
+            http_cache.bump(skill.owner_id, http_cache.SKILLS)
+
+
+def fallback_result(job):
+    """Local result handed back once every attempt has failed"""
+    from . import utils
+
+    skill = job.skill
+    if job.operation == 'mastery_predict':
+        return utils.fallback_mastery(
+            skill.skill_name, skill.difficulty_rating, float(skill.hours_spent)
+        )
+    return utils.fallback_resources(skill.skill_name)
+
+
+def run_job(job):
+    """Runs a claimed job and records success, a retry or the final failure"""
+    try:
+        result = execute(job)
+    except Exception as e:
+        job.last_error = str(e)
+        if job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_after = timezone.now() + timedelta(seconds=backoff_delay(job.attempts))
+        else:
+            job.status = 'failed'
+            job.set_result(fallback_result(job))
+        job.locked_by = ''
+        job.locked_at = None
+        job.save()
+        return job
+
+    job.set_result(result)
+    job.status = 'succeeded'
+    job.locked_by = ''
+    job.locked_at = None
+    job.save()
+    return job
+
+
+class Worker:
+    """
+    Pool of threads that poll the queue. Concurrency bounds how many Gemini
+    calls this process makes at once.
+    """
+
+    def __init__(self, concurrency=None, poll_interval=None, name=None):
+        self.concurrency = concurrency or get_option('CONCURRENCY')
+        self.poll_interval = poll_interval or get_option('POLL_INTERVAL')
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def loop(self, index):
+        worker_id = f"{self.name}:{index}"
+        while not self.stop_event.is_set():
+            close_old_connections()
+            job = claim_next(worker_id)
+            if job is None:
+                self.stop_event.wait(self.poll_interval)
+                continue
+            run_job(job)
+        close_old_connections()
+
+    def start(self):
+        requeue_stale()
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self.loop, args=(index,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def run_forever(self):
+        self.start()
+        try:
+            while not self.stop_event.wait(get_option('STALE_AFTER_SECONDS') / 10):
+                requeue_stale()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from skills.ai_cache import ai_cache
+from skills.models import AICacheEntry
+
+
+class Command(BaseCommand):
+    help = 'Inspect, prune or clear the AI response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune', action='store_true',
+                            help='Delete expired entries and trim to DB_MAX_ENTRIES')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete every cached response')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            ai_cache.clear()
+            self.stdout.write(self.style.SUCCESS('AI cache cleared'))
+        elif options['prune']:
+            deleted = ai_cache.evict()
+            self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} cache entries'))
+
+        self.stdout.write(f'Cached responses: {AICacheEntry.objects.count()}')
@@ -0,0 +1,319 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from skills import gemini, jobs, owners, stats
+from skills.benchmarks import (
+    SKILL_NAMES, fake_gemini, isolated_database, seed_skills, summarize, use_provider,
+)
+from skills.models import Skill
+from skills.pagination import SkillCursorPagination
+
+
+PAGE = 50
+BULK_ITEMS = 10
+
+
+def new_skill(rng):
+    return {
+        'skill_name': f'{rng.choice(SKILL_NAMES)} {rng.randint(1, 10_000)}',
+        'resource_type': 'course',
+        'hours_spent': rng.randint(0, 200),
+        'difficulty_rating': rng.randint(1, 5),
+        'category': 'backend',
+    }
+
+
+def post_json(client, path, data):
+    return client.post(path, json.dumps(data), content_type='application/json')
+
+
+def created_ids(client, rng, count):
+    """Creates skills through the API (so the signals run) and returns their ids"""
+    response = post_json(client, '/api/skills/bulk/', [new_skill(rng) for _ in range(count)])
+    return [result['data']['id'] for result in response.json()['results']]
+
+
+# Each endpoint takes (client, rng, ctx), does any untimed setup, and
+# returns the zero-argument request to time.
+ENDPOINTS = {
+    'list': lambda c, rng, ctx: lambda: c.get(f'/api/skills/?page_size={PAGE}'),
+    'list ?status=': lambda c, rng, ctx: lambda: c.get(f'/api/skills/?page_size={PAGE}&status=completed'),
+    'list ?category=': lambda c, rng, ctx: lambda: c.get(f'/api/skills/?page_size={PAGE}&category=data'),
+    'list ?search=': lambda c, rng, ctx: (
+        lambda term=rng.choice(SKILL_NAMES): c.get(f'/api/skills/?search={term}')
+    ),
+    'list cursor page': lambda c, rng, ctx: (
+        lambda: c.get(f"/api/skills/?page_size={PAGE}&cursor={ctx['cursor']}")
+    ),
+    'retrieve': lambda c, rng, ctx: lambda pk=rng.choice(ctx['ids']): c.get(f'/api/skills/{pk}/'),
+    'create': lambda c, rng, ctx: lambda: post_json(c, '/api/skills/', new_skill(rng)),
+    'update': lambda c, rng, ctx: lambda pk=rng.choice(ctx['ids']): c.patch(
+        f'/api/skills/{pk}/', json.dumps({'hours_spent': rng.randint(0, 200)}),
+        content_type='application/json',
+    ),
+    'delete': lambda c, rng, ctx: lambda pk=created_ids(c, rng, 1)[0]: c.delete(f'/api/skills/{pk}/'),
+    'bulk create': lambda c, rng, ctx: lambda: post_json(
+        c, '/api/skills/bulk/', [new_skill(rng) for _ in range(BULK_ITEMS)]
+    ),
+    'bulk update': lambda c, rng, ctx: lambda ids=rng.sample(ctx['ids'], BULK_ITEMS): c.patch(
+        '/api/skills/bulk/', json.dumps([{'id': pk, 'hours_spent': 5} for pk in ids]),
+        content_type='application/json',
+    ),
+    'bulk delete': lambda c, rng, ctx: lambda ids=created_ids(c, rng, BULK_ITEMS): c.delete(
+        '/api/skills/bulk/', json.dumps({'ids': ids}), content_type='application/json',
+    ),
+    'export': lambda c, rng, ctx: lambda: c.get('/api/skills/export/?format=ndjson&category=data'),
+    'import': lambda c, rng, ctx: lambda: c.post(
+        '/api/skills/import/?format=ndjson',
+        '\n'.join(json.dumps(new_skill(rng)) for _ in range(BULK_ITEMS)),
+        content_type='application/x-ndjson',
+    ),
+    'dashboard-stats': lambda c, rng, ctx: lambda: c.get('/api/dashboard-stats/'),
+    'analytics timeseries': lambda c, rng, ctx: lambda: c.get('/api/analytics/timeseries/?bucket=week'),
+    'weekly-summary': lambda c, rng, ctx: lambda: c.post('/api/weekly-summary/'),
+    'profile': lambda c, rng, ctx: lambda: c.get('/api/profile/'),
+    'streak': lambda c, rng, ctx: lambda: c.get('/api/profile/streak/'),
+    'update-streak': lambda c, rng, ctx: lambda: c.post('/api/profile/update-streak/'),
+    'activity': lambda c, rng, ctx: lambda: c.get('/api/profile/activity/'),
+    'job status': lambda c, rng, ctx: lambda: c.get(f"/api/jobs/{ctx['job_id']}/"),
+    'ai-status': lambda c, rng, ctx: lambda: c.get('/api/ai-status/'),
+    'ai-resources': lambda c, rng, ctx: (
+        lambda pk=rng.choice(ctx['ids']): c.post(f'/api/skills/{pk}/ai-resources/')
+    ),
+    'mastery-predict': lambda c, rng, ctx: (
+        lambda pk=rng.choice(ctx['ids']): c.post(f'/api/skills/{pk}/mastery-predict/?refresh=1')
+    ),
+    'async ai-resources': lambda c, rng, ctx: (
+        lambda pk=rng.choice(ctx['ids']): c.post(f'/api/async/skills/{pk}/ai-resources/')
+    ),
+    'async mastery-predict': lambda c, rng, ctx: (
+        lambda pk=rng.choice(ctx['ids']): c.post(f'/api/async/skills/{pk}/mastery-predict/?refresh=1')
+    ),
+    'async weekly-summary': lambda c, rng, ctx: lambda: c.post('/api/async/weekly-summary/'),
+}
+
+
+def consume(response):
+    """Reads a streamed body so its generation is part of the timing"""
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives every API endpoint at several concurrency levels against a seeded '
+        'throwaway database, with a local stand-in for Gemini or another AI provider'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Synthetic skills to seed, e.g. 1000, 100000 or 1000000')
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 8],
+                            help='Concurrent clients, one level at a time')
+        parser.add_argument('--duration', type=float, default=2.0,
+                            help='Seconds to drive each endpoint at each level')
+        parser.add_argument('--endpoints', nargs='+', default=None,
+                            help=f"Only these endpoints (default: all). Choices: {', '.join(ENDPOINTS)}")
+        parser.add_argument('--provider', choices=['gemini', 'offline', 'replay'], default='gemini',
+                            help='AI provider for every operation; gemini is the local stand-in below')
+        parser.add_argument('--replay-file', default=None,
+                            help='Recorded answers for --provider replay (default: AI_REPLAY PATH)')
+        parser.add_argument('--record', action='store_true',
+                            help='With --provider replay, record the stand-in\'s answers to --replay-file instead')
+        parser.add_argument('--llm-latency', type=float, default=200,
+                            help='Milliseconds each fake Gemini call takes')
+        parser.add_argument('--llm-jitter', type=float, default=100,
+                            help='Up to this many extra milliseconds per fake call')
+        parser.add_argument('--llm-failure-rate', type=float, default=0.0,
+                            help='Share of fake Gemini calls that raise')
+        parser.add_argument('--queue-jobs', action='store_true',
+                            help='Leave AI jobs queued (measures the 202 path) instead of running them inline')
+        parser.add_argument('--label', default='',
+                            help='Name of this build in the JSON results')
+        parser.add_argument('--json', dest='json_path', default=None,
+                            help='Also write the results to this file as JSON')
+        parser.add_argument('--compare', default=None,
+                            help='Earlier --json results to print p50/p99 changes against')
+
+    def handle(self, *args, **options):
+        names = options['endpoints'] or list(ENDPOINTS)
+        unknown = [name for name in names if name not in ENDPOINTS]
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(unknown)}")
+        if options['record'] and options['provider'] != 'replay':
+            raise CommandError('--record needs --provider replay')
+
+        overrides = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            'AI_JOBS': {**getattr(settings, 'AI_JOBS', {}), 'EAGER': not options['queue_jobs']},
+            # One JSON log line per request would drown the report
+            'METRICS': {**getattr(settings, 'METRICS', {}), 'LOG_REQUESTS': False},
+        }
+        llm = {
+            'latency': options['llm_latency'] / 1000,
+            'jitter': options['llm_jitter'] / 1000,
+            'failure_rate': options['llm_failure_rate'],
+        }
+        replay = {'MODE': 'record' if options['record'] else 'replay', 'RECORD_PROVIDER': 'gemini'}
+        if options['replay_file']:
+            replay['PATH'] = options['replay_file']
+        results = []
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(**overrides), fake_gemini(**llm), \
+                use_provider(options['provider'], replay if options['provider'] == 'replay' else None):
+            # A file, not the default in-memory test database, so the
+            # worker threads share it and lock each other for real
+            with isolated_database(test_name=os.path.join(directory, 'bench.sqlite3')):
+                self.stdout.write(f"Seeding {options['rows']} skills...")
+                ctx = self.prepare(options['rows'])
+                connection.close()
+
+                for name in names:
+                    self.stdout.write(self.style.MIGRATE_HEADING(name))
+                    for workers in options['workers']:
+                        result = self.run_endpoint(name, ctx, workers, options['duration'])
+                        results.append(result)
+                        self.report(result)
+            breakers = gemini.stats()
+
+        output = {
+            'label': options['label'],
+            'created_at': timezone.now().isoformat(),
+            'rows': options['rows'],
+            'database': connection.vendor,
+            'provider': options['provider'],
+            'llm': {**llm, 'queue_jobs': options['queue_jobs']},
+            'gemini': breakers,
+            'results': results,
+        }
+        if options['compare']:
+            self.compare(output, options['compare'])
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump(output, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"\nResults written to {options['json_path']}"))
+
+    def prepare(self, rows):
+        """Seeds the data every endpoint reads; returns what the endpoints need"""
+        seed_skills(rows, stdout=self.stdout if rows >= 100_000 else None)
+        owner_id = owners.default_owner_id()
+        stats.rebuild(owner_id)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        skills = Skill.objects.filter(owner_id=owner_id)
+        ids = list(skills.values_list('pk', flat=True))
+        middle = skills.order_by('-created_date', '-id')[len(ids) // 2]
+        job = jobs.enqueue(skills.first(), 'ai_resources')
+        return {
+            'ids': ids,
+            'cursor': SkillCursorPagination().encode_cursor(middle),
+            'job_id': job.pk,
+        }
+
+    def run_endpoint(self, name, ctx, workers, duration):
+        latencies, queries, statuses, errors = [], [], Counter(), []
+        lock = threading.Lock()
+        start = threading.Barrier(workers + 1)
+        stop = threading.Event()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            client = Client()
+            local_latencies, local_queries, local_statuses, local_errors = [], [], Counter(), []
+            start.wait()
+            try:
+                # Always at least one request, even if it outlasts the duration
+                while not (stop.is_set() and local_latencies):
+                    try:
+                        request = ENDPOINTS[name](client, rng, ctx)
+                        with CaptureQueriesContext(connection) as captured:
+                            started = time.perf_counter()
+                            response = consume(request())
+                            elapsed = time.perf_counter() - started
+                    except Exception as e:
+                        local_errors.append(f'{type(e).__name__}: {e}')
+                        if stop.is_set():
+                            break
+                        continue
+                    local_latencies.append(elapsed)
+                    local_queries.append(len(captured))
+                    local_statuses[response.status_code] += 1
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(local_latencies)
+                    queries.extend(local_queries)
+                    statuses.update(local_statuses)
+                    errors.extend(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        server_errors = sum(count for code, count in statuses.items() if code >= 500)
+        return {
+            'endpoint': name,
+            'workers': workers,
+            'duration_s': round(elapsed, 3),
+            'requests': len(latencies),
+            'requests_per_s': round(len(latencies) / elapsed, 1),
+            'latency': summarize(latencies),
+            'queries': {
+                'mean': round(sum(queries) / len(queries), 1) if queries else 0.0,
+                'max': max(queries, default=0),
+            },
+            'statuses': {str(code): count for code, count in sorted(statuses.items())},
+            'errors': len(errors) + server_errors,
+            'error_samples': sorted(set(errors))[:3],
+        }
+
+    def report(self, result):
+        latency = result['latency']
+        self.stdout.write(
+            f"  {result['workers']:>3} workers  {result['requests_per_s']:>8.1f} req/s  "
+            f"p50 {latency['p50_ms']:>8.2f}  p95 {latency['p95_ms']:>8.2f}  p99 {latency['p99_ms']:>8.2f} ms  "
+            f"queries {result['queries']['mean']:>5.1f} (max {result['queries']['max']})  "
+            f"statuses {result['statuses']}  errors {result['errors']}"
+        )
+
+    def compare(self, output, path):
+        with open(path) as handle:
+            baseline = json.load(handle)
+        before = {(row['endpoint'], row['workers']): row for row in baseline['results']}
+
+        label = baseline.get('label') or path
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nChange against {label}'))
+        for row in output['results']:
+            old = before.get((row['endpoint'], row['workers']))
+            if old is None:
+                continue
+            changes = []
+            for key in ('p50_ms', 'p99_ms'):
+                was, now = old['latency'][key], row['latency'][key]
+                change = f'{(now - was) / was * 100:+.0f}%' if was else 'n/a'
+                changes.append(f'{key[:3]} {was:.2f} -> {now:.2f} ms ({change})')
+            changes.append(f"queries {old['queries']['mean']} -> {row['queries']['mean']}")
+            self.stdout.write(f"  {row['endpoint']:<24} {row['workers']:>3} workers  " + '  '.join(changes))
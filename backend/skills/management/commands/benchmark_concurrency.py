@@ -0,0 +1,121 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+
+from skills import owners, stats
+from skills.benchmarks import (
+    isolated_database, read_dashboard_and_list, seed_skills, summarize, write_skill,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measures read/write throughput and latency with several concurrent workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000,
+                            help='Synthetic skills to seed into a throwaway database')
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+        parser.add_argument('--duration', type=float, default=3.0,
+                            help='Seconds to run each worker count')
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help='Share of operations that are writes')
+        parser.add_argument('--journal-modes', nargs='+', default=['wal', 'delete'],
+                            help='SQLite journal modes to compare (ignored on other backends)')
+        parser.add_argument('--json', dest='json_path', default=None,
+                            help='Also write the results to this file as JSON')
+
+    def handle(self, *args, **options):
+        modes = options['journal_modes'] if connection.vendor == 'sqlite' else [connection.vendor]
+        results = []
+
+        for mode in modes:
+            pragmas = dict(getattr(settings, 'SQLITE_PRAGMAS', {}))
+            if connection.vendor == 'sqlite':
+                pragmas['journal_mode'] = mode.upper()
+
+            with tempfile.TemporaryDirectory() as directory, override_settings(SQLITE_PRAGMAS=pragmas):
+                # A file, not the default in-memory test database, so the
+                # journal mode and cross-connection locking are real
+                with isolated_database(test_name=os.path.join(directory, 'bench.sqlite3')):
+                    self.stdout.write(f"Seeding {options['rows']} skills ({mode})...")
+                    seed_skills(options['rows'])
+                    stats.rebuild(owners.default_owner_id())
+                    connection.close()
+
+                    for workers in options['workers']:
+                        result = self.run_level(workers, options['duration'], options['write_ratio'])
+                        result['mode'] = mode
+                        results.append(result)
+                        self.report(result)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"\nResults written to {options['json_path']}"))
+
+    def run_level(self, workers, duration, write_ratio):
+        reads, writes, errors = [], [], []
+        lock = threading.Lock()
+        start = threading.Barrier(workers + 1)
+        stop = threading.Event()
+
+        # Every worker acts as the same user, so they contend on one stats row
+        owner_id = owners.default_owner_id()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local_reads, local_writes, local_errors = [], [], []
+            start.wait()
+            try:
+                while not stop.is_set():
+                    is_write = rng.random() < write_ratio
+                    started = time.perf_counter()
+                    try:
+                        write_skill(rng, owner_id) if is_write else read_dashboard_and_list(owner_id)
+                    except OperationalError as e:
+                        local_errors.append(str(e))
+                        continue
+                    (local_writes if is_write else local_reads).append(time.perf_counter() - started)
+            finally:
+                connection.close()
+                with lock:
+                    reads.extend(local_reads)
+                    writes.extend(local_writes)
+                    errors.extend(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(workers)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            'workers': workers,
+            'duration_s': duration,
+            'reads_per_s': round(len(reads) / duration, 1),
+            'writes_per_s': round(len(writes) / duration, 1),
+            'read_latency': summarize(reads),
+            'write_latency': summarize(writes),
+            'errors': len(errors),
+            'error_samples': sorted(set(errors))[:3],
+        }
+
+    def report(self, result):
+        read, write = result['read_latency'], result['write_latency']
+        self.stdout.write(
+            f"  {result['mode']:<8} {result['workers']:>2} workers  "
+            f"reads {result['reads_per_s']:>8.1f}/s (p50 {read['p50_ms']:.2f} p99 {read['p99_ms']:.2f} ms)  "
+            f"writes {result['writes_per_s']:>7.1f}/s (p50 {write['p50_ms']:.2f} p99 {write['p99_ms']:.2f} ms)  "
+            f"errors {result['errors']}"
+        )
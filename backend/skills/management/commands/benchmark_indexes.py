@@ -0,0 +1,95 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from skills import owners
+from skills.benchmarks import isolated_database, seed_skills, summarize, time_call
+from skills.models import Skill
+from skills.pagination import SkillCursorPagination
+
+
+PAGE = 50
+
+
+def access_paths():
+    """The Skill queries the API actually runs (for one user), keyed by a short label"""
+    now = timezone.now()
+    middle = now - timedelta(days=180)
+    skills = Skill.objects.filter(owner_id=owners.default_owner_id())
+    newest = skills.order_by('-created_date', '-id')
+    return {
+        'list newest page': newest[:PAGE],
+        'list ?status=': newest.filter(status='completed')[:PAGE],
+        'list ?category=': newest.filter(category='data')[:PAGE],
+        'list cursor page': SkillCursorPagination.after_cursor(newest, middle, 1)[:PAGE],
+        'dashboard top 10': skills.order_by('-hours_spent', 'id')[:10],
+        'weekly summary range': skills.filter(
+            created_date__gte=now - timedelta(days=7)
+        ).values('status').annotate(count=Count('id'), hours=Sum('hours_spent')).order_by(),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compares query plans and latencies of Skill access paths with and without indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000,
+                            help='Synthetic skills to seed into a throwaway database')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Timed runs per query')
+        parser.add_argument('--json', dest='json_path', default=None,
+                            help='Also write the results to this file as JSON')
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            self.stdout.write(f"Seeding {options['rows']} skills...")
+            seed_skills(options['rows'])
+
+            indexes = list(Skill._meta.indexes)
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(Skill, index)
+            before = self.measure(options['repeat'])
+
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(Skill, index)
+            if connection.vendor == 'sqlite':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+            after = self.measure(options['repeat'])
+
+        results = []
+        for label in before:
+            results.append({
+                'query': label,
+                'rows': options['rows'],
+                'before': before[label],
+                'after': after[label],
+            })
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}'))
+            for phase, data in (('before', before[label]), ('after', after[label])):
+                self.stdout.write(
+                    f"  {phase:<6} p50 {data['latency']['p50_ms']:>9.3f} ms   "
+                    f"p95 {data['latency']['p95_ms']:>9.3f} ms"
+                )
+                for line in data['plan'].splitlines():
+                    self.stdout.write(f'         {line}')
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"\nResults written to {options['json_path']}"))
+
+    def measure(self, repeat):
+        measured = {}
+        for label, queryset in access_paths().items():
+            measured[label] = {
+                'plan': queryset.explain(),
+                'latency': summarize(time_call(lambda: list(queryset.all()), repeat=repeat)),
+            }
+        return measured
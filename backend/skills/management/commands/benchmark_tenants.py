@@ -0,0 +1,173 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+from skills import stats
+from skills.benchmarks import (
+    PAGE, build_skill, explicit_created_dates, isolated_database,
+    read_dashboard_and_list, summarize, write_skill,
+)
+from skills.models import Skill
+
+
+def seed_tenants(users, skills_per_user, batch_size=5000, seed=42, stdout=None):
+    """
+    Creates `users` users with `skills_per_user` synthetic skills each and
+    builds their stats rows. Returns the user ids.
+    """
+    User = get_user_model()
+    User.objects.bulk_create(
+        # '!' is Django's unusable password; nobody logs in as these
+        [User(username=f'bench-{n}', password='!') for n in range(users)],
+        batch_size=batch_size,
+    )
+    owner_ids = list(
+        User.objects.filter(username__startswith='bench-').order_by('pk').values_list('pk', flat=True)
+    )
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    batch = []
+    with explicit_created_dates():
+        for owner_id in owner_ids:
+            batch.extend(build_skill(rng, now, owner_id=owner_id) for _ in range(skills_per_user))
+            if len(batch) >= batch_size:
+                Skill.objects.bulk_create(batch, batch_size=batch_size)
+                batch = []
+        if batch:
+            Skill.objects.bulk_create(batch, batch_size=batch_size)
+
+    # bulk_create sends no signals, so the per-user stats rows are built here
+    for done, owner_id in enumerate(owner_ids, start=1):
+        stats.rebuild(owner_id)
+        if stdout is not None and done % 1000 == 0:
+            stdout.write(f'  built stats for {done}/{len(owner_ids)} users')
+    return owner_ids
+
+
+def tenant_plans(owner_id):
+    """Query plans of the per-user reads, to show they use the owner indexes"""
+    skills = Skill.objects.filter(owner_id=owner_id)
+    return {
+        'list newest page': skills.order_by('-created_date', '-id')[:PAGE].explain(),
+        'list ?status=': skills.filter(status='completed').order_by('-created_date', '-id')[:PAGE].explain(),
+        'dashboard top 10': skills.order_by('-hours_spent', 'id')[:10].explain(),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Simulates many users working at once: each operation acts as a random user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000,
+                            help='Users to seed into a throwaway database')
+        parser.add_argument('--skills-per-user', type=int, default=25)
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16, 64],
+                            help='Concurrent sessions to run, one level at a time')
+        parser.add_argument('--duration', type=float, default=3.0,
+                            help='Seconds to run each worker count')
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help='Share of operations that are writes')
+        parser.add_argument('--json', dest='json_path', default=None,
+                            help='Also write the results to this file as JSON')
+
+    def handle(self, *args, **options):
+        users, per_user = options['users'], options['skills_per_user']
+        results = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            # A file, not the default in-memory test database, so locking
+            # between the worker connections is real
+            with isolated_database(test_name=os.path.join(directory, 'bench.sqlite3')):
+                self.stdout.write(f'Seeding {users} users with {per_user} skills each...')
+                owner_ids = seed_tenants(users, per_user, stdout=self.stdout)
+                if connection.vendor == 'sqlite':
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE')
+
+                plans = tenant_plans(owner_ids[len(owner_ids) // 2])
+                for label, plan in plans.items():
+                    self.stdout.write(self.style.MIGRATE_HEADING(label))
+                    for line in plan.splitlines():
+                        self.stdout.write(f'  {line}')
+                connection.close()
+
+                for workers in options['workers']:
+                    result = self.run_level(owner_ids, workers, options['duration'], options['write_ratio'])
+                    result.update(users=users, skills_per_user=per_user)
+                    results.append(result)
+                    self.report(result)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump({'plans': plans, 'results': results}, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"\nResults written to {options['json_path']}"))
+
+    def run_level(self, owner_ids, workers, duration, write_ratio):
+        reads, writes, errors = [], [], []
+        touched = set()
+        lock = threading.Lock()
+        start = threading.Barrier(workers + 1)
+        stop = threading.Event()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local_reads, local_writes, local_errors, local_touched = [], [], [], set()
+            start.wait()
+            try:
+                while not stop.is_set():
+                    owner_id = rng.choice(owner_ids)
+                    is_write = rng.random() < write_ratio
+                    started = time.perf_counter()
+                    try:
+                        write_skill(rng, owner_id) if is_write else read_dashboard_and_list(owner_id)
+                    except OperationalError as e:
+                        local_errors.append(str(e))
+                        continue
+                    (local_writes if is_write else local_reads).append(time.perf_counter() - started)
+                    local_touched.add(owner_id)
+            finally:
+                connection.close()
+                with lock:
+                    reads.extend(local_reads)
+                    writes.extend(local_writes)
+                    errors.extend(local_errors)
+                    touched.update(local_touched)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(workers)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            'workers': workers,
+            'duration_s': duration,
+            'users_touched': len(touched),
+            'reads_per_s': round(len(reads) / duration, 1),
+            'writes_per_s': round(len(writes) / duration, 1),
+            'read_latency': summarize(reads),
+            'write_latency': summarize(writes),
+            'errors': len(errors),
+            'error_samples': sorted(set(errors))[:3],
+        }
+
+    def report(self, result):
+        read, write = result['read_latency'], result['write_latency']
+        self.stdout.write(
+            f"  {result['workers']:>3} workers  {result['users_touched']:>5} users  "
+            f"reads {result['reads_per_s']:>8.1f}/s (p50 {read['p50_ms']:.2f} p99 {read['p99_ms']:.2f} ms)  "
+            f"writes {result['writes_per_s']:>7.1f}/s (p50 {write['p50_ms']:.2f} p99 {write['p99_ms']:.2f} ms)  "
+            f"errors {result['errors']}"
+        )
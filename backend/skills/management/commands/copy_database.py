@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers import sort_dependencies
+from django.db import connections, transaction
+
+from skills import owners
+from skillstack.database import database_config
+
+
+SOURCE_ALIAS = 'copy_source'
+# Tables whose rows the migrations create themselves; always replaced by
+# the copy. Migration 0013 also creates the default owner of those rows,
+# see seeded_rows().
+SEEDED_BY_MIGRATIONS = {'skills.DashboardStats'}
+
+
+@contextmanager
+def keep_auto_dates(models):
+    """Stops auto_now/auto_now_add fields from overwriting the copied values"""
+    toggled = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            for flag in ('auto_now', 'auto_now_add'):
+                if getattr(field, flag, False):
+                    setattr(field, flag, False)
+                    toggled.append((field, flag))
+    try:
+        yield
+    finally:
+        for field, flag in toggled:
+            setattr(field, flag, True)
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies every row of the given apps from another database (e.g. the old '
+        'db.sqlite3) into the configured one, keeping primary keys'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='DATABASE_URL to copy from, e.g. sqlite:///db.sqlite3')
+        parser.add_argument('--target', default='default', help='Database alias to copy into')
+        parser.add_argument('--apps', nargs='+', default=['auth.User', 'skills'],
+                            help='App labels or app_label.Model labels to copy '
+                                 '(the target must already be migrated); skills rows '
+                                 'need the users that own them')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete existing rows in the target tables first')
+
+    def handle(self, *args, **options):
+        target = options['target']
+        source = database_config(options['source'], conn_max_age=0)
+        # configure_settings fills in the keys Django expects on every alias
+        connections.databases[SOURCE_ALIAS] = connections.configure_settings(
+            {**connections.databases, SOURCE_ALIAS: source}
+        )[SOURCE_ALIAS]
+        try:
+            models = self.get_models(options['apps'])
+            self.check_target(models, target, options['flush'])
+            with keep_auto_dates(models):
+                for model in models:
+                    copied = self.copy_model(model, target, options['batch_size'])
+                    self.stdout.write(f'  {model._meta.label}: {copied} rows')
+            self.reset_sequences(models, target)
+        finally:
+            connections[SOURCE_ALIAS].close()
+            del connections.databases[SOURCE_ALIAS]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Copied {len(models)} tables into '{target}'"
+        ))
+
+    def get_models(self, labels):
+        app_list = {}
+        try:
+            for label in labels:
+                if '.' in label:
+                    model = apps.get_model(label)
+                    models = app_list.setdefault(model._meta.app_config, [])
+                    if models is not None:
+                        models.append(model)
+                else:
+                    # None means the whole app
+                    app_list[apps.get_app_config(label)] = None
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        # Parents before children so foreign keys resolve
+        return [
+            model for model in sort_dependencies(app_list.items(), allow_cycles=True)
+            if model._meta.managed and not model._meta.proxy
+        ]
+
+    def seeded_rows(self, model, target):
+        """
+        The rows of `model` in the target that migrations created themselves:
+        the stats row and the default owner (skills/owners.py) it belongs to
+        """
+        rows = model._base_manager.using(target)
+        if model._meta.label in SEEDED_BY_MIGRATIONS:
+            return rows.all()
+        if model._meta.label == settings.AUTH_USER_MODEL:
+            return rows.filter(**{model.USERNAME_FIELD: owners.get_setting('DEFAULT_USERNAME')})
+        return rows.none()
+
+    def check_target(self, models, target, flush):
+        seeded = {
+            model: list(self.seeded_rows(model, target).values_list('pk', flat=True))
+            for model in models
+        }
+        filled = [
+            model._meta.label for model in models
+            if model._base_manager.using(target).exclude(pk__in=seeded[model]).exists()
+        ]
+        if filled and not flush:
+            raise CommandError(
+                f"Target already has rows in {', '.join(filled)}; use --flush to replace them"
+            )
+        # Plain DELETEs: a queryset delete would fire the Skill signals and
+        # update the derived tables we are about to overwrite
+        connection = connections[target]
+        with transaction.atomic(using=target), connection.cursor() as cursor:
+            for model in reversed(models):
+                table = connection.ops.quote_name(model._meta.db_table)
+                if flush:
+                    cursor.execute(f'DELETE FROM {table}')
+                elif seeded[model]:
+                    pk_column = connection.ops.quote_name(model._meta.pk.column)
+                    placeholders = ', '.join(['%s'] * len(seeded[model]))
+                    cursor.execute(f'DELETE FROM {table} WHERE {pk_column} IN ({placeholders})', seeded[model])
+
+    def copy_model(self, model, target, batch_size):
+        """Streams the source table in batches; bulk_create sends no signals"""
+        fields = [field.attname for field in model._meta.concrete_fields]
+        rows = model._base_manager.using(SOURCE_ALIAS).order_by('pk').values_list(*fields)
+
+        copied = 0
+        batch = []
+        with transaction.atomic(using=target):
+            for values in rows.iterator(chunk_size=batch_size):
+                batch.append(model(**dict(zip(fields, values))))
+                if len(batch) >= batch_size:
+                    model._base_manager.using(target).bulk_create(batch)
+                    copied += len(batch)
+                    batch = []
+            if batch:
+                model._base_manager.using(target).bulk_create(batch)
+                copied += len(batch)
+        return copied
+
+    def reset_sequences(self, models, target):
+        """Moves id sequences past the copied keys (a no-op on SQLite)"""
+        connection = connections[target]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
@@ -0,0 +1,239 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+
+from skills import utils
+from skills.models import Skill
+from skills.ratelimit import TokenBucket
+from skills.signals import record_skill_changes, skill_snapshot
+
+
+OPERATIONS = ('resources', 'mastery', 'category')
+# The skills/providers.py operation behind each of OPERATIONS
+PROVIDER_OPERATIONS = {'resources': 'resources', 'mastery': 'mastery', 'category': 'categorize'}
+# Stored only when they come from a real model (see jobs.save_result)
+MODEL_OUTPUT = ('resources', 'mastery')
+
+
+class Command(BaseCommand):
+    help = 'Backfills AI resources, mastery predictions and categories for skills missing them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', default=','.join(OPERATIONS),
+                            help='Comma separated subset of: resources,mastery,category')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Skills fetched and written back per transaction')
+        parser.add_argument('--workers', type=int, default=8,
+                            help='Concurrent Gemini calls')
+        parser.add_argument('--prompt-size', type=int, default=utils.BATCH_SIZE,
+                            help='Skills packed into one batched categorize/resources prompt')
+        parser.add_argument('--rate', type=float, default=2.0,
+                            help='Maximum Gemini calls per second')
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Stop after this many skills')
+        parser.add_argument('--checkpoint', default=str(Path(settings.BASE_DIR) / 'enrich_skills.checkpoint'),
+                            help='File storing the last processed skill id')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore the checkpoint and start from the first skill')
+
+    def handle(self, *args, **options):
+        self.operations = [op.strip() for op in options['only'].split(',') if op.strip()]
+        unknown = set(self.operations) - set(OPERATIONS)
+        if unknown:
+            raise CommandError(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+        unconfigured = [op for op in self.operations if not utils.ai_enabled(PROVIDER_OPERATIONS[op])]
+        if unconfigured:
+            raise CommandError(
+                f"The AI provider for {', '.join(unconfigured)} is not configured; nothing to enrich with"
+            )
+        placeholders = [
+            op for op in self.operations
+            if op in MODEL_OUTPUT and not utils.ai_persistable(PROVIDER_OPERATIONS[op])
+        ]
+        if placeholders:
+            raise CommandError(
+                f"The AI provider for {', '.join(placeholders)} only gives placeholder answers; "
+                f"they are not stored on skills"
+            )
+
+        self.bucket = TokenBucket(options['rate'])
+        self.prompt_size = options['prompt_size']
+        checkpoint = Path(options['checkpoint'])
+        last_id = 0 if options['restart'] else self.read_checkpoint(checkpoint)
+
+        queryset = Skill.objects.filter(self.missing_filter())
+        total = queryset.filter(id__gt=last_id).count()
+        if options['limit']:
+            total = min(total, options['limit'])
+        self.stdout.write(f'Enriching {total} skills (resuming after id {last_id})')
+
+        processed = updated = failed = 0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while processed < total:
+                batch_size = min(options['batch_size'], total - processed)
+                # Keyset scan on id keeps memory flat and makes restarts cheap
+                batch = list(queryset.filter(id__gt=last_id).order_by('id')[:batch_size])
+                if not batch:
+                    break
+
+                before = {skill.id: skill_snapshot(skill) for skill in batch}
+                self.prefetch(batch, executor)
+                results = list(executor.map(self.enrich, batch))
+                changed_fields = set()
+                for fields, errors in results:
+                    changed_fields |= fields
+                    failed += errors
+                changed = [skill for skill, (fields, _) in zip(batch, results) if fields]
+
+                if changed:
+                    with transaction.atomic():
+                        Skill.objects.bulk_update(changed, sorted(changed_fields))
+                        # bulk_update sends no signals; keep dashboard stats in step
+                        record_skill_changes([
+                            (before[skill.id], skill_snapshot(skill)) for skill in changed
+                        ])
+
+                processed += len(batch)
+                updated += len(changed)
+                last_id = batch[-1].id
+                self.write_checkpoint(checkpoint, last_id)
+
+                elapsed = time.monotonic() - started
+                rate = processed / elapsed if elapsed else 0
+                eta = (total - processed) / rate if rate else 0
+                self.stdout.write(
+                    f'{processed}/{total} skills, {updated} updated, {failed} failed calls '
+                    f'({rate:.1f} skills/s, ~{eta:.0f}s left, last id {last_id})'
+                )
+
+        if processed >= total and checkpoint.exists():
+            checkpoint.unlink()
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {updated} skills updated, {failed} failed calls'
+        ))
+
+    def missing_filter(self):
+        conditions = Q()
+        if 'resources' in self.operations:
+            conditions |= Q(recommended_resources={})
+        if 'mastery' in self.operations:
+            conditions |= Q(mastery_prediction={})
+        if 'category' in self.operations:
+            conditions |= self.uncategorized()
+        return conditions
+
+    @staticmethod
+    def uncategorized():
+        """'other' skills the model hasn't categorized under their current name"""
+        return Q(category='other') & ~Q(categorized_name=F('skill_name'))
+
+    def needs_category(self, skill):
+        return skill.category == 'other' and skill.categorized_name != skill.skill_name
+
+    def prefetch(self, batch, executor):
+        """
+        Resolves categories and resources for the whole batch with batched
+        prompts, one rate-limited Gemini call per --prompt-size skills.
+        Skills the batch could not answer are retried one by one in enrich().
+        """
+        self.categories = {}
+        self.resources = {}
+        futures = []
+
+        if 'category' in self.operations:
+            names = [skill.skill_name for skill in batch if self.needs_category(skill)]
+            for start in range(0, len(names), self.prompt_size):
+                futures.append(executor.submit(
+                    self.run_batch, utils.auto_categorize_skills,
+                    names[start:start + self.prompt_size], self.categories,
+                ))
+
+        if 'resources' in self.operations:
+            names = [skill.skill_name for skill in batch if not skill.recommended_resources]
+            for start in range(0, len(names), self.prompt_size):
+                futures.append(executor.submit(
+                    self.run_batch, utils.get_ai_resources_batch,
+                    names[start:start + self.prompt_size], self.resources,
+                ))
+
+        for future in futures:
+            future.result()
+
+    def run_batch(self, function, names, results):
+        try:
+            self.bucket.acquire()
+            results.update(function(names, fallback=False, batch_size=len(names)))
+        finally:
+            close_old_connections()
+
+    def enrich(self, skill):
+        """
+        Runs the missing AI operations for one skill (in a worker thread).
+        Returns the set of changed fields and the number of failed calls.
+        """
+        fields = set()
+        errors = 0
+        try:
+            if 'resources' in self.operations and not skill.recommended_resources:
+                try:
+                    resources = self.resources.get(skill.skill_name)
+                    if resources is None:
+                        self.bucket.acquire()
+                        resources = utils.get_ai_resources(
+                            skill.skill_name, skill.resource_type, strict=True
+                        )
+                    skill.set_recommended_resources(resources)
+                    fields.add('recommended_resources')
+                except Exception:
+                    errors += 1
+
+            if 'mastery' in self.operations and not skill.mastery_prediction:
+                try:
+                    self.bucket.acquire()
+                    skill.set_mastery_prediction(utils.predict_mastery(
+                        skill.skill_name,
+                        skill.difficulty_rating,
+                        float(skill.hours_spent),
+                        strict=True,
+                    ))
+                    fields.update(('mastery_prediction', 'mastery_fingerprint'))
+                except Exception:
+                    errors += 1
+
+            if 'category' in self.operations and self.needs_category(skill):
+                try:
+                    category = self.categories.get(skill.skill_name)
+                    if category is None:
+                        self.bucket.acquire()
+                        category = utils.auto_categorize_skill(skill.skill_name, strict=True)
+                    if category != skill.category:
+                        skill.category = category
+                        fields.add('category')
+                    # Offline rules may guess 'other' for what a model would place
+                    if utils.ai_persistable('categorize'):
+                        skill.categorized_name = skill.skill_name
+                        fields.add('categorized_name')
+                except Exception:
+                    errors += 1
+        finally:
+            # The AI cache touches the DB from this thread
+            close_old_connections()
+        return fields, errors
+
+    def read_checkpoint(self, path):
+        try:
+            return json.loads(path.read_text())['last_id']
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def write_checkpoint(self, path, last_id):
+        path.write_text(json.dumps({'last_id': last_id}))
@@ -0,0 +1,41 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from skills import transfer
+from skills.models import Skill
+
+
+class Command(BaseCommand):
+    help = "Streams all skills (or one user's) to a file (or stdout) as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-',
+                            help='Destination file, or - for stdout')
+        parser.add_argument('--format', choices=transfer.FORMATS, default='ndjson')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched from the database at a time')
+        parser.add_argument('--owner', default=None,
+                            help='Only export the skills of this username')
+
+    def handle(self, *args, **options):
+        queryset = Skill.objects.all()
+        if options['owner']:
+            owner_id = get_user_model().objects.filter(
+                username=options['owner']
+            ).values_list('pk', flat=True).first()
+            if owner_id is None:
+                raise CommandError(f"No user named {options['owner']!r}")
+            queryset = queryset.filter(owner_id=owner_id)
+
+        rows = transfer.export_rows(queryset, chunk_size=options['chunk_size'])
+        lines = transfer.render(rows, options['format'])
+
+        if options['output'] == '-':
+            sys.stdout.writelines(lines)
+            return
+
+        with open(options['output'], 'w', newline='', encoding='utf-8') as handle:
+            handle.writelines(lines)
+        self.stderr.write(self.style.SUCCESS(f"Exported skills to {options['output']}"))
@@ -0,0 +1,53 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from skills import owners, transfer
+
+
+class Command(BaseCommand):
+    help = 'Imports skills from an NDJSON or CSV export in batched transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', nargs='?', default='-',
+                            help='Source file, or - for stdin')
+        parser.add_argument('--format', choices=transfer.FORMATS, default=None,
+                            help='Defaults to csv for .csv files, ndjson otherwise')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows inserted per transaction')
+        parser.add_argument('--owner', default=None,
+                            help='Username the imported skills belong to (default: the shared default user)')
+
+    def handle(self, *args, **options):
+        fmt = options['format']
+        if fmt is None:
+            fmt = 'csv' if options['input'].endswith('.csv') else 'ndjson'
+
+        if options['owner']:
+            owner_id = get_user_model().objects.filter(
+                username=options['owner']
+            ).values_list('pk', flat=True).first()
+            if owner_id is None:
+                raise CommandError(f"No user named {options['owner']!r}")
+        else:
+            owner_id = owners.default_owner_id()
+
+        def progress(summary):
+            self.stderr.write(f"  {summary['imported']} imported, {summary['failed']} failed")
+
+        if options['input'] == '-':
+            summary = transfer.import_rows(
+                transfer.parse(sys.stdin, fmt), owner_id, options['batch_size'], progress
+            )
+        else:
+            with open(options['input'], newline='', encoding='utf-8') as handle:
+                summary = transfer.import_rows(
+                    transfer.parse(handle, fmt), owner_id, options['batch_size'], progress
+                )
+
+        for error in summary['errors']:
+            self.stderr.write(self.style.WARNING(f"Row {error['row']}: {error['errors']}"))
+        self.stderr.write(self.style.SUCCESS(
+            f"Imported {summary['imported']} skills, {summary['failed']} failed"
+        ))
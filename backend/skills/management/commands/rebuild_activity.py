@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from skills import activity, analytics
+from skills.models import ActivityDay, ActivityRollup, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Recomputes every user's daily activity, time-series rollups and streak from the activity event log"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the stored rollups with the event log; exit non-zero on drift')
+
+    def handle(self, *args, **options):
+        owner_ids = activity.owner_ids()
+        drift = []
+        for owner_id in owner_ids:
+            drift.extend(f'user {owner_id}: {line}' for line in self.find_drift(owner_id))
+
+        for line in drift:
+            self.stdout.write(self.style.WARNING(line))
+
+        if options['check']:
+            if drift:
+                raise CommandError('Activity rollups have drifted; run rebuild_activity to fix them')
+            self.stdout.write(self.style.SUCCESS('Activity rollups match the event log'))
+            return
+
+        days = rollups = 0
+        for owner_id in owner_ids:
+            activity.rebuild(owner_id)
+            rollups += analytics.rebuild(owner_id)
+            days += ActivityDay.objects.filter(owner_id=owner_id).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {days} activity days and {rollups} rollup rows for {len(owner_ids)} users'
+        ))
+
+    def find_drift(self, owner_id):
+        expected = activity.compute_days(owner_id)
+        check_ins = activity.check_in_days(owner_id, expected)
+        expected.update({day: {'events': 0, 'hours': Decimal('0.00'), 'completions': 0} for day in check_ins})
+        stored = {
+            row.date: {'events': row.events, 'hours': row.hours, 'completions': row.completions}
+            for row in ActivityDay.objects.filter(owner_id=owner_id)
+        }
+        for day in sorted(set(expected) | set(stored)):
+            if expected.get(day) != stored.get(day):
+                yield f'{day}: stored {stored.get(day)!r}, expected {expected.get(day)!r}'
+
+        expected_rollups = analytics.compute(owner_id)
+        stored_rollups = {
+            (row.bucket, row.start, row.category): {
+                'hours': row.hours, 'skills': row.skills, 'completions': row.completions,
+            }
+            for row in ActivityRollup.objects.filter(owner_id=owner_id)
+        }
+        for key in sorted(set(expected_rollups) | set(stored_rollups)):
+            if expected_rollups.get(key) != stored_rollups.get(key):
+                yield (
+                    f'{key[0]} {key[1]} {key[2]}: stored {stored_rollups.get(key)!r}, '
+                    f'expected {expected_rollups.get(key)!r}'
+                )
+
+        streak = activity.streak_from_days(sorted(expected))
+        profile = UserProfile.objects.filter(owner_id=owner_id).values(*streak).first() or {}
+        for field, value in streak.items():
+            if profile.get(field) != value:
+                yield f'{field}: stored {profile.get(field)!r}, expected {value!r}'
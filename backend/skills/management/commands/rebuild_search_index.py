@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from skills import search
+
+
+class Command(BaseCommand):
+    help = 'Recreates the SQLite FTS5 search index and its sync triggers'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The FTS5 index is only used on SQLite; other databases use icontains')
+
+        with connection.schema_editor() as editor:
+            search.install(editor)
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
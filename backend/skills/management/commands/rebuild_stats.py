@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from skills import stats
+from skills.models import DashboardStats
+
+
+class Command(BaseCommand):
+    help = "Recomputes every user's materialized dashboard stats from the Skill table and verifies them"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the stored stats with the table; exit non-zero on drift')
+
+    def handle(self, *args, **options):
+        drift = []
+        for owner_id in stats.owner_ids():
+            stored = DashboardStats.objects.filter(owner_id=owner_id).first()
+            expected = stats.compute(owner_id)
+
+            if stored is None:
+                drift.append(f'user {owner_id}: stats row is missing')
+                continue
+            actual = {
+                'total_skills': stored.total_skills,
+                'total_hours': stored.total_hours,
+                'status_counts': stored.get_status_counts(),
+                'category_counts': stored.get_category_counts(),
+                'top_skills': stored.get_top_skills(),
+            }
+            for key, value in expected.items():
+                if actual[key] != value:
+                    drift.append(f'user {owner_id}: {key}: stored {actual[key]!r}, expected {value!r}')
+
+        for line in drift:
+            self.stdout.write(self.style.WARNING(line))
+
+        if options['check']:
+            if drift:
+                raise CommandError('Dashboard stats have drifted; run rebuild_stats to fix them')
+            self.stdout.write(self.style.SUCCESS('Dashboard stats match the Skill table'))
+            return
+
+        rebuilt = stats.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt dashboard stats for {len(rebuilt)} users: '
+            f'{sum(row.total_skills for row in rebuilt)} skills, '
+            f'{sum(row.total_hours for row in rebuilt)} hours'
+        ))
@@ -0,0 +1,30 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from skills.jobs import Worker
+
+
+class Command(BaseCommand):
+    help = 'Runs background workers that process queued AI jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Number of jobs processed at once (default: AI_JOBS["CONCURRENCY"])')
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+        )
+
+        # Finish the current jobs and exit cleanly when the platform stops us
+        signal.signal(signal.SIGTERM, lambda *args: worker.stop_event.set())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'AI worker {worker.name} started with {worker.concurrency} threads'
+        ))
+        worker.run_forever()
+        self.stdout.write('AI worker stopped')
@@ -0,0 +1,328 @@
+"""
+Per-request instrumentation and the Prometheus text at /api/metrics/.
+
+MetricsMiddleware opens a RequestMetrics for every request in a context
+variable. While it is open, every SQL query (a wrapper installed on each
+new connection), serializer and renderer work (timed()) and LLM call
+(providers.add_listener) adds to it. Context variables follow the request
+into sync_to_async threads and async tasks. When the response leaves, the
+totals go out three ways:
+
+- as a Server-Timing header
+- as one JSON line on the 'skills.requests' logger, when LOG_REQUESTS is on
+- into counters and per-view latency histograms that render() formats
+  for Prometheus
+
+Totals stop when the view returns, so a streamed body's generation is not
+counted. The numbers live in the process: each gunicorn/uvicorn worker
+reports its own.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from . import gemini
+from .ai_cache import ai_cache
+
+
+DEFAULTS = {
+    'LOG_REQUESTS': False,
+    'SERVER_TIMING': True,
+    # Upper bounds (seconds) of the request latency histogram buckets
+    'BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    # When set, /api/metrics/ wants "Authorization: Bearer <TOKEN>"
+    'TOKEN': '',
+}
+
+logger = logging.getLogger('skills.requests')
+_current = ContextVar('request_metrics', default=None)
+
+
+def get_setting(name):
+    return getattr(settings, 'METRICS', {}).get(name, DEFAULTS[name])
+
+
+class RequestMetrics:
+    """What one request spent its time on"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.spans = defaultdict(float)
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.llm_prompt_tokens = 0
+        self.llm_response_tokens = 0
+
+    def server_timing(self, total):
+        parts = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"']
+        parts += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.spans.items()]
+        if self.llm_calls:
+            parts.append(f'llm;dur={self.llm_seconds * 1000:.1f};desc="{self.llm_calls} calls"')
+        parts.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(parts)
+
+
+def current():
+    """The RequestMetrics of the request being served, or None outside one"""
+    return _current.get()
+
+
+@contextmanager
+def timed(name):
+    """Adds the time spent in the block to the current request's `name` span"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.spans[name] += time.perf_counter() - started
+
+
+class Registry:
+    """Process-wide counters and histograms, labelled like Prometheus series"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(int)
+        self.histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            self.counters[name, labels] += amount
+
+    def observe(self, name, labels, value):
+        buckets = get_setting('BUCKETS')
+        with self._lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[name, labels] = {
+                    'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0,
+                }
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return (
+                dict(self.counters),
+                {key: {**value, 'buckets': list(value['buckets'])} for key, value in self.histograms.items()},
+            )
+
+
+registry = Registry()
+
+HELP = {
+    'skillstack_http_requests_total': ('counter', 'Requests served, by view, method and status'),
+    'skillstack_http_request_duration_seconds': ('histogram', 'Time to produce the response, by view'),
+    'skillstack_db_queries_total': ('counter', 'SQL queries run while serving requests, by view'),
+    'skillstack_db_seconds_total': ('counter', 'Time spent in SQL queries, by view'),
+    'skillstack_serialize_seconds_total': ('counter', 'Time spent serializing and rendering responses, by view'),
+    'skillstack_llm_calls_total': ('counter', 'LLM provider calls, by provider, model and outcome'),
+    'skillstack_llm_seconds_total': ('counter', 'Time spent waiting for LLM providers, by provider and model'),
+    'skillstack_llm_tokens_total': ('counter', 'LLM tokens by provider, model and direction (estimated from length if the provider reports none)'),
+    'skillstack_gemini_circuit_state': ('gauge', 'Circuit breaker state per model (1 for the current state)'),
+    'skillstack_gemini_rejected_total': ('counter', 'Gemini calls refused by an open circuit'),
+    'skillstack_gemini_circuit_opened_total': ('counter', 'Times the circuit breaker opened'),
+    'skillstack_ai_cache_events_total': ('counter', 'AI response cache lookups, writes and evictions'),
+    'skillstack_ai_cache_memory_entries': ('gauge', 'Entries in the in-process AI response cache'),
+}
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper: counts queries and their time for the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """connection_created receiver"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def record_llm_call(provider, model_name, seconds, outcome, prompt_tokens, response_tokens):
+    """providers listener"""
+    labels = (('provider', provider), ('model', model_name))
+    registry.inc('skillstack_llm_calls_total', (*labels, ('outcome', outcome)))
+    registry.inc('skillstack_llm_seconds_total', labels, seconds)
+    for direction, tokens in (('prompt', prompt_tokens), ('response', response_tokens)):
+        if tokens:
+            registry.inc('skillstack_llm_tokens_total', (*labels, ('direction', direction)), tokens)
+
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.llm_calls += 1
+        metrics.llm_seconds += seconds
+        metrics.llm_prompt_tokens += prompt_tokens or 0
+        metrics.llm_response_tokens += response_tokens or 0
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unmatched>'
+    return match.view_name
+
+
+def finish(request, response, metrics):
+    """Reports a finished request: header, log line and registry"""
+    total = time.perf_counter() - metrics.started
+    view = view_name(request)
+
+    registry.inc('skillstack_http_requests_total', (
+        ('view', view), ('method', request.method), ('status', str(response.status_code)),
+    ))
+    registry.observe('skillstack_http_request_duration_seconds', (('view', view),), total)
+    registry.inc('skillstack_db_queries_total', (('view', view),), metrics.db_queries)
+    registry.inc('skillstack_db_seconds_total', (('view', view),), metrics.db_seconds)
+    registry.inc('skillstack_serialize_seconds_total', (('view', view),), metrics.spans.get('serialize', 0.0))
+
+    if get_setting('SERVER_TIMING'):
+        response['Server-Timing'] = metrics.server_timing(total)
+    if get_setting('LOG_REQUESTS'):
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'duration_ms': round(total * 1000, 2),
+            'db_queries': metrics.db_queries,
+            'db_ms': round(metrics.db_seconds * 1000, 2),
+            'serialize_ms': round(metrics.spans.get('serialize', 0.0) * 1000, 2),
+            'llm_calls': metrics.llm_calls,
+            'llm_ms': round(metrics.llm_seconds * 1000, 2),
+            'llm_prompt_tokens': metrics.llm_prompt_tokens,
+            'llm_response_tokens': metrics.llm_response_tokens,
+        }))
+    return response
+
+
+class MetricsMiddleware:
+    """Measures each request; works under both WSGI and ASGI"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return finish(request, response, metrics)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """DRF's JSONRenderer, with its time added to the request's serialize span"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('serialize'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in pairs) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def ai_series():
+    """The /api/ai-status/ numbers as series: breaker state and AI cache counters"""
+    series = []
+    for model_name, breaker in gemini.stats().items():
+        for state in ('closed', 'open', 'half_open'):
+            series.append((
+                'skillstack_gemini_circuit_state',
+                (('model', model_name), ('state', state)),
+                int(breaker['state'] == state),
+            ))
+        series.append(('skillstack_gemini_rejected_total', (('model', model_name),), breaker['rejected']))
+        series.append(('skillstack_gemini_circuit_opened_total', (('model', model_name),), breaker['opened']))
+
+    cache = ai_cache.stats()
+    series.append(('skillstack_ai_cache_memory_entries', (), cache.pop('memory_entries')))
+    cache.pop('hit_rate')
+    for event, count in sorted(cache.items()):
+        series.append(('skillstack_ai_cache_events_total', (('event', event),), count))
+    return series
+
+
+def render():
+    """Everything in the Prometheus text exposition format"""
+    counters, histograms = registry.snapshot()
+    by_name = defaultdict(list)
+    for (name, labels), value in counters.items():
+        by_name[name].append((labels, value))
+    for name, labels, value in ai_series():
+        by_name[name].append((labels, value))
+
+    lines = []
+    for name, (kind, help_text) in HELP.items():
+        if kind == 'histogram':
+            series = sorted((labels, value) for (hist_name, labels), value in histograms.items() if hist_name == name)
+        else:
+            series = sorted(by_name.get(name, []))
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                continue
+            # observe() already counts each value in every bucket it fits, so these are cumulative
+            for bound, count in zip(get_setting('BUCKETS'), value['buckets']):
+                lines.append(f"{name}_bucket{format_labels(labels, [('le', bound)])} {count}")
+            lines.append(f"{name}_bucket{format_labels(labels, [('le', '+Inf')])} {value['count']}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(value['sum'])}")
+            lines.append(f"{name}_count{format_labels(labels)} {value['count']}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AICacheEntry',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('operation', models.CharField(blank=True, max_length=50)),
+                ('model_name', models.CharField(blank=True, max_length=100)),
+                ('value', models.TextField()),
+                ('hit_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed', models.DateTimeField(db_index=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'AI Cache Entry',
+                'verbose_name_plural': 'AI Cache Entries',
+            },
+        ),
+    ]
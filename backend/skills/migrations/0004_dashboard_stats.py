@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:30
+
+import json
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_initial_stats(apps, schema_editor):
+    """Seeds the stats row from the skills that already exist"""
+    Skill = apps.get_model('skills', 'Skill')
+    DashboardStats = apps.get_model('skills', 'DashboardStats')
+
+    status_counts = dict(Skill.objects.values_list('status').annotate(count=Count('id')).order_by())
+    category_counts = dict(Skill.objects.values_list('category').annotate(count=Count('id')).order_by())
+    top_skills = [
+        {
+            'id': row['id'],
+            'skill_name': row['skill_name'],
+            'hours_spent': str(row['hours_spent']),
+            'status': row['status'],
+        }
+        for row in Skill.objects.order_by('-hours_spent', 'id').values(
+            'id', 'skill_name', 'hours_spent', 'status'
+        )[:10]
+    ]
+
+    DashboardStats.objects.create(
+        pk=1,
+        total_skills=sum(status_counts.values()),
+        total_hours=Skill.objects.aggregate(total=Sum('hours_spent'))['total'] or 0,
+        status_counts=json.dumps(status_counts),
+        category_counts=json.dumps(category_counts),
+        top_skills=json.dumps(top_skills),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_ai_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_skills', models.IntegerField(default=0)),
+                ('total_hours', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('status_counts', models.TextField(default='{}')),
+                ('category_counts', models.TextField(default='{}')),
+                ('top_skills', models.TextField(default='[]')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Stats',
+                'verbose_name_plural': 'Dashboard Stats',
+            },
+        ),
+        migrations.RunPython(build_initial_stats, migrations.RunPython.noop),
+    ]
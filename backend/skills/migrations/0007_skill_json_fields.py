@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:33
+
+import json
+
+from django.db import migrations, models
+
+from skills import search
+
+
+def repair_json_columns(apps, schema_editor):
+    """
+    Rewrites rows whose JSON text is empty, malformed or not an object as
+    '{}', so the JSON_VALID check on the new columns accepts every row.
+    """
+    Skill = apps.get_model('skills', 'Skill')
+    for field in ('recommended_resources', 'mastery_prediction'):
+        broken = []
+        for pk, raw in Skill.objects.values_list('pk', field).iterator(chunk_size=2000):
+            try:
+                valid = isinstance(json.loads(raw), dict)
+            except (TypeError, ValueError):
+                valid = False
+            if not valid:
+                broken.append(pk)
+        for start in range(0, len(broken), 500):
+            Skill.objects.filter(pk__in=broken[start:start + 500]).update(**{field: '{}'})
+
+
+def reinstall_search_index(apps, schema_editor):
+    # Altering the columns remakes skills_skill on SQLite, which drops its triggers
+    search.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0006_skill_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(repair_json_columns, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='skill',
+            name='mastery_prediction',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='recommended_resources',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
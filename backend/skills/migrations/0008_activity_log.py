@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:37
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def backfill_created_events(apps, schema_editor):
+    """
+    Logs a 'created' event for every existing skill on its created_date and
+    rolls them into days, so history starts with the data already there.
+    The streak counters on UserProfile are left as they are.
+    """
+    Skill = apps.get_model('skills', 'Skill')
+    ActivityEvent = apps.get_model('skills', 'ActivityEvent')
+    ActivityDay = apps.get_model('skills', 'ActivityDay')
+
+    days = defaultdict(lambda: {'events': 0, 'hours': Decimal('0'), 'completions': 0})
+    events = []
+    rows = Skill.objects.order_by('id').values(
+        'id', 'skill_name', 'status', 'hours_spent', 'created_date'
+    )
+    for row in rows.iterator(chunk_size=2000):
+        day = row['created_date'].date()
+        events.append(ActivityEvent(
+            skill_id=row['id'],
+            skill_name=row['skill_name'],
+            kind='created',
+            date=day,
+            hours_delta=row['hours_spent'],
+            new_status=row['status'],
+            created_at=row['created_date'],
+        ))
+        days[day]['events'] += 1
+        days[day]['hours'] += Decimal(str(row['hours_spent']))
+        days[day]['completions'] += int(row['status'] == 'completed')
+        if len(events) >= 1000:
+            ActivityEvent.objects.bulk_create(events)
+            events = []
+    ActivityEvent.objects.bulk_create(events)
+    ActivityDay.objects.bulk_create(
+        [ActivityDay(date=day, **bucket) for day, bucket in days.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0007_skill_json_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('events', models.IntegerField(default=0)),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('completions', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Activity Day',
+                'verbose_name_plural': 'Activity Days',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill_id', models.IntegerField(db_index=True)),
+                ('skill_name', models.CharField(blank=True, max_length=200)),
+                ('kind', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=20)),
+                ('date', models.DateField(db_index=True)),
+                ('hours_delta', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('old_status', models.CharField(blank=True, max_length=20)),
+                ('new_status', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Activity Event',
+                'verbose_name_plural': 'Activity Events',
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.RunPython(backfill_created_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:39
+
+from django.db import migrations, models
+
+from skills import analytics
+
+
+def fill_categories_and_rollups(apps, schema_editor):
+    """
+    Copies each skill's current category onto its past events (the closest
+    we have for history), then builds the rollups from the event log.
+    """
+    Skill = apps.get_model('skills', 'Skill')
+    ActivityEvent = apps.get_model('skills', 'ActivityEvent')
+    ActivityRollup = apps.get_model('skills', 'ActivityRollup')
+
+    for category in Skill.objects.values_list('category', flat=True).distinct():
+        skill_ids = Skill.objects.filter(category=category).values('id')
+        ActivityEvent.objects.filter(skill_id__in=skill_ids).update(category=category or '')
+
+    events = ActivityEvent.objects.exclude(kind='deleted')
+    totals = analytics.totals_for(events.iterator(chunk_size=2000))
+    ActivityRollup.objects.bulk_create(
+        [
+            ActivityRollup(bucket=bucket, start=start, category=category, **values)
+            for (bucket, start, category), values in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0008_activity_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('start', models.DateField()),
+                ('category', models.CharField(max_length=50)),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('skills', models.IntegerField(default=0)),
+                ('completions', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Activity Rollup',
+                'verbose_name_plural': 'Activity Rollups',
+            },
+        ),
+        migrations.AddField(
+            model_name='activityevent',
+            name='category',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddConstraint(
+            model_name='activityrollup',
+            constraint=models.UniqueConstraint(fields=('bucket', 'start', 'category'), name='activity_rollup_bucket_start_category_uniq'),
+        ),
+        migrations.RunPython(fill_categories_and_rollups, migrations.RunPython.noop),
+    ]
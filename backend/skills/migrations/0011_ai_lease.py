@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0010_table_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AILease',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=32)),
+                ('expires_at', models.DateTimeField()),
+                ('done', models.BooleanField(default=False)),
+                ('result', models.TextField(blank=True, default='')),
+                ('error', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:53
+
+from django.db import migrations, models
+
+from skills import search
+
+
+def reinstall_search_index(apps, schema_editor):
+    # Adding the column remakes skills_skill on SQLite, which drops its triggers
+    search.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0011_ai_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aijob',
+            name='refresh',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='mastery_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
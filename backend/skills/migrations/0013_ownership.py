@@ -0,0 +1,168 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from skills import owners, search
+
+
+OWNED_MODELS = ('Skill', 'UserProfile', 'DashboardStats', 'ActivityEvent', 'ActivityDay', 'ActivityRollup')
+
+
+def assign_default_owner(apps, schema_editor):
+    """
+    Everything so far belonged to the one implicit user; hand it to the
+    default owner. Only profile and stats row 1 were ever read, so other
+    rows of those singletons are dropped.
+    """
+    models_by_name = {name: apps.get_model('skills', name) for name in OWNED_MODELS}
+    if not any(model.objects.exists() for model in models_by_name.values()):
+        return
+
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    owner, _ = User.objects.get_or_create(username=owners.get_setting('DEFAULT_USERNAME'))
+
+    for name in ('UserProfile', 'DashboardStats'):
+        model = models_by_name[name]
+        keep = model.objects.order_by('pk').values_list('pk', flat=True).first()
+        model.objects.exclude(pk=keep).delete()
+
+    for model in models_by_name.values():
+        model.objects.filter(owner__isnull=True).update(owner=owner)
+
+
+def reinstall_search_index(apps, schema_editor):
+    # Adding the column remakes skills_skill on SQLite, which drops its triggers
+    search.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('skills', '0012_mastery_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='activityrollup',
+            name='activity_rollup_bucket_start_category_uniq',
+        ),
+        migrations.RemoveIndex(
+            model_name='skill',
+            name='skill_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='skill',
+            name='skill_category_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='skill',
+            name='skill_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='skill',
+            name='skill_hours_idx',
+        ),
+        migrations.AddField(
+            model_name='activityday',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_days', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='activityevent',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='activityrollup',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='owner',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_stats', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='skills', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='owner',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(assign_default_owner, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='activityday',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity_days', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='activityevent',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='activityrollup',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='owner',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_stats', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='skills', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='owner',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='activityday',
+            name='date',
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name='activityevent',
+            name='date',
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(fields=['owner', 'date'], name='activity_event_owner_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['owner', 'status', 'created_date'], name='skill_owner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['owner', 'category', 'created_date'], name='skill_owner_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['owner', 'created_date', 'id'], name='skill_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['owner', '-hours_spent', 'id'], name='skill_owner_hours_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='activityday',
+            constraint=models.UniqueConstraint(fields=('owner', 'date'), name='activity_day_owner_date_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='activityrollup',
+            constraint=models.UniqueConstraint(fields=('owner', 'bucket', 'start', 'category'), name='activity_rollup_owner_bucket_uniq'),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
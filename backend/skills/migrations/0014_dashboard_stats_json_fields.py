@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:41
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def top_hours_as_numbers(apps, schema_editor):
+    """top_skills kept hours_spent as a string; the API returns a number"""
+    DashboardStats = apps.get_model('skills', 'DashboardStats')
+    for stats in DashboardStats.objects.all():
+        stats.top_skills = [
+            {**entry, 'hours_spent': float(Decimal(str(entry['hours_spent'])))}
+            for entry in stats.top_skills
+        ]
+        stats.save(update_fields=['top_skills'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0013_ownership'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='category_counts',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='status_counts',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='top_skills',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(top_hours_as_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+from skills import search
+
+
+def reinstall_search_index(apps, schema_editor):
+    # Adding the column remakes skills_skill on SQLite, which drops its triggers
+    search.install(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0014_dashboard_stats_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='categorized_name',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
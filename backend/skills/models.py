@@ -1,4 +1,7 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+import hashlib
 import json
 class Skill(models.Model):
     RESOURCE_TYPE_CHOICES = [
@@ -22,6 +25,13 @@ class Skill(models.Model):
     ]
     
 
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='skills',
+        db_index=False  # covered by the (owner, ...) indexes
+    )
+
     skill_name = models.CharField(max_length=200)
 
     
@@ -62,11 +72,16 @@ class Skill(models.Model):
         choices=CATEGORY_CHOICES,
         default='other'
     )
+    # The skill_name enrich_skills last had the model categorize; a skill
+    # that really is 'other' is not sent again until it is renamed
+    categorized_name = models.CharField(max_length=200, blank=True)
 
-    recommended_resources = models.TextField(blank=True, default='{}')
+    recommended_resources = models.JSONField(blank=True, default=dict)
 
     
-    mastery_prediction = models.TextField(blank=True, default='{}')
+    mastery_prediction = models.JSONField(blank=True, default=dict)
+    # get_mastery_fingerprint() of the inputs the stored prediction was made from
+    mastery_fingerprint = models.CharField(max_length=64, blank=True)
 
     created_date = models.DateTimeField(auto_now_add=True)
 
@@ -76,33 +91,66 @@ class Skill(models.Model):
 
     def get_recommended_resources(self):
         """Returns recommended_resources as Python dictionary"""
-        try:
-            return json.loads(self.recommended_resources)
-        except:
-            return {}
+        if isinstance(self.recommended_resources, dict):
+            return self.recommended_resources
+        return {}
     
     def set_recommended_resources(self, data):
-        """Saves Python dictionary as JSON string"""
-        self.recommended_resources = json.dumps(data)
+        """Stores a Python dictionary (JSON column)"""
+        self.recommended_resources = data
     
     def get_mastery_prediction(self):
         """Returns mastery_prediction as Python dictionary"""
-        try:
-            return json.loads(self.mastery_prediction)
-        except:
-            return {}
+        if isinstance(self.mastery_prediction, dict):
+            return self.mastery_prediction
+        return {}
     
     def set_mastery_prediction(self, data):
-        """Saves Python dictionary as JSON string"""
-        self.mastery_prediction = json.dumps(data)
+        """Stores a Python dictionary (JSON column) with the fingerprint of its inputs"""
+        self.mastery_prediction = data
+        self.mastery_fingerprint = self.get_mastery_fingerprint()
+
+    def get_mastery_fingerprint(self):
+        """
+        Hash of what a mastery prediction depends on: the normalized name,
+        the difficulty and hours_spent in MASTERY_HOURS_BUCKET-wide buckets
+        """
+        bucket = getattr(settings, 'MASTERY_HOURS_BUCKET', 5)
+        inputs = {
+            'skill_name': ' '.join(self.skill_name.lower().split()),
+            'difficulty_rating': self.difficulty_rating,
+            'hours_bucket': int(float(self.hours_spent) // bucket),
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def get_stored_mastery_prediction(self):
+        """The saved prediction while its inputs still match the skill, else None"""
+        prediction = self.get_mastery_prediction()
+        if prediction and self.mastery_fingerprint == self.get_mastery_fingerprint():
+            return prediction
+        return None
     
 
     class Meta:
-        ordering = ['-created_date'] 
+        ordering = ['-created_date']
+        # One index per access path, all led by owner since every query is
+        # scoped to one user: list filters + newest-first ordering and
+        # cursors, weekly range scans, and the top-by-hours dashboard query
+        indexes = [
+            models.Index(fields=['owner', 'status', 'created_date'], name='skill_owner_status_idx'),
+            models.Index(fields=['owner', 'category', 'created_date'], name='skill_owner_category_idx'),
+            models.Index(fields=['owner', 'created_date', 'id'], name='skill_owner_created_idx'),
+            models.Index(fields=['owner', '-hours_spent', 'id'], name='skill_owner_hours_idx'),
+        ]
 
 
 class UserProfile(models.Model):
-   
+
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='profile'
+    )
     current_streak = models.IntegerField(default=0)
     longest_streak = models.IntegerField(default=0)
     last_activity_date = models.DateField(null=True, blank=True)
@@ -133,4 +181,269 @@ class UserProfile(models.Model):
     
     class Meta:
         verbose_name = "User Profile"
-        verbose_name_plural = "User Profiles"
\ No newline at end of file
+        verbose_name_plural = "User Profiles"
+
+class AICacheEntry(models.Model):
+    """Durable tier of the AI response cache (see skills/ai_cache.py)"""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    operation = models.CharField(max_length=50, blank=True)
+    model_name = models.CharField(max_length=100, blank=True)
+    value = models.TextField()
+    hit_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.operation} ({self.model_name}) - {self.key[:12]}"
+
+    class Meta:
+        verbose_name = "AI Cache Entry"
+        verbose_name_plural = "AI Cache Entries"
+
+
+class AIJob(models.Model):
+    """Background Gemini generation for a skill (see skills/jobs.py)"""
+
+    OPERATION_CHOICES = [
+        ('ai_resources', 'AI Resources'),
+        ('mastery_predict', 'Mastery Prediction'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='ai_jobs')
+    operation = models.CharField(max_length=30, choices=OPERATION_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    # Skip the AI response cache and ask Gemini again (?refresh=1)
+    refresh = models.BooleanField(default=False)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    result = models.TextField(blank=True, default='{}')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.operation} for skill {self.skill_id} - {self.status}"
+
+    def get_result(self):
+        """Returns result as Python dictionary"""
+        try:
+            return json.loads(self.result)
+        except:
+            return {}
+
+    def set_result(self, data):
+        """Saves Python dictionary as JSON string"""
+        self.result = json.dumps(data)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='aijob_status_run_after_idx'),
+        ]
+
+
+class DashboardStats(models.Model):
+    """
+    One row per user of running aggregates behind GET /api/dashboard-stats/.
+    Maintained by skills/stats.py on every Skill write.
+    """
+
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='dashboard_stats'
+    )
+    total_skills = models.IntegerField(default=0)
+    total_hours = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    status_counts = models.JSONField(default=dict)
+    category_counts = models.JSONField(default=dict)
+    top_skills = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard Stats - {self.total_skills} skills"
+
+    def get_status_counts(self):
+        """Returns status_counts as Python dictionary"""
+        return dict(self.status_counts)
+
+    def set_status_counts(self, data):
+        """Stores a Python dictionary (JSON column)"""
+        self.status_counts = data
+
+    def get_category_counts(self):
+        """Returns category_counts as Python dictionary"""
+        return dict(self.category_counts)
+
+    def set_category_counts(self, data):
+        """Stores a Python dictionary (JSON column)"""
+        self.category_counts = data
+
+    def get_top_skills(self):
+        """Returns top_skills as a list of dictionaries"""
+        return list(self.top_skills)
+
+    def set_top_skills(self, data):
+        """Stores a list of dictionaries (JSON column)"""
+        self.top_skills = data
+
+    class Meta:
+        verbose_name = "Dashboard Stats"
+        verbose_name_plural = "Dashboard Stats"
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only log of Skill changes (see skills/activity.py). skill_id is
+    a plain integer so events outlive the skill they describe.
+    """
+
+    KIND_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='activity_events',
+        db_index=False  # covered by the (owner, ...) indexes
+    )
+    skill_id = models.IntegerField(db_index=True)
+    skill_name = models.CharField(max_length=200, blank=True)
+    category = models.CharField(max_length=50, blank=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    date = models.DateField()
+    hours_delta = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    old_status = models.CharField(max_length=20, blank=True)
+    new_status = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.kind} {self.skill_name} on {self.date}"
+
+    class Meta:
+        verbose_name = "Activity Event"
+        verbose_name_plural = "Activity Events"
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['owner', 'date'], name='activity_event_owner_date_idx'),
+        ]
+
+
+class ActivityDay(models.Model):
+    """
+    One row per user and day with learning activity, rolled up from
+    ActivityEvent. Streaks and total_learning_days are derived from these rows.
+    """
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='activity_days',
+        db_index=False  # covered by the (owner, ...) indexes
+    )
+    date = models.DateField()
+    events = models.IntegerField(default=0)
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    completions = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.date} - {self.events} events, {self.hours} hours"
+
+    class Meta:
+        verbose_name = "Activity Day"
+        verbose_name_plural = "Activity Days"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'date'], name='activity_day_owner_date_uniq'),
+        ]
+
+
+class ActivityRollup(models.Model):
+    """
+    Learning activity pre-bucketed by day, week and month per user and
+    category, kept up to date from ActivityEvent (see skills/analytics.py).
+    """
+
+    BUCKET_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='activity_rollups',
+        db_index=False  # covered by the (owner, ...) indexes
+    )
+    bucket = models.CharField(max_length=10, choices=BUCKET_CHOICES)
+    start = models.DateField()
+    category = models.CharField(max_length=50)
+    hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    skills = models.IntegerField(default=0)
+    completions = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.bucket} {self.start} {self.category} - {self.hours} hours"
+
+    class Meta:
+        verbose_name = "Activity Rollup"
+        verbose_name_plural = "Activity Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'bucket', 'start', 'category'],
+                name='activity_rollup_owner_bucket_uniq',
+            ),
+        ]
+
+
+class TableVersion(models.Model):
+    """
+    Write counter per logical table and user ("skills:42"), bumped in the
+    writing transaction. Read endpoints derive their ETags and cache keys
+    from it (see skills/http_cache.py).
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+    class Meta:
+        verbose_name = "Table Version"
+        verbose_name_plural = "Table Versions"
+
+
+class AILease(models.Model):
+    """
+    Cross-process lease for one in-flight AI generation (see
+    skills/singleflight.py). The holder runs the Gemini call and leaves its
+    result here for the callers that waited on it.
+    """
+
+    key = models.CharField(max_length=100, primary_key=True)
+    token = models.CharField(max_length=32)
+    expires_at = models.DateTimeField()
+    done = models.BooleanField(default=False)
+    result = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} - {'done' if self.done else 'running'}"
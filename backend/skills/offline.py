@@ -0,0 +1,94 @@
+"""
+A deterministic provider that answers from local rules instead of a model
+(see skills/providers.py). It never touches the network, so it suits
+cheap operations like categorization, tests, and benchmarks that should
+not depend on Gemini.
+
+Answers are built from each call's `inputs`, not its prompt:
+
+- resources: utils.fallback_resources() search links
+- mastery: utils.fallback_mastery(), ~20 hours per difficulty point
+- categorize: the first category with a keyword in the skill name
+- weekly_summary: a short message from the week's numbers
+
+Answers come back as the text a model would send, so utils.py parses
+them the same way.
+"""
+import json
+import re
+
+
+# Checked in order; the first category with a matching word or phrase wins
+CATEGORY_KEYWORDS = {
+    'frontend': (
+        'react', 'vue', 'angular', 'svelte', 'next.js', 'nuxt', 'html', 'css', 'sass',
+        'tailwind', 'javascript', 'typescript', 'jquery', 'redux', 'webpack', 'vite', 'figma',
+    ),
+    'devops': (
+        'docker', 'kubernetes', 'k8s', 'terraform', 'ansible', 'aws', 'azure', 'gcp', 'jenkins',
+        'ci cd', 'github actions', 'linux', 'bash', 'nginx', 'helm', 'prometheus', 'grafana',
+    ),
+    'data': (
+        'sql', 'postgresql', 'postgres', 'mysql', 'sqlite', 'mongodb', 'pandas', 'numpy', 'spark',
+        'airflow', 'kafka', 'hadoop', 'tableau', 'power bi', 'excel', 'statistics', 'dbt',
+        'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'data',
+    ),
+    'backend': (
+        'django', 'flask', 'fastapi', 'node', 'node.js', 'express', 'spring', 'rails', 'laravel',
+        'php', 'java', 'go', 'golang', 'rust', 'c#', '.net', 'graphql', 'rest', 'api', 'ruby',
+        'elixir', 'microservices', 'redis',
+    ),
+}
+
+
+def categorize(skill_name):
+    words = ' '.join(re.findall(r'[a-z0-9+#.\-]+', skill_name.lower()))
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(f' {keyword} ' in f' {words} ' for keyword in keywords):
+            return category
+    return 'other'
+
+
+def summary_message(weekly_stats):
+    hours = weekly_stats.get('hours_logged', 0)
+    added = weekly_stats.get('skills_added', 0)
+    completed = weekly_stats.get('completed_this_week', 0)
+    if completed:
+        return f'{completed} skill(s) completed and {hours} hours logged this week - great work! Keep up the momentum!'
+    if hours:
+        return f'{hours} hours of learning this week - keep up the momentum!'
+    if added:
+        return f'{added} new skill(s) on your list this week - time to dive in!'
+    return 'Great week of learning! Keep up the momentum!'
+
+
+class OfflineProvider:
+    name = 'offline'
+    configured = True
+    # Answering again is cheaper than a cache lookup
+    cacheable = False
+    # Stand-ins for model output; a real provider configured later should fill the skill
+    persistable = False
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        from . import utils
+
+        inputs = inputs or {}
+        if operation == 'categorize':
+            if 'skill_names' in inputs:
+                return json.dumps({name: categorize(name) for name in inputs['skill_names']})
+            return categorize(inputs['skill_name'])
+        if operation == 'resources':
+            if 'skill_names' in inputs:
+                return json.dumps({name: utils.fallback_resources(name) for name in inputs['skill_names']})
+            return json.dumps(utils.fallback_resources(inputs['skill_name']))
+        if operation == 'mastery':
+            return json.dumps(utils.fallback_mastery(
+                inputs['skill_name'], inputs['difficulty_rating'], float(inputs['hours_spent']),
+            ))
+        if operation == 'weekly_summary':
+            return summary_message(inputs['weekly_stats'])
+        raise ValueError(f"The offline provider has no rule for operation {operation!r}")
+
+    async def agenerate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        return self.generate(model_name, prompt, timeout, operation, inputs)
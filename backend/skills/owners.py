@@ -0,0 +1,50 @@
+"""
+Who owns the data a request reads and writes.
+
+Skills, the profile and every per-user aggregate (dashboard stats, activity
+days, rollups, cache versions) are keyed by the owning user's id. Signed-in
+users (session or basic auth) get their own rows. Anonymous requests act as
+the shared DEFAULT_USERNAME user, which also owns everything created before
+rows had owners; set ALLOW_ANONYMOUS to False to refuse them instead.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
+
+
+DEFAULTS = {
+    'DEFAULT_USERNAME': 'default',
+    'ALLOW_ANONYMOUS': True,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'OWNERSHIP', {}).get(name, DEFAULTS[name])
+
+
+def default_owner_id():
+    """Id of the shared user behind anonymous requests, created on first use"""
+    User = get_user_model()
+    username = get_setting('DEFAULT_USERNAME')
+    owner_id = User.objects.filter(username=username).values_list('pk', flat=True).first()
+    if owner_id is None:
+        owner_id = User.objects.get_or_create(username=username)[0].pk
+    return owner_id
+
+
+def owner_id_for(request):
+    """The user id whose data `request` works on; PermissionDenied if anonymous isn't allowed"""
+    owner_id = getattr(request, '_owner_id', None)
+    if owner_id is not None:
+        return owner_id
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        owner_id = user.pk
+    elif get_setting('ALLOW_ANONYMOUS'):
+        owner_id = default_owner_id()
+    else:
+        raise PermissionDenied('Authentication required.')
+    # Looked up once per request; views and cache_by_version both ask
+    request._owner_id = owner_id
+    return owner_id
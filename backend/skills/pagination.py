@@ -0,0 +1,111 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class SkillCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_date, id), newest first.
+
+    Only kicks in when the client sends ?cursor= or ?page_size=, so the
+    plain GET /api/skills/ keeps returning a bare list for older clients.
+
+    GET /api/skills/?page_size=50
+    GET /api/skills/?page_size=50&cursor=<next cursor from previous page>
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    default_page_size = 50
+    max_page_size = 500
+    ordering = ('-created_date', '-id')
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.default_page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, instance):
+        raw = f"{instance.created_date.isoformat()}|{instance.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created, pk = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created), int(pk)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    @staticmethod
+    def after_cursor(queryset, created, pk):
+        """
+        Rows strictly after (created, pk) in newest-first order. The extra
+        created_date__lte bound lets the database seek the (created_date, id)
+        index instead of scanning from the newest row.
+        """
+        return queryset.filter(created_date__lte=created).filter(
+            Q(created_date__lt=created) | Q(created_date=created, id__lt=pk)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = self.after_cursor(queryset, *self.decode_cursor(cursor))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def decode_offset(self, request):
+        """
+        Search results are ordered by rank, not (created_date, id), so their
+        cursor carries a plain offset into the ranked matches instead.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return 0
+        try:
+            kind, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            if kind != 'offset' or int(offset) < 0:
+                raise ValueError
+            return int(offset)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def get_offset_link(self, request, offset):
+        cursor = base64.urlsafe_b64encode(f"offset|{offset}".encode()).decode()
+        return replace_query_param(request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,184 @@
+"""
+The LLM providers behind the AI features in skills/utils.py.
+
+A provider has a `name`, a `configured` flag, `cacheable` and
+`persistable` flags and two methods, generate(model_name, prompt, timeout=None, operation=None,
+inputs=None) and async agenerate() with the same arguments, that return
+the response text. `operation` and `inputs` (skill name, difficulty, ...)
+describe the call for providers that do not read prompts. When
+`configured` is False, callers serve their local fallbacks without
+calling it; answers from providers that are not `cacheable` skip the AI
+response cache, and answers from providers that are not `persistable`
+(local rules, replays) are returned but never stored on the skill.
+
+Built in:
+
+- 'gemini': Google Gemini (skills/gemini.py)
+- 'offline': deterministic local rules, no network (skills/offline.py)
+- 'replay': answers recorded from another provider (skills/replay.py)
+
+Each operation gets its provider and model from settings.AI_OPERATIONS;
+a blank provider means settings.AI_PROVIDER. Providers are built on first
+use, so importing the app never loads a model SDK.
+
+Functions passed to add_listener() are told about every finished call
+through generate()/agenerate(), whatever the provider (name, model,
+seconds, outcome, token counts), in the caller's thread or task. This is
+how skills/metrics.py attributes LLM time to requests.
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+PROVIDERS = {
+    'gemini': 'skills.gemini.GeminiProvider',
+    'offline': 'skills.offline.OfflineProvider',
+    'replay': 'skills.replay.ReplayProvider',
+}
+DEFAULT_PROVIDER = 'gemini'
+
+OPERATIONS = {
+    'resources': {'PROVIDER': '', 'MODEL': 'gemini-2.5-flash'},
+    'mastery': {'PROVIDER': '', 'MODEL': 'gemini-1.5-flash'},
+    'categorize': {'PROVIDER': '', 'MODEL': 'gemini-2.5-flash'},
+    'weekly_summary': {'PROVIDER': '', 'MODEL': 'gemini-2.5-flash'},
+}
+
+logger = logging.getLogger(__name__)
+_providers = {}
+_lock = threading.Lock()
+_listeners = []
+_usage = ContextVar('llm_usage', default=None)
+# Rough size of a token, for providers that don't report usage
+CHARS_PER_TOKEN = 4
+
+
+class Rejected(Exception):
+    """The provider refused the call without attempting it (e.g. an open circuit)"""
+
+
+def get_setting(operation, name):
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown AI operation: {operation}")
+    return getattr(settings, 'AI_OPERATIONS', {}).get(operation, {}).get(name) or OPERATIONS[operation][name]
+
+
+def provider_name(operation=None):
+    """Provider of `operation`, or the default provider when None"""
+    name = get_setting(operation, 'PROVIDER') if operation else ''
+    return name or getattr(settings, 'AI_PROVIDER', '') or DEFAULT_PROVIDER
+
+
+def get_model(operation):
+    return get_setting(operation, 'MODEL')
+
+
+def build(name):
+    """A new provider from a name in PROVIDERS or a dotted class path"""
+    return import_string(PROVIDERS.get(name, name))()
+
+
+def get_provider(operation=None):
+    name = provider_name(operation)
+    provider = _providers.get(name)
+    if provider is None:
+        with _lock:
+            provider = _providers.get(name)
+            if provider is None:
+                provider = build(name)
+                if not provider.configured:
+                    logger.warning("AI provider %s is not configured; AI features use fallbacks", provider.name)
+                _providers[name] = provider
+    return provider
+
+
+def add_listener(listener):
+    """
+    Calls listener(provider_name, model_name, seconds, outcome, prompt_tokens,
+    response_tokens) after every call; outcome is 'ok', 'error', 'timeout' or
+    'rejected'. Token counts are None for failed calls. Unless the provider
+    reported them with report_usage() they are estimated at CHARS_PER_TOKEN.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def report_usage(prompt_tokens, response_tokens):
+    """For providers: the token counts of the call being answered, from the caller's thread or task"""
+    _usage.set((prompt_tokens, response_tokens))
+
+
+def _notify(provider, model_name, started, prompt=None, text=None, error=None):
+    seconds = time.perf_counter() - started
+    prompt_tokens = response_tokens = None
+    if error is None:
+        outcome = 'ok'
+        reported_prompt, reported_response = _usage.get() or (None, None)
+        prompt_tokens = reported_prompt or len(prompt) // CHARS_PER_TOKEN
+        response_tokens = reported_response or len(text) // CHARS_PER_TOKEN
+    elif isinstance(error, Rejected):
+        outcome = 'rejected'
+    elif isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        outcome = 'timeout'
+    else:
+        outcome = 'error'
+    for listener in _listeners:
+        listener(provider.name, model_name, seconds, outcome, prompt_tokens, response_tokens)
+
+
+def generate(operation, prompt, timeout=None, **inputs):
+    """Sends `prompt` to the provider and model of `operation`; returns the response text"""
+    provider, model_name = get_provider(operation), get_model(operation)
+    started = time.perf_counter()
+    usage = _usage.set(None)
+    try:
+        text = provider.generate(model_name, prompt, timeout, operation=operation, inputs=inputs)
+    except Exception as e:
+        _notify(provider, model_name, started, error=e)
+        raise
+    else:
+        _notify(provider, model_name, started, prompt, text)
+        return text
+    finally:
+        _usage.reset(usage)
+
+
+async def agenerate(operation, prompt, timeout=None, **inputs):
+    """generate() for async callers"""
+    provider, model_name = get_provider(operation), get_model(operation)
+    started = time.perf_counter()
+    usage = _usage.set(None)
+    try:
+        text = await provider.agenerate(model_name, prompt, timeout, operation=operation, inputs=inputs)
+    except Exception as e:
+        _notify(provider, model_name, started, error=e)
+        raise
+    else:
+        _notify(provider, model_name, started, prompt, text)
+        return text
+    finally:
+        _usage.reset(usage)
+
+
+def describe():
+    """{operation: provider, model and whether it is configured}, for /api/ai-status/"""
+    return {
+        operation: {
+            'provider': provider_name(operation),
+            'model': get_model(operation),
+            'configured': get_provider(operation).configured,
+        }
+        for operation in OPERATIONS
+    }
+
+
+def reset():
+    """Forgets built providers so the next get_provider() builds them from settings again"""
+    with _lock:
+        _providers.clear()
@@ -0,0 +1,102 @@
+"""
+A provider that answers from recorded model responses (see
+skills/providers.py), so runs can be repeated without network access.
+
+In 'record' mode every call goes to the RECORD_PROVIDER and its answer is
+appended to PATH, one JSON object per line. In 'replay' mode answers come
+from that file only; a prompt that was never recorded raises ReplayMiss,
+which callers treat like any failed call and fall back. Recordings are
+keyed by model and prompt, with whitespace collapsed.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+DEFAULTS = {
+    'PATH': 'ai_replay.jsonl',
+    'MODE': 'replay',  # or 'record'
+    'RECORD_PROVIDER': 'gemini',
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'AI_REPLAY', {}).get(name, DEFAULTS[name])
+
+
+class ReplayMiss(LookupError):
+    """No recorded answer for a prompt"""
+
+
+def recording_key(model_name, prompt):
+    payload = json.dumps([model_name, ' '.join(prompt.split())])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ReplayProvider:
+    name = 'replay'
+    # Recorded answers are already local
+    cacheable = False
+    # Fixtures for tests and benchmarks, not answers for this database's skills
+    persistable = False
+
+    def __init__(self):
+        from . import providers
+
+        self.path = Path(get_setting('PATH'))
+        self.mode = get_setting('MODE')
+        if self.mode not in ('record', 'replay'):
+            raise ImproperlyConfigured(f"AI_REPLAY['MODE'] must be 'record' or 'replay', not {self.mode!r}")
+        self.recorder = providers.build(get_setting('RECORD_PROVIDER')) if self.mode == 'record' else None
+        self._lock = threading.Lock()
+        self.answers = self.load()
+
+    @property
+    def configured(self):
+        if self.recorder is not None:
+            return self.recorder.configured
+        return bool(self.answers)
+
+    def load(self):
+        """{key: response text}; a later line for the same key wins"""
+        answers = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        answers[entry['key']] = entry['response']
+        return answers
+
+    def lookup(self, model_name, prompt):
+        try:
+            return self.answers[recording_key(model_name, prompt)]
+        except KeyError:
+            raise ReplayMiss(f"No recorded {model_name} answer for this prompt in {self.path}") from None
+
+    def save(self, model_name, prompt, response, operation):
+        key = recording_key(model_name, prompt)
+        entry = {'key': key, 'operation': operation, 'model': model_name, 'prompt': prompt, 'response': response}
+        with self._lock:
+            self.answers[key] = response
+            with open(self.path, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(entry) + '\n')
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        if self.recorder is None:
+            return self.lookup(model_name, prompt)
+        response = self.recorder.generate(model_name, prompt, timeout, operation=operation, inputs=inputs)
+        self.save(model_name, prompt, response, operation)
+        return response
+
+    async def agenerate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        if self.recorder is None:
+            return self.lookup(model_name, prompt)
+        response = await self.recorder.agenerate(model_name, prompt, timeout, operation=operation, inputs=inputs)
+        await sync_to_async(self.save)(model_name, prompt, response, operation)
+        return response
@@ -0,0 +1,154 @@
+"""
+Full-text search over skill_name, platform and notes.
+
+On SQLite this is an FTS5 external-content index (skills_skill_fts) kept in
+sync with skills_skill by triggers, so bulk writes and raw SQL are covered
+too. Other databases fall back to icontains lookups.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+
+FTS_TABLE = 'skills_skill_fts'
+SEARCH_LIMIT = 200
+
+FTS_COLUMNS = 'skill_name, platform, notes'
+
+INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {FTS_COLUMNS},
+        content='skills_skill',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON skills_skill BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.skill_name, new.platform, new.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON skills_skill BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.skill_name, old.platform, old.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {FTS_COLUMNS} ON skills_skill BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.skill_name, old.platform, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.skill_name, new.platform, new.notes);
+    END
+    """,
+]
+
+UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+_fts_available = {}
+
+
+def install(schema_editor):
+    """
+    Creates the FTS table and triggers (idempotent) and rebuilds the index.
+    Migrations that remake skills_skill on SQLite drop its triggers, so they
+    call this again afterwards.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in INSTALL_SQL:
+        schema_editor.execute(statement)
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _fts_available.clear()
+
+
+def uninstall(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in UNINSTALL_SQL:
+        schema_editor.execute(statement)
+    _fts_available.clear()
+
+
+def fts_available():
+    alias = connection.alias
+    if alias not in _fts_available:
+        _fts_available[alias] = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available[alias]
+
+
+def match_expression(query):
+    """
+    Turns free text into an FTS5 query: every word must match, as a prefix.
+    "reac nat" -> "reac"* "nat"*
+    """
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def ranked_matches(query, queryset, limit=SEARCH_LIMIT, offset=0):
+    """
+    Returns [(skill_id, rank, snippet)] best match first. Name hits weigh
+    more than platform hits, which weigh more than notes. Only rows of
+    `queryset` are ranked, so its filters (owner, status, category, ...)
+    apply before the LIMIT and can't leave a page short.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+    subquery, subquery_params = queryset.order_by().values('id').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT rowid,
+                   bm25({FTS_TABLE}, 10.0, 4.0, 1.0) AS rank,
+                   snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 12)
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s AND rowid IN ({subquery})
+            ORDER BY rank, rowid
+            LIMIT %s OFFSET %s
+            """,
+            [expression, *subquery_params, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+def search(queryset, query, limit=SEARCH_LIMIT, offset=0):
+    """
+    Applies ?search= to a Skill queryset. Returns up to `limit` skills in
+    rank order, skipping the first `offset` matches, each with
+    `search_snippet` set (highlighted with <mark>).
+    """
+    if not fts_available():
+        skills = list(queryset.filter(
+            Q(skill_name__icontains=query)
+            | Q(platform__icontains=query)
+            | Q(notes__icontains=query)
+        )[offset:offset + limit])
+        for skill in skills:
+            skill.search_snippet = ''
+        return skills
+
+    matches = ranked_matches(query, queryset, limit, offset)
+    if not matches:
+        return []
+    order = {skill_id: (position, snippet) for position, (skill_id, _, snippet) in enumerate(matches)}
+
+    skills = list(queryset.filter(id__in=order.keys()))
+    skills.sort(key=lambda skill: order[skill.id][0])
+    for skill in skills:
+        skill.search_snippet = order[skill.id][1]
+    return skills
@@ -1,12 +1,33 @@
 from rest_framework import serializers
-from .models import Skill, UserProfile
-import json
+from . import metrics
+from .models import Skill, UserProfile, AIJob
 
-class SkillSerializer(serializers.ModelSerializer):
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    """Adds the time spent turning instances into data to the request's serialize span"""
+
+    def to_representation(self, instance):
+        with metrics.timed('serialize'):
+            return super().to_representation(instance)
+
+
+class SkillSerializer(TimedModelSerializer):
     class Meta:
         model = Skill  
         fields = '__all__'
-        read_only_fields = ['id', 'created_date']
+        read_only_fields = ['id', 'owner', 'created_date', 'mastery_fingerprint', 'categorized_name']
+
+    def __init__(self, *args, **kwargs):
+        """
+        Accepts an optional `fields` list to only serialize a subset,
+        e.g. SkillSerializer(queryset, many=True, fields=['id', 'skill_name'])
+        """
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
     
     def validate_difficulty_rating(self, value):
         """Ensures difficulty is between 1-5"""
@@ -23,35 +44,16 @@ class SkillSerializer(serializers.ModelSerializer):
                 "Hours spent cannot be negative."
             )
         return value
-    
-    def to_representation(self, instance):
-        """
-        Override to parse JSON fields into proper dictionaries
-        This makes the API response cleaner
-        """
-        representation = super().to_representation(instance)
-        
-        try:
-            representation['recommended_resources'] = instance.get_recommended_resources()
-        except:
-            representation['recommended_resources'] = {}
-        
-        try:
-            representation['mastery_prediction'] = instance.get_mastery_prediction()
-        except:
-            representation['mastery_prediction'] = {}
-        
-        return representation
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedModelSerializer):
 
     milestone_message = serializers.SerializerMethodField()
     
     class Meta:
         model = UserProfile
         fields = '__all__' 
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'owner']
     
     def get_milestone_message(self, obj):
         """
@@ -71,4 +73,20 @@ class UserProfileSerializer(serializers.ModelSerializer):
         if current > longest:
             data['longest_streak'] = current
         
-        return data
\ No newline at end of file
+        return data
+
+
+class AIJobSerializer(TimedModelSerializer):
+    class Meta:
+        model = AIJob
+        fields = [
+            'id', 'skill', 'operation', 'refresh', 'status', 'attempts', 'max_attempts',
+            'run_after', 'last_error', 'result', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        """Returns result as a dictionary instead of a JSON string"""
+        representation = super().to_representation(instance)
+        representation['result'] = instance.get_result()
+        return representation
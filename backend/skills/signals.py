@@ -0,0 +1,103 @@
+"""
+Keeps derived tables in sync with Skill writes.
+
+Every create/update/delete is reduced to a (before, after) pair of plain
+snapshots and passed to record_skill_changes(), which applies them per
+owner. Django sends no signals for bulk_create/bulk_update, so code using
+those calls record_skill_changes() itself with the pairs it wrote.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import activity, http_cache, stats
+from .models import Skill, UserProfile
+
+
+SNAPSHOT_FIELDS = ('id', 'owner_id', 'skill_name', 'status', 'category', 'hours_spent', 'created_date')
+
+_pending = threading.local()
+
+
+def skill_snapshot(skill):
+    """The fields derived tables care about, as a plain dict"""
+    return {field: getattr(skill, field) for field in SNAPSHOT_FIELDS}
+
+
+def record_skill_changes(changes):
+    """Applies a list of (before, after) snapshot pairs to every derived table"""
+    pending = getattr(_pending, 'changes', None)
+    if pending is not None:
+        pending.extend(changes)
+        return
+    for owner_id, owner_changes in by_owner(changes).items():
+        stats.apply_changes(owner_id, owner_changes)
+        activity.record(owner_id, owner_changes)
+        http_cache.bump(owner_id, http_cache.SKILLS)
+
+
+def by_owner(changes):
+    """
+    Groups (before, after) pairs by owner. A skill that changed hands counts
+    as a delete for its old owner and a create for the new one.
+    """
+    grouped = defaultdict(list)
+    for before, after in changes:
+        if before is not None and after is not None and before['owner_id'] != after['owner_id']:
+            grouped[before['owner_id']].append((before, None))
+            grouped[after['owner_id']].append((None, after))
+        else:
+            grouped[(after or before)['owner_id']].append((before, after))
+    return grouped
+
+
+@contextmanager
+def collect_skill_changes():
+    """
+    Defers changes recorded inside the block (e.g. by the per-object signals
+    of a queryset delete) and applies them in one go when it exits.
+    """
+    if getattr(_pending, 'changes', None) is not None:
+        yield
+        return
+
+    _pending.changes = []
+    try:
+        yield
+        changes = _pending.changes
+    finally:
+        _pending.changes = None
+    record_skill_changes(changes)
+
+
+@receiver(pre_save, sender=Skill)
+def remember_previous_state(sender, instance, raw=False, **kwargs):
+    instance._previous_snapshot = None
+    if instance.pk and not raw:
+        instance._previous_snapshot = (
+            Skill.objects.filter(pk=instance.pk).values(*SNAPSHOT_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Skill)
+def skill_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_skill_changes([
+        (getattr(instance, '_previous_snapshot', None), skill_snapshot(instance))
+    ])
+
+
+@receiver(post_delete, sender=Skill)
+def skill_deleted(sender, instance, **kwargs):
+    record_skill_changes([(skill_snapshot(instance), None)])
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        http_cache.bump(instance.owner_id, http_cache.PROFILE)
@@ -0,0 +1,192 @@
+"""
+Single-flight for AI generations: concurrent callers with the same key
+share one Gemini call and all get its result.
+
+Within a process the first caller runs the call and the others wait on its
+future (threads) or task (async views). Across processes the caller that
+holds the key's AILease row runs the call; callers in other processes poll
+the row until it is marked done and read the result from it. A lease whose
+holder died expires after LEASE_SECONDS and is taken over. A caller that has
+waited WAIT_SECONDS without getting a result runs the call itself.
+"""
+import asyncio
+import json
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AILease
+
+
+DEFAULTS = {
+    # Longer than a Gemini call normally takes
+    'LEASE_SECONDS': 120,
+    'WAIT_SECONDS': 90,
+    'POLL_INTERVAL': 0.2,
+}
+
+_flights = {}
+_flights_lock = threading.Lock()
+_tasks = weakref.WeakKeyDictionary()
+
+
+class LeaderFailed(Exception):
+    """The call the caller was waiting on raised (in this or another process)"""
+
+
+def get_setting(name):
+    return getattr(settings, 'SINGLE_FLIGHT', {}).get(name, DEFAULTS[name])
+
+
+def skill_key(skill_id, operation):
+    return f'{operation}:{skill_id}'
+
+
+def acquire(key):
+    """
+    Takes the lease for `key` if it is free, done or expired. Returns
+    (token, True) when we hold it, else (holder's token, False).
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=get_setting('LEASE_SECONDS'))
+
+    free = Q(done=True) | Q(expires_at__lt=now)
+    if AILease.objects.filter(free, key=key).update(
+        token=token, expires_at=expires_at, done=False, result='', error='', updated_at=now,
+    ):
+        return token, True
+    try:
+        with transaction.atomic():
+            AILease.objects.create(key=key, token=token, expires_at=expires_at)
+        return token, True
+    except IntegrityError:
+        holder = AILease.objects.filter(key=key).values_list('token', flat=True).first()
+        return holder, False
+
+
+def finish(key, token, result=None, error=''):
+    """Hands the outcome to the waiting callers; a no-op if we lost the lease"""
+    AILease.objects.filter(key=key, token=token).update(
+        done=True,
+        result=json.dumps(result),
+        error=error,
+        updated_at=timezone.now(),
+    )
+
+
+def poll(key, token):
+    """
+    One look at the flight `token`: ('done', result), or ('running', None)
+    while it runs, or ('gone', None) once its lease expired or was replaced.
+    Raises LeaderFailed if the call failed.
+    """
+    lease = AILease.objects.filter(key=key).values(
+        'token', 'done', 'result', 'error', 'expires_at'
+    ).first()
+    if lease is None or lease['token'] != token:
+        return 'gone', None
+    if lease['done']:
+        if lease['error']:
+            raise LeaderFailed(lease['error'])
+        return 'done', json.loads(lease['result'])
+    if lease['expires_at'] < timezone.now():
+        return 'gone', None
+    return 'running', None
+
+
+def run(key, func):
+    """Calls func() once for all concurrent callers of `key` and returns its result"""
+    with _flights_lock:
+        future = _flights.get(key)
+        leader = future is None
+        if leader:
+            future = _flights[key] = Future()
+
+    if not leader:
+        try:
+            return future.result(timeout=get_setting('WAIT_SECONDS'))
+        except FutureTimeoutError:
+            return func()
+
+    try:
+        result = fly(key, func)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+
+
+def fly(key, func):
+    """The cross-process half of run()"""
+    deadline = time.monotonic() + get_setting('WAIT_SECONDS')
+    while time.monotonic() < deadline:
+        token, acquired = acquire(key)
+        if acquired:
+            try:
+                result = func()
+            except Exception as e:
+                finish(key, token, error=str(e) or type(e).__name__)
+                raise
+            finish(key, token, result)
+            return result
+
+        state, result = poll(key, token)
+        while state == 'running' and time.monotonic() < deadline:
+            time.sleep(get_setting('POLL_INTERVAL'))
+            state, result = poll(key, token)
+        if state == 'done':
+            return result
+    return func()
+
+
+async def arun(key, afunc):
+    """run() for async views: awaits afunc() once for all concurrent callers of `key`"""
+    tasks = _tasks.setdefault(asyncio.get_running_loop(), {})
+    task = tasks.get(key)
+    if task is None:
+        task = tasks[key] = asyncio.ensure_future(afly(key, afunc))
+        task.add_done_callback(lambda _: tasks.pop(key, None))
+
+    try:
+        # shield: a caller that disconnects must not cancel the others' call
+        return await asyncio.wait_for(asyncio.shield(task), get_setting('WAIT_SECONDS'))
+    except asyncio.TimeoutError:
+        return await afunc()
+
+
+async def afly(key, afunc):
+    """The cross-process half of arun()"""
+    deadline = time.monotonic() + get_setting('WAIT_SECONDS')
+    while time.monotonic() < deadline:
+        token, acquired = await sync_to_async(acquire)(key)
+        if acquired:
+            try:
+                result = await afunc()
+            except Exception as e:
+                await sync_to_async(finish)(key, token, error=str(e) or type(e).__name__)
+                raise
+            await sync_to_async(finish)(key, token, result)
+            return result
+
+        state, result = await sync_to_async(poll)(key, token)
+        while state == 'running' and time.monotonic() < deadline:
+            await asyncio.sleep(get_setting('POLL_INTERVAL'))
+            state, result = await sync_to_async(poll)(key, token)
+        if state == 'done':
+            return result
+    return await afunc()
@@ -0,0 +1,188 @@
+"""
+Running dashboard aggregates.
+
+DashboardStats is one row per user that is updated in the same transaction
+as every write to that user's skills (see skills/signals.py), so
+GET /api/dashboard-stats/ is a unique-key read instead of five aggregate
+queries over the Skill table.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from . import http_cache
+from .models import DashboardStats, Skill
+
+
+TOP_N = 10
+TOP_FIELDS = ('id', 'skill_name', 'hours_spent', 'status')
+
+
+def hours(value):
+    """Decimal with two places, whether the skill came from the DB or a request"""
+    return Decimal(str(value)).quantize(Decimal('0.01'))
+
+
+def top_entry(snapshot):
+    return {
+        'id': snapshot['id'],
+        'skill_name': snapshot['skill_name'],
+        'hours_spent': float(hours(snapshot['hours_spent'])),
+        'status': snapshot['status'],
+    }
+
+
+def top_sort_key(entry):
+    return (-hours(entry['hours_spent']), entry['id'])
+
+
+def query_top_skills(owner_id):
+    skills = Skill.objects.filter(owner_id=owner_id)
+    rows = skills.order_by('-hours_spent', 'id').values(*TOP_FIELDS)[:TOP_N]
+    return [top_entry(row) for row in rows]
+
+
+def compute(owner_id):
+    """Recomputes every aggregate of one user from the Skill table"""
+    skills = Skill.objects.filter(owner_id=owner_id)
+    status_counts = dict(
+        skills.values_list('status').annotate(count=Count('id')).order_by()
+    )
+    category_counts = dict(
+        skills.values_list('category').annotate(count=Count('id')).order_by()
+    )
+    return {
+        'total_skills': sum(status_counts.values()),
+        'total_hours': hours(skills.aggregate(total=Sum('hours_spent'))['total'] or 0),
+        'status_counts': status_counts,
+        'category_counts': category_counts,
+        'top_skills': query_top_skills(owner_id),
+    }
+
+
+def rebuild(owner_id):
+    """Overwrites the user's stats row with freshly computed aggregates"""
+    values = compute(owner_id)
+    with transaction.atomic():
+        stats, _ = DashboardStats.objects.select_for_update().get_or_create(owner_id=owner_id)
+        stats.total_skills = values['total_skills']
+        stats.total_hours = values['total_hours']
+        stats.set_status_counts(values['status_counts'])
+        stats.set_category_counts(values['category_counts'])
+        stats.set_top_skills(values['top_skills'])
+        stats.save()
+        http_cache.bump(owner_id, http_cache.SKILLS)
+    return stats
+
+
+def owner_ids():
+    """Every user with skills or a stats row"""
+    return sorted(
+        set(Skill.objects.values_list('owner_id', flat=True).distinct())
+        | set(DashboardStats.objects.values_list('owner_id', flat=True))
+    )
+
+
+def rebuild_all():
+    """Rebuilds every user's stats row; returns them"""
+    return [rebuild(owner_id) for owner_id in owner_ids()]
+
+
+def get_stats(owner_id):
+    stats = DashboardStats.objects.filter(owner_id=owner_id).first()
+    if stats is None:
+        stats = rebuild(owner_id)
+    return stats
+
+
+def _bump(counts, key, amount):
+    counts[key] = counts.get(key, 0) + amount
+    if counts[key] <= 0:
+        del counts[key]
+
+
+def apply_changes(owner_id, changes):
+    """
+    Applies (before, after) snapshots of one user's skills to their stats
+    row. `before` is None for creates and `after` is None for deletes. Must
+    run inside the transaction that wrote the skills.
+    """
+    if not changes:
+        return
+
+    with transaction.atomic():
+        stats = DashboardStats.objects.select_for_update().filter(owner_id=owner_id).first()
+        if stats is None:
+            # The user's first write (or the row was dropped): start from the truth
+            rebuild(owner_id)
+            return
+
+        status_counts = stats.get_status_counts()
+        category_counts = stats.get_category_counts()
+        # The stored list is the exact top-N; when it is shorter than N it
+        # holds every skill, so nothing outside it can move in
+        top = {entry['id']: entry for entry in stats.get_top_skills()}
+        complete = len(top) < TOP_N
+        needs_refill = False
+
+        for before, after in changes:
+            if before is not None:
+                stats.total_skills -= 1
+                stats.total_hours -= hours(before['hours_spent'])
+                _bump(status_counts, before['status'], -1)
+                _bump(category_counts, before['category'], -1)
+            if after is not None:
+                stats.total_skills += 1
+                stats.total_hours += hours(after['hours_spent'])
+                _bump(status_counts, after['status'], 1)
+                _bump(category_counts, after['category'], 1)
+
+            if needs_refill:
+                continue
+
+            skill_id = (after or before)['id']
+            was_top = top.pop(skill_id, None) is not None
+            entry = top_entry(after) if after is not None else None
+            ranked = sorted(top.values(), key=top_sort_key)
+
+            if entry is not None and (
+                complete or (ranked and top_sort_key(entry) < top_sort_key(ranked[-1]))
+            ):
+                top[skill_id] = entry
+                if len(top) > TOP_N:
+                    del top[max(top.values(), key=top_sort_key)['id']]
+                    complete = False
+            elif was_top and not complete:
+                # A top skill dropped out; only the table knows who replaces it
+                needs_refill = True
+
+        if needs_refill:
+            top_skills = query_top_skills(owner_id)
+        else:
+            top_skills = sorted(top.values(), key=top_sort_key)[:TOP_N]
+
+        stats.set_status_counts(status_counts)
+        stats.set_category_counts(category_counts)
+        stats.set_top_skills(top_skills)
+        stats.save()
+
+
+def as_response(stats):
+    """Shapes the stats row like the original dashboard payload"""
+    status_counts = stats.get_status_counts()
+    completed = status_counts.get('completed', 0)
+    total = stats.total_skills
+    categories = sorted(
+        stats.get_category_counts().items(), key=lambda item: (-item[1], item[0])
+    )
+    return {
+        'total_skills': total,
+        'completed_skills': completed,
+        'completion_percentage': round((completed / total * 100) if total > 0 else 0, 1),
+        'total_hours': float(stats.total_hours),
+        'skills_by_category': [
+            {'category': category, 'count': count} for category, count in categories
+        ],
+        'top_skills': stats.get_top_skills(),
+    }
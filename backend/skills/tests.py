@@ -1,3 +1,995 @@
-from django.test import TestCase
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import activity, gemini, jobs, metrics, owners, providers, singleflight, stats, utils
+from .models import ActivityDay, ActivityEvent, AIJob, AILease, DashboardStats, Skill, UserProfile
+
+
+def run_concurrently(target, calls, threads=16):
+    """Runs target(*args) for every args tuple in `calls` from a pool of threads"""
+    pending = list(calls)
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+    errors = []
+
+    def worker():
+        start.wait()
+        try:
+            while True:
+                with lock:
+                    if not pending:
+                        return
+                    args = pending.pop()
+                target(*args)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return errors
+
+
+class StreakConcurrencyTests(TransactionTestCase):
+    """Hammers the streak transition from many threads and checks nothing is lost or doubled"""
+
+    def setUp(self):
+        self.owner_id = owners.default_owner_id()
+
+    def profile(self):
+        return UserProfile.objects.get(owner_id=self.owner_id)
+
+    def add_day(self, day):
+        activity.retry_on_lock(activity.add_to_day, self.owner_id, day, events=1, attempts=50)
+
+    def test_same_day_counts_once(self):
+        today = timezone.localdate()
+        errors = run_concurrently(self.add_day, [(today,)] * 400)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(ActivityDay.objects.get(date=today).events, 400)
+        profile = self.profile()
+        self.assertEqual(profile.current_streak, 1)
+        self.assertEqual(profile.longest_streak, 1)
+        self.assertEqual(profile.total_learning_days, 1)
+
+    def test_consecutive_days_advance_once_each(self):
+        start = timezone.localdate() - timedelta(days=9)
+        days = [start + timedelta(days=offset) for offset in range(10)]
+
+        # Days arrive in order, each hit by many writers at once
+        for day in days:
+            errors = run_concurrently(self.add_day, [(day,)] * 50)
+            self.assertEqual(errors, [])
+
+        profile = self.profile()
+        self.assertEqual(profile.current_streak, 10)
+        self.assertEqual(profile.longest_streak, 10)
+        self.assertEqual(profile.total_learning_days, 10)
+        self.assertEqual(profile.streak_started_date, start)
+        self.assertEqual(profile.last_activity_date, days[-1])
+        self.assertEqual(sum(ActivityDay.objects.values_list('events', flat=True)), 500)
+
+    def test_direct_transition_applies_once(self):
+        # Without the day row in front, the conditional UPDATE alone must hold
+        today = timezone.localdate()
+        advanced = []
+
+        def advance():
+            if activity.retry_on_lock(activity.advance_streak, self.owner_id, today, attempts=50):
+                advanced.append(True)
+
+        errors = run_concurrently(advance, [()] * 200)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(advanced), 1)
+        self.assertEqual(self.profile().total_learning_days, 1)
+
+    def test_gap_restarts_streak(self):
+        today = timezone.localdate()
+        for offset in (5, 4, 3, 1, 0):
+            activity.add_to_day(self.owner_id, today - timedelta(days=offset))
+
+        profile = self.profile()
+        self.assertEqual(profile.current_streak, 2)
+        self.assertEqual(profile.longest_streak, 3)
+        self.assertEqual(profile.total_learning_days, 5)
+        self.assertEqual(profile.streak_started_date, today - timedelta(days=1))
+
+    def test_update_streak_endpoint_under_load(self):
+        def post():
+            response = Client().post('/api/profile/update-streak/')
+            self.assertEqual(response.status_code, 200)
+
+        errors = run_concurrently(post, [()] * 200)
+
+        self.assertEqual(errors, [])
+        profile = self.profile()
+        self.assertEqual(profile.current_streak, 1)
+        self.assertEqual(profile.total_learning_days, 1)
+        self.assertEqual(ActivityDay.objects.count(), 1)
+
+
+# What a gunicorn/uvicorn worker imports before serving its first request
+WORKER_BOOT = 'from skillstack.wsgi import application; import skills.urls'
+# Total import time allowed for WORKER_BOOT, in milliseconds
+IMPORT_BUDGET_MS = int(os.getenv('IMPORT_BUDGET_MS', 1500))
+
+
+class ImportTimeTests(SimpleTestCase):
+    """Keeps worker boot fast: no model SDK at import time and a total import budget"""
+
+    def import_times(self):
+        """{module: cumulative microseconds} for the top-level imports of WORKER_BOOT, from -X importtime"""
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', WORKER_BOOT],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'skillstack.settings'},
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        modules, top_level = set(), {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if not cumulative.strip().isdigit():
+                continue  # the header line
+            modules.add(name.strip())
+            # Nested imports are indented under the module that pulled them in
+            if not name[1:].startswith(' '):
+                top_level[name.strip()] = int(cumulative)
+        return modules, top_level
+
+    def test_worker_boot_does_not_import_the_sdk(self):
+        modules, _ = self.import_times()
+        self.assertNotIn('google.generativeai', modules)
+        self.assertIn('skills.views', modules)
+
+    def test_worker_boot_within_budget(self):
+        _, top_level = self.import_times()
+        total_ms = sum(top_level.values()) / 1000
+        slowest = sorted(top_level.items(), key=lambda item: -item[1])[:5]
+        self.assertLess(
+            total_ms, IMPORT_BUDGET_MS,
+            f'Worker boot imports took {total_ms:.0f} ms; slowest: {slowest}',
+        )
+
+
+class EchoProvider:
+    """Answers every categorize prompt with 'backend' and counts the calls"""
+    name = 'echo'
+    configured = True
+    cacheable = False
+    persistable = True
+    calls = 0
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        EchoProvider.calls += 1
+        return 'backend'
+
+
+class ProviderTests(SimpleTestCase):
+    """Per-operation provider selection, the offline rules and record/replay"""
+
+    def setUp(self):
+        providers.reset()
+        self.addCleanup(providers.reset)
+
+    @override_settings(GEMINI_API_KEY='', AI_PROVIDER='gemini', AI_OPERATIONS={'categorize': {'PROVIDER': 'offline'}})
+    def test_operations_use_their_own_provider(self):
+        self.assertTrue(utils.ai_enabled('categorize'))
+        self.assertFalse(utils.ai_enabled('resources'))
+        self.assertEqual(providers.get_model('mastery'), 'gemini-1.5-flash')
+        self.assertEqual(utils.auto_categorize_skill('React Hooks'), 'frontend')
+        self.assertEqual(utils.get_ai_resources('React'), utils.empty_resources())
+
+    @override_settings(AI_PROVIDER='offline', AI_OPERATIONS={})
+    def test_offline_answers_with_the_fallbacks(self):
+        self.assertEqual(utils.predict_mastery('Django', 3, 15.0), utils.fallback_mastery('Django', 3, 15.0))
+        self.assertEqual(utils.predict_mastery('Django', 3, 15.0)['estimated_total_hours'], 60)
+        self.assertEqual(utils.get_ai_resources('Docker'), utils.fallback_resources('Docker'))
+        self.assertEqual(
+            utils.auto_categorize_skills(['Docker', 'Pandas', 'FastAPI', 'Pottery']),
+            {'Docker': 'devops', 'Pandas': 'data', 'FastAPI': 'backend', 'Pottery': 'other'},
+        )
+        self.assertIn('12 hours', utils.generate_weekly_summary({'hours_logged': 12})['ai_message'])
+
+    @override_settings(AI_PROVIDER='skills.tests.FailingProvider', AI_OPERATIONS={})
+    def test_sync_and_async_fall_back_alike(self):
+        calls = [
+            (utils.get_ai_resources, utils.aget_ai_resources, ('Kafka',), utils.fallback_resources('Kafka')),
+            (utils.predict_mastery, utils.apredict_mastery, ('Kafka', 2, 5.0), utils.fallback_mastery('Kafka', 2, 5.0)),
+        ]
+        for sync, asynchronous, args, fallback in calls:
+            self.assertEqual(sync(*args), fallback)
+            self.assertEqual(async_to_sync(asynchronous)(*args), fallback)
+            with self.assertRaisesMessage(RuntimeError, 'model is down'):
+                sync(*args, strict=True)
+            with self.assertRaisesMessage(RuntimeError, 'model is down'):
+                async_to_sync(asynchronous)(*args, strict=True)
+
+        summary = utils.generate_weekly_summary({'hours_logged': 3})
+        self.assertEqual(summary['error'], 'model is down')
+        self.assertEqual(async_to_sync(utils.agenerate_weekly_summary)({'hours_logged': 3}), summary)
+
+    def test_replay_answers_what_was_recorded(self):
+        path = os.path.join(tempfile.mkdtemp(), 'replay.jsonl')
+        replay = {'PATH': path, 'RECORD_PROVIDER': 'skills.tests.EchoProvider'}
+        EchoProvider.calls = 0
+
+        with override_settings(AI_PROVIDER='replay', AI_OPERATIONS={}, AI_REPLAY={**replay, 'MODE': 'record'}):
+            self.assertEqual(utils.auto_categorize_skill('Go'), 'backend')
+        self.assertEqual(EchoProvider.calls, 1)
+
+        providers.reset()
+        with override_settings(AI_PROVIDER='replay', AI_OPERATIONS={}, AI_REPLAY={**replay, 'MODE': 'replay'}):
+            self.assertEqual(utils.auto_categorize_skill('Go'), 'backend')
+            # Never recorded: the miss falls back like any failed call
+            self.assertEqual(utils.auto_categorize_skill('Elm'), 'other')
+        self.assertEqual(EchoProvider.calls, 1)
+
+
+class SearchTests(TestCase):
+    """?search= combined with the list filters and pagination"""
+
+    def setUp(self):
+        owner_id = owners.default_owner_id()
+        for name, status, category in [
+            ('React Hooks', 'completed', 'frontend'),
+            ('React Native', 'started', 'frontend'),
+            ('React Testing', 'completed', 'frontend'),
+            ('React Server', 'started', 'backend'),
+            ('React Router', 'started', 'frontend'),
+        ]:
+            Skill.objects.create(owner_id=owner_id, skill_name=name, status=status, category=category)
+
+    def search_pages(self, query):
+        """Follows `next` from the first page and returns every page's skill names"""
+        pages = []
+        url = f'/api/skills/?{query}'
+        while url:
+            body = Client().get(url).json()
+            pages.append([item['skill_name'] for item in body['results']])
+            url = body['next']
+        return pages
+
+    def test_filters_apply_before_the_limit(self):
+        pages = self.search_pages('search=react&status=started&category=frontend&page_size=1')
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(sorted(name for page in pages for name in page), ['React Native', 'React Router'])
+
+    def test_pages_cover_every_match_once(self):
+        pages = self.search_pages('search=react&status=started&page_size=2')
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(
+            sorted(name for page in pages for name in page),
+            ['React Native', 'React Router', 'React Server'],
+        )
+
+
+class PaginationTests(TestCase):
+    """Keyset pagination and ?fields= projection on GET /api/skills/"""
+
+    def setUp(self):
+        owner_id = owners.default_owner_id()
+        Skill.objects.bulk_create([Skill(owner_id=owner_id, skill_name=f'Skill {n}') for n in range(7)])
+        # Ties on created_date must be broken by id
+        Skill.objects.update(created_date=timezone.now() - timedelta(days=1))
+        Skill.objects.create(owner_id=owner_id, skill_name='Newest')
+
+    def test_cursor_walks_every_row_once(self):
+        ids = []
+        url = '/api/skills/?page_size=3'
+        while url:
+            response = Client().get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertLessEqual(len(body['results']), 3)
+            ids.extend(skill['id'] for skill in body['results'])
+            url = body['next']
+
+        expected = list(Skill.objects.order_by('-created_date', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(set(ids)), 8)
+
+    def test_bad_cursor_is_not_found(self):
+        tampered = base64.urlsafe_b64encode(b'2024-01-01T00:00:00|not-a-pk').decode()
+        for cursor in ('garbage', tampered, base64.urlsafe_b64encode(b'no separator').decode()):
+            response = Client().get('/api/skills/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+    def test_fields_projection(self):
+        body = Client().get('/api/skills/', {'page_size': 2, 'fields': 'id,skill_name'}).json()
+        self.assertEqual([set(skill) for skill in body['results']], [{'id', 'skill_name'}] * 2)
+
+        response = Client().get('/api/skills/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['fields'])
+
+
+class MasteryProvider:
+    """Answers mastery prompts with the calculated prediction and counts the calls"""
+    name = 'mastery'
+    configured = True
+    cacheable = False
+    persistable = True
+    calls = 0
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        MasteryProvider.calls += 1
+        return json.dumps(utils.fallback_mastery(**inputs))
+
+
+@override_settings(AI_PROVIDER='skills.tests.MasteryProvider', AI_OPERATIONS={})
+class EnrichSkillsTests(TestCase):
+    """The enrich_skills backfill"""
+
+    def setUp(self):
+        providers.reset()
+        self.addCleanup(providers.reset)
+        MasteryProvider.calls = 0
+
+    def test_backfilled_prediction_is_reused(self):
+        skill = Skill.objects.create(owner_id=owners.default_owner_id(), skill_name='Rust', hours_spent=12)
+        checkpoint = os.path.join(tempfile.mkdtemp(), 'enrich.checkpoint')
+        call_command('enrich_skills', only='mastery', workers=1, checkpoint=checkpoint, stdout=StringIO())
+        self.assertEqual(MasteryProvider.calls, 1)
+
+        skill.refresh_from_db()
+        self.assertIsNotNone(skill.get_stored_mastery_prediction())
+        body = Client().post(f'/api/async/skills/{skill.pk}/mastery-predict/').json()
+        self.assertTrue(body['cached'])
+        self.assertEqual(MasteryProvider.calls, 1)
+
+
+class OtherProvider:
+    """Puts every skill in 'other', batched or not, and counts the calls"""
+    name = 'other'
+    configured = True
+    cacheable = False
+    persistable = True
+    calls = 0
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        OtherProvider.calls += 1
+        if 'skill_names' in inputs:
+            return json.dumps({name: 'other' for name in inputs['skill_names']})
+        return 'other'
+
+
+@override_settings(AI_PROVIDER='skills.tests.OtherProvider', AI_OPERATIONS={})
+class EnrichCategoryTests(TestCase):
+    """Skills the model places in 'other' are categorized once, not on every run"""
+
+    def setUp(self):
+        providers.reset()
+        self.addCleanup(providers.reset)
+        OtherProvider.calls = 0
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), 'enrich.checkpoint')
+
+    def enrich(self):
+        call_command('enrich_skills', only='category', workers=1, checkpoint=self.checkpoint, stdout=StringIO())
+
+    def test_other_is_recorded_until_renamed(self):
+        skill = Skill.objects.create(owner_id=owners.default_owner_id(), skill_name='Pottery')
+        self.enrich()
+        self.assertEqual(OtherProvider.calls, 1)
+        skill.refresh_from_db()
+        self.assertEqual((skill.category, skill.categorized_name), ('other', 'Pottery'))
+
+        self.enrich()
+        self.assertEqual(OtherProvider.calls, 1)
+
+        Skill.objects.filter(pk=skill.pk).update(skill_name='Ceramics')
+        self.enrich()
+        self.assertEqual(OtherProvider.calls, 2)
+
+
+class ImportTests(TestCase):
+    """Importing exported skills"""
+
+    def test_activity_lands_on_the_exported_dates(self):
+        rows = [
+            {'skill_name': 'Go', 'hours_spent': '4.00', 'created_date': '2025-01-10T09:00:00+00:00'},
+            {'skill_name': 'Elm', 'hours_spent': '2.50', 'created_date': '2025-03-02T18:30:00+00:00'},
+            {'skill_name': 'Zig', 'hours_spent': '1.00', 'created_date': '2025-03-03T07:15:00'},
+        ]
+        body = ''.join(json.dumps(row) + '\n' for row in rows)
+        response = Client().post('/api/skills/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.json()['imported'], 3)
+
+        series = Client().get(
+            '/api/analytics/timeseries/?bucket=month&metric=hours&from=2025-01-01&to=2025-03-31'
+        ).json()['series']
+        self.assertEqual(
+            [(point['start'], point['value']) for point in series],
+            [('2025-01-01', 4.0), ('2025-02-01', 0.0), ('2025-03-01', 3.5)],
+        )
+        self.assertFalse(ActivityDay.objects.filter(date=timezone.localdate()).exists())
+
+        profile = UserProfile.objects.get(owner_id=owners.default_owner_id())
+        self.assertEqual(profile.total_learning_days, 3)
+        self.assertEqual(profile.longest_streak, 2)
+        self.assertEqual(profile.last_activity_date.isoformat(), '2025-03-03')
+
+    def test_import_keeps_days_marked_through_update_streak(self):
+        Client().post('/api/profile/update-streak/')
+        body = json.dumps({'skill_name': 'Go', 'created_date': '2024-01-01T09:00:00+00:00'}) + '\n'
+        Client().post('/api/skills/import/', body, content_type='application/x-ndjson')
+
+        today = timezone.localdate()
+        self.assertTrue(ActivityDay.objects.filter(date=today).exists())
+        profile = UserProfile.objects.get(owner_id=owners.default_owner_id())
+        self.assertEqual(profile.last_activity_date, today)
+        self.assertEqual(profile.current_streak, 1)
+        self.assertEqual(profile.total_learning_days, 2)
+        call_command('rebuild_activity', check=True, stdout=StringIO())
+
+    def test_session_imports_need_the_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(get_user_model().objects.create(username='ada'))
+        body = json.dumps({'skill_name': 'Go'}) + '\n'
+
+        response = client.post('/api/skills/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 403)
+
+        # Where session users sign in, and pick up the cookie
+        client.get('/admin/login/')
+        token = client.cookies['csrftoken'].value
+        response = client.post(
+            '/api/skills/import/', body, content_type='application/x-ndjson', HTTP_X_CSRFTOKEN=token
+        )
+        self.assertEqual(response.json()['imported'], 1)
+
+
+class HttpCacheTests(TestCase):
+    """ETags and conditional GETs of the cached read endpoints"""
+
+    def setUp(self):
+        self.skill = Skill.objects.create(owner_id=owners.default_owner_id(), skill_name='Go')
+
+    def test_each_representation_has_its_own_etag(self):
+        client = Client()
+        etags = {
+            client.get(url)['ETag']
+            for url in ('/api/skills/', f'/api/skills/{self.skill.pk}/', '/api/skills/?fields=id')
+        }
+        self.assertEqual(len(etags), 3)
+
+        etag = client.get(f'/api/skills/{self.skill.pk}/')['ETag']
+        response = client.get(f'/api/skills/{self.skill.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_skill_gets_404_not_304(self):
+        client = Client()
+        etag = client.get(f'/api/skills/{self.skill.pk}/')['ETag']
+        response = client.get(f'/api/skills/{self.skill.pk + 1}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+        response = client.get(f'/api/skills/{self.skill.pk + 1}/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(AI_PROVIDER='offline', AI_OPERATIONS={})
+class OfflineResultTests(TestCase):
+    """Offline answers are served but never stored as if a model gave them"""
+
+    def setUp(self):
+        providers.reset()
+        self.addCleanup(providers.reset)
+
+    def test_offline_resources_are_not_stored(self):
+        skill = Skill.objects.create(owner_id=owners.default_owner_id(), skill_name='Docker')
+        body = Client().post(f'/api/async/skills/{skill.pk}/ai-resources/').json()
+        self.assertEqual(body['resources'], utils.fallback_resources('Docker'))
+
+        skill.refresh_from_db()
+        self.assertEqual(skill.recommended_resources, {})
+
+
+class DashboardStatsTests(TestCase):
+    """The incrementally maintained stats row always equals a full recompute"""
+
+    def setUp(self):
+        self.owner_id = owners.default_owner_id()
+        self.client = Client()
+
+    def assert_matches_compute(self):
+        stored = DashboardStats.objects.get(owner_id=self.owner_id)
+        expected = stats.compute(self.owner_id)
+        self.assertEqual(stored.total_skills, expected['total_skills'])
+        self.assertEqual(stored.total_hours, expected['total_hours'])
+        self.assertEqual(stored.get_status_counts(), expected['status_counts'])
+        self.assertEqual(stored.get_category_counts(), expected['category_counts'])
+        self.assertEqual(stored.get_top_skills(), expected['top_skills'])
+
+    def create(self, name, hours, status='started', category='other'):
+        return Skill.objects.create(
+            owner_id=self.owner_id, skill_name=name, hours_spent=hours, status=status, category=category,
+        )
+
+    def test_mixed_writes(self):
+        statuses = ('started', 'in-progress', 'completed')
+        categories = ('frontend', 'backend', 'data', 'other')
+        skills = [
+            self.create(f'Skill {i}', i * 3, statuses[i % 3], categories[i % 4])
+            for i in range(stats.TOP_N + 4)
+        ]
+        self.assert_matches_compute()
+
+        # A low skill climbs into the top N
+        skills[0].hours_spent = 100
+        skills[0].save()
+        self.assert_matches_compute()
+
+        # The top skill drops out of the top N: the row must refill from the table
+        top = max(skills, key=lambda skill: skill.hours_spent)
+        top.hours_spent = 1
+        top.status = 'completed'
+        top.save()
+        self.assert_matches_compute()
+
+        # Deleting a top skill also needs a refill
+        skills[-1].delete()
+        self.assert_matches_compute()
+
+        created = self.client.post('/api/skills/bulk/', [
+            {'skill_name': 'Bulk A', 'hours_spent': 50, 'category': 'data'},
+            {'skill_name': 'Bulk B', 'hours_spent': 2, 'status': 'completed'},
+        ], content_type='application/json').json()
+        ids = [result['data']['id'] for result in created['results']]
+        self.assert_matches_compute()
+
+        self.client.patch('/api/skills/bulk/', [
+            {'id': ids[0], 'hours_spent': 0, 'status': 'completed'},
+            {'id': skills[5].id, 'category': 'frontend', 'hours_spent': 70},
+        ], content_type='application/json')
+        self.assert_matches_compute()
+
+        self.client.delete(
+            '/api/skills/bulk/', {'ids': [ids[1], skills[5].id, skills[6].id]}, content_type='application/json',
+        )
+        self.assert_matches_compute()
+
+        response = self.client.get('/api/dashboard-stats/').json()
+        self.assertIsInstance(response['top_skills'][0]['hours_spent'], float)
+
+
+class OwnershipTests(TestCase):
+    """Every endpoint only reads and writes the requesting user's rows"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.bobs_skill = Skill.objects.create(
+            owner=self.bob, skill_name='React Bob', hours_spent=7, notes='private notes',
+        )
+        self.bobs_job = AIJob.objects.create(skill=self.bobs_skill, operation='ai_resources')
+        self.client = Client()
+        self.client.force_login(self.alice)
+        bob = Client()
+        bob.force_login(self.bob)
+        bob.post('/api/profile/update-streak/')
+
+    def test_other_users_skills_are_invisible(self):
+        skill = f'/api/skills/{self.bobs_skill.pk}/'
+        self.assertEqual(self.client.get('/api/skills/').json(), [])
+        self.assertEqual(self.client.get('/api/skills/?search=react').json(), [])
+        self.assertEqual(self.client.get(skill).status_code, 404)
+        self.assertEqual(
+            self.client.patch(skill, {'hours_spent': 1}, content_type='application/json').status_code, 404,
+        )
+        self.assertEqual(self.client.delete(skill).status_code, 404)
+        self.assertEqual(b''.join(self.client.get('/api/skills/export/').streaming_content), b'')
+
+        patched = self.client.patch(
+            '/api/skills/bulk/', [{'id': self.bobs_skill.pk, 'hours_spent': 1}], content_type='application/json',
+        )
+        self.assertEqual(patched.status_code, 400)
+        deleted = self.client.delete(
+            '/api/skills/bulk/', {'ids': [self.bobs_skill.pk]}, content_type='application/json',
+        )
+        self.assertEqual(deleted.status_code, 400)
+
+        self.bobs_skill.refresh_from_db()
+        self.assertEqual(float(self.bobs_skill.hours_spent), 7)
+
+    def test_other_users_jobs_and_profile_are_invisible(self):
+        self.assertEqual(self.client.get(f'/api/jobs/{self.bobs_job.pk}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/').json(), [])
+        bobs_profile = UserProfile.objects.get(owner=self.bob)
+        self.assertEqual(self.client.get(f'/api/profile/{bobs_profile.pk}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/profile/activity/').json(), {'days': []})
+
+    def test_stats_and_streaks_are_per_user(self):
+        self.client.post('/api/skills/', {'skill_name': 'Go', 'hours_spent': 2}, content_type='application/json')
+        stats_response = self.client.get('/api/dashboard-stats/').json()
+        self.assertEqual(stats_response['total_skills'], 1)
+        self.assertEqual(stats_response['total_hours'], 2.0)
+        self.assertEqual([skill['skill_name'] for skill in stats_response['top_skills']], ['Go'])
+
+        self.assertEqual(self.client.get('/api/profile/streak/').json()['current_streak'], 1)
+        self.assertEqual(UserProfile.objects.get(owner=self.bob).current_streak, 1)
+        self.assertEqual(ActivityDay.objects.filter(owner=self.alice).count(), 1)
+        self.assertEqual(ActivityDay.objects.filter(owner=self.bob).count(), 1)
+
+    def test_anonymous_requests_act_as_the_default_user(self):
+        Client().post('/api/skills/', {'skill_name': 'Elm'}, content_type='application/json')
+        self.assertEqual(
+            list(Skill.objects.filter(skill_name='Elm').values_list('owner__username', flat=True)),
+            [owners.get_setting('DEFAULT_USERNAME')],
+        )
+        self.assertEqual([skill['skill_name'] for skill in Client().get('/api/skills/').json()], ['Elm'])
+
+    @override_settings(OWNERSHIP={'ALLOW_ANONYMOUS': False})
+    def test_anonymous_requests_can_be_refused(self):
+        self.assertEqual(Client().get('/api/skills/').status_code, 403)
+
+
+class BulkTests(TestCase):
+    """/api/skills/bulk/ results, status codes and side effects"""
+
+    def setUp(self):
+        self.owner_id = owners.default_owner_id()
+        self.client = Client()
+
+    def bulk(self, method, data):
+        return getattr(self.client, method)('/api/skills/bulk/', data, content_type='application/json')
+
+    def stats_updates(self, context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "skills_dashboardstats"')
+        ]
+
+    def test_create_reports_every_item(self):
+        stats.rebuild(self.owner_id)
+        with CaptureQueriesContext(connection) as context:
+            response = self.bulk('post', [
+                {'skill_name': 'Go', 'hours_spent': 3},
+                {'skill_name': 'Rust', 'difficulty_rating': 9},
+                'not an object',
+                {'skill_name': 'Elm', 'hours_spent': 1.5},
+            ])
+
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['succeeded'], body['failed']), (2, 2))
+        self.assertEqual(
+            [(result['index'], result['status']) for result in body['results']],
+            [(0, 'created'), (1, 'error'), (2, 'error'), (3, 'created')],
+        )
+        self.assertIn('difficulty_rating', body['results'][1]['errors'])
+        self.assertEqual(body['results'][3]['data']['skill_name'], 'Elm')
+
+        # One stats update for the whole batch, and the activity of every skill
+        self.assertEqual(len(self.stats_updates(context)), 1)
+        self.assertEqual(DashboardStats.objects.get(owner_id=self.owner_id).total_skills, 2)
+        self.assertEqual(ActivityEvent.objects.filter(owner_id=self.owner_id, kind='created').count(), 2)
+        day = ActivityDay.objects.get(owner_id=self.owner_id, date=timezone.localdate())
+        self.assertEqual((day.events, float(day.hours)), (2, 4.5))
+
+    def test_all_invalid_is_a_400(self):
+        response = self.bulk('post', [{'difficulty_rating': 3}, {'skill_name': ''}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['succeeded'], 0)
+        self.assertFalse(Skill.objects.exists())
+
+    def test_all_valid_create_is_a_201(self):
+        self.assertEqual(self.bulk('post', [{'skill_name': 'Go'}]).status_code, 201)
+
+    def test_update_and_delete_only_touch_own_skills(self):
+        other = Skill.objects.create(owner=get_user_model().objects.create(username='eve'), skill_name='Theirs')
+        mine = [Skill.objects.create(owner_id=self.owner_id, skill_name=name) for name in ('A', 'B')]
+        stats.rebuild(self.owner_id)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.bulk('patch', [
+                {'id': mine[0].pk, 'hours_spent': 5, 'status': 'completed'},
+                {'id': other.pk, 'hours_spent': 5},
+                {'id': mine[1].pk, 'hours_spent': -1},
+            ])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [result['status'] for result in response.json()['results']], ['updated', 'error', 'error'],
+        )
+        self.assertEqual(response.json()['results'][1]['errors'], {'id': ['Not found.']})
+        self.assertEqual(len(self.stats_updates(context)), 1)
+        event = ActivityEvent.objects.get(owner_id=self.owner_id, kind='updated')
+        self.assertEqual((event.skill_id, float(event.hours_delta), event.new_status), (mine[0].pk, 5.0, 'completed'))
+        self.assertEqual(ActivityDay.objects.get(owner_id=self.owner_id).completions, 1)
+
+        response = self.bulk('delete', {'ids': [mine[0].pk, other.pk, mine[1].pk]})
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [result['status'] for result in response.json()['results']], ['deleted', 'error', 'deleted'],
+        )
+        self.assertTrue(Skill.objects.filter(pk=other.pk).exists())
+        self.assertEqual(DashboardStats.objects.get(owner_id=self.owner_id).total_skills, 0)
+        self.assertEqual(ActivityEvent.objects.filter(owner_id=self.owner_id, kind='deleted').count(), 2)
+
+
+class FailingProvider:
+    """A configured provider whose every call fails"""
+    name = 'failing'
+    configured = True
+    cacheable = False
+    persistable = True
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        raise RuntimeError('model is down')
+
+    async def agenerate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        raise RuntimeError('model is down')
+
+
+class JobTests(TestCase):
+    """The AI job queue: reuse, refresh, retries and stale lease recovery"""
+
+    def setUp(self):
+        self.skill = Skill.objects.create(owner_id=owners.default_owner_id(), skill_name='Kafka')
+        providers.reset()
+        self.addCleanup(providers.reset)
+
+    def test_refresh_upgrades_a_queued_job(self):
+        job = jobs.enqueue(self.skill, 'mastery_predict')
+        again = jobs.enqueue(self.skill, 'mastery_predict', refresh=True)
+        self.assertEqual(again.pk, job.pk)
+        self.assertTrue(AIJob.objects.get(pk=job.pk).refresh)
+
+    def test_refresh_does_not_reuse_a_running_cached_job(self):
+        running = jobs.claim(jobs.enqueue(self.skill, 'mastery_predict').pk, worker_id='w')
+        refreshed = jobs.enqueue(self.skill, 'mastery_predict', refresh=True)
+        self.assertNotEqual(refreshed.pk, running.pk)
+        self.assertTrue(refreshed.refresh)
+        # Without refresh any pending job will do
+        self.assertEqual(jobs.enqueue(self.skill, 'mastery_predict').pk, running.pk)
+        self.assertEqual(jobs.enqueue(self.skill, 'mastery_predict', refresh=True).pk, refreshed.pk)
+
+    @override_settings(
+        AI_PROVIDER='skills.tests.FailingProvider', AI_OPERATIONS={},
+        AI_JOBS={'MAX_ATTEMPTS': 2, 'BACKOFF_SECONDS': 30},
+    )
+    def test_failures_back_off_then_fall_back(self):
+        job = jobs.enqueue(self.skill, 'ai_resources')
+
+        started = timezone.now()
+        job = jobs.run_job(jobs.claim_next('w'))
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertIn('model is down', job.last_error)
+        self.assertGreaterEqual(job.run_after, started + timedelta(seconds=30))
+        self.assertIsNone(jobs.claim_next('w'))
+
+        AIJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        job = jobs.run_job(jobs.claim_next('w'))
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertEqual(job.get_result(), utils.fallback_resources('Kafka'))
+        self.skill.refresh_from_db()
+        self.assertEqual(self.skill.recommended_resources, {})
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        with override_settings(AI_JOBS={'BACKOFF_SECONDS': 5, 'MAX_BACKOFF_SECONDS': 30}):
+            self.assertEqual([jobs.backoff_delay(attempt) for attempt in (1, 2, 3, 4, 5)], [5, 10, 20, 30, 30])
+
+    @override_settings(AI_JOBS={'STALE_AFTER_SECONDS': 600})
+    def test_stale_running_jobs_are_requeued(self):
+        stale = jobs.claim(jobs.enqueue(self.skill, 'ai_resources').pk, worker_id='dead')
+        fresh = jobs.claim(jobs.enqueue(self.skill, 'mastery_predict').pk, worker_id='alive')
+        AIJob.objects.filter(pk=stale.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+
+        self.assertEqual(jobs.requeue_stale(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.locked_by, stale.locked_at), ('queued', '', None))
+        self.assertEqual((fresh.status, fresh.locked_by), ('running', 'alive'))
+        self.assertEqual(jobs.claim_next('w').pk, stale.pk)
+
+
+class FakeModel:
+    """Stands in for a GenerativeModel: fails, hangs until released, or answers"""
+
+    def __init__(self, fail=False, hang=False):
+        self.fail = fail
+        self.release = threading.Event() if hang else None
+        self.calls = 0
+        self.usage = None
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        if self.fail:
+            raise RuntimeError('upstream error')
+        return mock.Mock(text='answer', usage_metadata=self.usage)
+
+
+@override_settings(GEMINI={'FAILURE_THRESHOLD': 3, 'RESET_SECONDS': 30, 'TIMEOUT_SECONDS': 5})
+class CircuitBreakerTests(SimpleTestCase):
+    """The per-model breaker and deadline in skills/gemini.py, on a fake clock and model"""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('skills.gemini.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(gemini._breakers.clear)
+        self.addCleanup(gemini._models.clear)
+
+    def use_model(self, model):
+        gemini._models['fake-model'] = model
+        return model
+
+    def test_trips_after_the_threshold_and_rejects_while_open(self):
+        model = self.use_model(FakeModel(fail=True))
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                gemini.generate('fake-model', 'prompt')
+        breaker = gemini.get_breaker('fake-model')
+        self.assertEqual(breaker.state, 'open')
+
+        self.now += 29
+        with self.assertRaises(gemini.CircuitOpen):
+            gemini.generate('fake-model', 'prompt')
+        self.assertEqual(model.calls, 3)
+        self.assertEqual(breaker.stats()['rejected'], 1)
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = gemini.get_breaker('fake-model')
+        for _ in range(3):
+            breaker.record_failure()
+        self.now += 30
+
+        breaker.before_call()
+        self.assertEqual(breaker.state, 'half_open')
+        with self.assertRaises(gemini.CircuitOpen):
+            breaker.before_call()
+
+        # A failed probe opens the circuit for another RESET_SECONDS
+        breaker.record_failure()
+        self.assertEqual((breaker.state, breaker.stats()['opened']), ('open', 2))
+        self.now += 29
+        with self.assertRaises(gemini.CircuitOpen):
+            breaker.before_call()
+
+        # A successful probe closes it
+        self.now += 1
+        model = self.use_model(FakeModel())
+        self.assertEqual(gemini.generate('fake-model', 'prompt'), 'answer')
+        self.assertEqual((breaker.state, breaker.failures), ('closed', 0))
+        gemini.generate('fake-model', 'prompt')
+        self.assertEqual(model.calls, 2)
+
+    @override_settings(GEMINI={'FAILURE_THRESHOLD': 1, 'RESET_SECONDS': 30, 'TIMEOUT_SECONDS': 0.05})
+    def test_deadline_raises_timeout_and_counts_as_a_failure(self):
+        model = self.use_model(FakeModel(hang=True))
+        self.addCleanup(model.release.set)
+
+        with self.assertRaises(TimeoutError):
+            gemini.generate('fake-model', 'prompt')
+        stats = gemini.get_breaker('fake-model').stats()
+        self.assertEqual((stats['state'], stats['timeouts']), ('open', 1))
+
+
+class SlowMasteryProvider(MasteryProvider):
+    """MasteryProvider that takes long enough for concurrent callers to pile up"""
+    lock = threading.Lock()
+
+    def generate(self, model_name, prompt, timeout=None, operation=None, inputs=None):
+        with SlowMasteryProvider.lock:
+            MasteryProvider.calls += 1
+        time.sleep(0.3)
+        return json.dumps(utils.fallback_mastery(**inputs))
+
+
+@override_settings(AI_PROVIDER='skills.tests.SlowMasteryProvider', AI_OPERATIONS={})
+class SingleFlightTests(TransactionTestCase):
+    """Concurrent generations for one key share a call; dead leases are taken over"""
+
+    def setUp(self):
+        providers.reset()
+        self.addCleanup(providers.reset)
+        MasteryProvider.calls = 0
+        self.skill = Skill.objects.create(owner_id=owners.default_owner_id(), skill_name='Go', hours_spent=20)
+        self.key = singleflight.skill_key(self.skill.pk, 'mastery_predict')
+
+    def predict(self):
+        return utils.predict_mastery('Go', 3, 20.0, strict=True, refresh=True)
+
+    def test_concurrent_callers_share_one_call(self):
+        results = []
+        errors = run_concurrently(
+            lambda: results.append(singleflight.run(self.key, self.predict)), [()] * 8, threads=8
+        )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(MasteryProvider.calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == results[0] for result in results))
+        lease = AILease.objects.get(key=self.key)
+        self.assertTrue(lease.done)
+        self.assertEqual(json.loads(lease.result), results[0])
+
+    def test_expired_lease_is_taken_over(self):
+        # Left behind by a process that died mid-call
+        AILease.objects.create(key=self.key, token='dead', expires_at=timezone.now() - timedelta(seconds=1))
+
+        result = singleflight.run(self.key, self.predict)
+
+        self.assertEqual(MasteryProvider.calls, 1)
+        lease = AILease.objects.get(key=self.key)
+        self.assertNotEqual(lease.token, 'dead')
+        self.assertTrue(lease.done)
+        self.assertEqual(json.loads(lease.result), result)
+
+
+class LLMMetricsTests(SimpleTestCase):
+    """LLM calls are counted per provider, whichever provider answers"""
+
+    def setUp(self):
+        providers.reset()
+        self.addCleanup(providers.reset)
+        self.addCleanup(gemini._breakers.clear)
+        self.addCleanup(gemini._models.clear)
+
+    def counter(self, name, *labels):
+        return metrics.registry.snapshot()[0].get((name, labels), 0)
+
+    def calls(self, provider, outcome):
+        labels = (('provider', provider), ('model', 'gemini-2.5-flash'), ('outcome', outcome))
+        return self.counter('skillstack_llm_calls_total', *labels)
+
+    @override_settings(AI_PROVIDER='offline', AI_OPERATIONS={})
+    def test_offline_calls_are_counted(self):
+        before = self.calls('offline', 'ok')
+        providers.generate('categorize', 'prompt', skill_name='Docker')
+        async_to_sync(providers.agenerate)('categorize', 'prompt', skill_name='Docker')
+        self.assertEqual(self.calls('offline', 'ok'), before + 2)
+        self.assertIn('provider="offline"', metrics.render())
+
+    def test_replay_misses_are_counted_as_errors(self):
+        path = os.path.join(tempfile.mkdtemp(), 'replay.jsonl')
+        with override_settings(AI_PROVIDER='replay', AI_OPERATIONS={}, AI_REPLAY={'PATH': path, 'MODE': 'replay'}):
+            before = self.calls('replay', 'error')
+            with self.assertRaises(LookupError):
+                providers.generate('categorize', 'never recorded', skill_name='Elm')
+        self.assertEqual(self.calls('replay', 'error'), before + 1)
+
+    @override_settings(GEMINI_API_KEY='test', AI_PROVIDER='gemini', AI_OPERATIONS={})
+    def test_gemini_reports_sdk_token_counts(self):
+        model = gemini._models['gemini-2.5-flash'] = FakeModel()
+        model.usage = mock.Mock(prompt_token_count=11, candidates_token_count=7)
+        labels = (('provider', 'gemini'), ('model', 'gemini-2.5-flash'))
+        before = [self.counter('skillstack_llm_tokens_total', *labels, ('direction', direction))
+                  for direction in ('prompt', 'response')]
+
+        self.assertEqual(providers.generate('categorize', 'prompt', skill_name='Go'), 'answer')
+
+        after = [self.counter('skillstack_llm_tokens_total', *labels, ('direction', direction))
+                 for direction in ('prompt', 'response')]
+        self.assertEqual([a - b for a, b in zip(after, before)], [11, 7])
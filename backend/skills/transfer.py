@@ -0,0 +1,148 @@
+"""
+Streaming export/import of skills as NDJSON or CSV.
+
+Exports read the table with .iterator() and yield one line at a time, so
+memory stays flat no matter how many rows there are. Imports parse lines
+lazily and insert them in batches, one transaction per batch.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import activity, bulk
+from .models import Skill
+
+
+FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+# Owner ids mean nothing in another database; imports belong to the importer
+EXPORT_FIELDS = [field.name for field in Skill._meta.concrete_fields if field.name != 'owner']
+JSON_FIELDS = ('recommended_resources', 'mastery_prediction')
+MAX_REPORTED_ERRORS = 100
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Yields each skill as a dict, reading `chunk_size` rows at a time"""
+    return queryset.order_by('id').values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def to_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+class _LineBuffer:
+    """File-like object whose write() just returns the line (for csv.writer)"""
+
+    def write(self, value):
+        return value
+
+
+def to_csv(rows):
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([
+            json.dumps(row[field]) if field in JSON_FIELDS else row[field]
+            for field in EXPORT_FIELDS
+        ])
+
+
+def render(rows, fmt):
+    return to_csv(rows) if fmt == 'csv' else to_ndjson(rows)
+
+
+def decode_lines(lines):
+    for line in lines:
+        yield line.decode('utf-8') if isinstance(line, bytes) else line
+
+
+def parse_ndjson(lines):
+    """Yields one dict (or the parse error) per non-empty line"""
+    for line in decode_lines(lines):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+def parse_csv(lines):
+    for row in csv.DictReader(decode_lines(lines)):
+        for field in JSON_FIELDS:
+            if row.get(field):
+                try:
+                    row[field] = json.loads(row[field])
+                except ValueError:
+                    pass
+        yield row
+
+
+def parse(lines, fmt):
+    return parse_csv(lines) if fmt == 'csv' else parse_ndjson(lines)
+
+
+def created_date(row):
+    """The row's exported created_date as an aware datetime, or None"""
+    created = parse_datetime(str(row.get('created_date') or ''))
+    if created is not None and timezone.is_naive(created):
+        created = timezone.make_aware(created)
+    return created
+
+
+def import_rows(rows, owner_id, batch_size=1000, progress=None):
+    """
+    Validates and inserts parsed rows as skills of `owner_id` in batches of
+    `batch_size`, each in its own transaction. The exported created_date is
+    kept when present, and the skill's 'created' activity falls on that day;
+    ids are always assigned by the database.
+
+    Returns {'imported': n, 'failed': n, 'errors': [first errors]}.
+    """
+    summary = {'imported': 0, 'failed': 0, 'errors': []}
+    batch = []
+
+    def flush():
+        items = [row for _, row in batch]
+        valid, errors = bulk.validate_items(items)
+
+        with transaction.atomic():
+            skills = bulk.create_skills(
+                [data for _, data in valid], owner_id, batch_size=batch_size,
+                created_dates=[created_date(items[position]) for position, _ in valid],
+            )
+
+        summary['imported'] += len(skills)
+        summary['failed'] += len(errors)
+        for position, error in errors:
+            if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                summary['errors'].append({'row': batch[position][0], 'errors': error})
+        batch.clear()
+        if progress is not None:
+            progress(summary)
+
+    for row_number, row in enumerate(rows, start=1):
+        if isinstance(row, Exception):
+            summary['failed'] += 1
+            if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                summary['errors'].append({'row': row_number, 'errors': str(row)})
+            continue
+        batch.append((row_number, row))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    if summary['imported']:
+        # Imported days arrive in file order, not date order; derive the
+        # streak from the complete set of days once they are all in
+        activity.rebuild(owner_id)
+
+    return summary
@@ -4,8 +4,17 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     SkillViewSet, 
     UserProfileViewSet, 
+    AIJobViewSet,
     dashboard_stats, 
-    weekly_summary
+    weekly_summary,
+    analytics_timeseries,
+    ai_status,
+    metrics_view,
+    export_skills,
+    import_skills,
+    async_ai_resources,
+    async_mastery_predict,
+    async_weekly_summary,
 )
 
 router = DefaultRouter()
@@ -17,16 +26,32 @@ router.register(r'skills', SkillViewSet, basename='skill')
 # GET    /api/skills/{id}/         - Retrieve one
 # PUT    /api/skills/{id}/         - Update
 # DELETE /api/skills/{id}/         - Delete
-# POST   /api/skills/{id}/ai-resources/     - Custom action
-# POST   /api/skills/{id}/mastery-predict/  - Custom action
+# POST/PATCH/DELETE /api/skills/bulk/ - Bulk create/update/delete
+# POST   /api/skills/{id}/ai-resources/     - Queue AI job (202)
+# POST   /api/skills/{id}/mastery-predict/  - Queue AI job (202)
 
 router.register(r'profile', UserProfileViewSet, basename='profile')
 # Creates:
 # GET  /api/profile/streak/        - Custom action
 # POST /api/profile/update-streak/ - Custom action
+# GET  /api/profile/activity/      - Daily activity buckets
+
+router.register(r'jobs', AIJobViewSet, basename='job')
+# Creates:
+# GET  /api/jobs/{id}/             - Poll AI job status/result
 
 urlpatterns = [
+    # Before the router, which would otherwise treat "export" as a skill id
+    path('skills/export/', export_skills, name='skills-export'),
+    path('skills/import/', import_skills, name='skills-import'),
     path('', include(router.urls)),
     path('dashboard-stats/', dashboard_stats, name='dashboard-stats'),
     path('weekly-summary/', weekly_summary, name='weekly-summary'),
+    path('analytics/timeseries/', analytics_timeseries, name='analytics-timeseries'),
+    path('ai-status/', ai_status, name='ai-status'),
+    path('metrics/', metrics_view, name='metrics'),
+    # Async versions of the AI endpoints (no job queue; run under ASGI)
+    path('async/skills/<int:pk>/ai-resources/', async_ai_resources, name='async-ai-resources'),
+    path('async/skills/<int:pk>/mastery-predict/', async_mastery_predict, name='async-mastery-predict'),
+    path('async/weekly-summary/', async_weekly_summary, name='async-weekly-summary'),
 ]
\ No newline at end of file
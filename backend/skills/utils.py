@@ -1,188 +1,287 @@
-import os
 import json
-import google.generativeai as genai
-from dotenv import load_dotenv
+import logging
+from asgiref.sync import sync_to_async
+from . import providers
+from .ai_cache import ai_cache, make_key, normalize
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
-if not GEMINI_API_KEY:
-    print("WARNING: GEMINI_API_KEY not found in environment variables")
-else:
-    genai.configure(api_key=GEMINI_API_KEY)
-    print("Gemini API configured successfully")
+def ai_enabled(operation=None):
+    """
+    Whether the provider of `operation` (the default provider when None)
+    can be called; without it the operation falls back
+    """
+    return providers.get_provider(operation).configured
 
-def get_ai_resources(skill_name, resource_type='video'):
-    if not GEMINI_API_KEY:
-        return {
-            'videos': [],
-            'documentation': [],
-            'courses': []
-        }
-    
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        # Simpler prompt that's easier for AI to follow
-        prompt = f"""
-         For learning {skill_name}, provide 3 REAL YouTube channel/video URLs and 2 REAL documentation links.
-        
-        Return ONLY this JSON format (no other text):
-         {{
-            "videos": [
-                "Video Title 1 - https://www.youtube.com/watch?v=VIDEOID1",
-                "Video Title 2 - https://www.youtube.com/watch?v=VIDEOID2",
-                "Video Title 3 - https://www.youtube.com/watch?v=VIDEOID3"
-            ],
-            "documentation": [
-                "Official Docs - https://official-documentation-url.com",
-                "Guide - https://guide-or-tutorial-url.com"
-            ],
-            "courses": [
-                "Course Name - https://www.udemy.com/course/actual-course-id"
-            ]
-        }}
-        
-        IMPORTANT:
-        - Use REAL direct links (youtube.com/watch?v=... NOT /results?search)
-        - Use ACTUAL documentation URLs (official docs, github, etc)
-        - Make links clickable and working
-        - Return ONLY JSON
-        """
-        
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean response
-        if '```' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0]
-        elif '```' in response_text:
-            response_text = response_text.split('``````')[0]
-        
-        response_text = response_text.strip()
-        
-        # Extract JSON
-        if '{' in response_text and '}' in response_text:
-            start = response_text.index('{')
-            end = response_text.rindex('}') + 1
-            response_text = response_text[start:end]
-        
+
+def ai_persistable(operation):
+    """Whether answers for `operation` are real model output that may be stored on the skill"""
+    provider = providers.get_provider(operation)
+    return provider.configured and provider.persistable
+
+
+def cache_key(operation, **inputs):
+    return make_key(providers.get_model(operation), operation, **inputs)
+
+
+def cached(operation, key):
+    """The cached answer for `key`, or None; always None for providers that aren't cacheable"""
+    if not providers.get_provider(operation).cacheable:
+        return None
+    return ai_cache.get(key)
+
+
+def cache(operation, key, value):
+    if providers.get_provider(operation).cacheable:
+        ai_cache.set(key, value, operation, providers.get_model(operation))
+
+
+def _run(steps):
+    """
+    Runs an AI operation written as a generator of steps: it yields
+    (operation, prompt, inputs) for the provider call, gets the response
+    text (or the provider's exception) back, and returns the result. The
+    sync and async entry points below share one generator and only differ
+    in how they call the provider.
+    """
+    request, result = _step(steps)
+    while request is not None:
+        operation, prompt, inputs = request
         try:
-            result = json.loads(response_text)
-            print(f"✅ AI Resources generated for: {skill_name}")
-            return result
-        except json.JSONDecodeError as e:
-            print(f"⚠️ JSON parsing failed: {e}, using fallback")
-        skill_lower = skill_name.lower().replace(' ', '-')
-        return {
-            'videos': [
-                f"{skill_name} Tutorial - https://www.youtube.com/results?search_query={skill_name}+tutorial+{'-'.join(skill_name.split())}",
-                f"Learn {skill_name} - https://www.youtube.com/results?search_query={skill_name}+course+beginners",
-                f"{skill_name} for Beginners - https://www.youtube.com/results?search_query={skill_name}+getting+started"
-            ],
-            'documentation': [
-                f"Official {skill_name} Docs - https://www.google.com/search?q={skill_name}+official+documentation",
-                f"{skill_name} Guide - https://github.com/search?q={skill_name}+documentation"
-            ],
-            'courses': [
-                f"Learn {skill_name} - https://www.udemy.com/courses/search/?q={skill_name}"
-            ],
-            'note': 'Fallback links - AI temporarily unavailable'
-        }
-    
+            response_text = providers.generate(operation, prompt, **inputs)
+        except Exception as e:
+            request, result = _step(steps, error=e)
+        else:
+            request, result = _step(steps, response_text)
+    return result
+
+
+async def _arun(steps):
+    """_run for async views: awaits the provider; the cache lookups run in a thread"""
+    step = sync_to_async(_step)
+    request, result = await step(steps)
+    while request is not None:
+        operation, prompt, inputs = request
+        try:
+            response_text = await providers.agenerate(operation, prompt, **inputs)
+        except Exception as e:
+            request, result = await step(steps, error=e)
+        else:
+            request, result = await step(steps, response_text)
+    return result
+
+
+def _step(steps, response_text=None, error=None):
+    """Resumes `steps`: (next request, None), or (None, result) once it returns"""
+    try:
+        if error is not None:
+            return steps.throw(error), None
+        return steps.send(response_text), None
+    except StopIteration as done:
+        return None, done.value
+
+
+def get_ai_resources(skill_name, resource_type='video', strict=False):
+    """
+    AI resource recommendations for a skill.
+    With strict=True, provider errors are raised instead of returning
+    fallback links, so background jobs can retry them.
+    """
+    return _run(_resources_steps(skill_name, strict))
+
+
+async def aget_ai_resources(skill_name, strict=False):
+    """get_ai_resources for async views: awaits the provider instead of blocking a thread"""
+    return await _arun(_resources_steps(skill_name, strict))
+
+
+def _resources_steps(skill_name, strict):
+    if not ai_enabled('resources'):
+        return empty_resources()
+
+    key = cache_key('resources', skill_name=skill_name)
+    result = cached('resources', key)
+    if result is not None:
+        return result
+
+    try:
+        response_text = yield 'resources', resources_prompt(skill_name), {'skill_name': skill_name}
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return {
-            'videos': [
-                f"{skill_name} - https://www.youtube.com/results?search_query={skill_name}",
-                f"Learn {skill_name} - https://www.youtube.com/results?search_query=learn+{skill_name}",
-                f"{skill_name} Tutorial - https://www.youtube.com/results?search_query={skill_name}+tutorial"
-            ],
-            'documentation': [
-                f"Docs - https://www.google.com/search?q={skill_name}+documentation",
-                f"Guide - https://www.google.com/search?q={skill_name}+guide"
-            ],
-            'courses': [
-                f"Course - https://www.udemy.com/courses/search/?q={skill_name}"
-            ]
-        }
+        if strict:
+            raise
+        logger.warning("AI resources failed for %r, using fallback links: %s", skill_name, e)
+        return fallback_resources(skill_name)
+
+    return resources_from_response(skill_name, response_text, key, strict)
+
+
+def empty_resources():
+    return {
+        'videos': [],
+        'documentation': [],
+        'courses': []
+    }
+
+
+def resources_prompt(skill_name):
+    # Simpler prompt that's easier for AI to follow
+    return f"""
+     For learning {skill_name}, provide 3 REAL YouTube channel/video URLs and 2 REAL documentation links.
+    
+    Return ONLY this JSON format (no other text):
+     {{
+        "videos": [
+            "Video Title 1 - https://www.youtube.com/watch?v=VIDEOID1",
+            "Video Title 2 - https://www.youtube.com/watch?v=VIDEOID2",
+            "Video Title 3 - https://www.youtube.com/watch?v=VIDEOID3"
+        ],
+        "documentation": [
+            "Official Docs - https://official-documentation-url.com",
+            "Guide - https://guide-or-tutorial-url.com"
+        ],
+        "courses": [
+            "Course Name - https://www.udemy.com/course/actual-course-id"
+        ]
+    }}
+    
+    IMPORTANT:
+    - Use REAL direct links (youtube.com/watch?v=... NOT /results?search)
+    - Use ACTUAL documentation URLs (official docs, github, etc)
+    - Make links clickable and working
+    - Return ONLY JSON
+    """
+
+
+def resources_from_response(skill_name, response_text, key, strict=False):
+    """Parses and caches the model's answer; search links if it isn't valid JSON"""
+    try:
+        result = _extract_json(response_text)
+        logger.info("AI resources generated for %r", skill_name)
+        cache('resources', key, result)
+        return result
+    except json.JSONDecodeError as e:
+        if strict:
+            raise
+        logger.warning("AI resources for %r were not valid JSON (%s), using fallback links", skill_name, e)
+        return fallback_resources(skill_name)
+
+
+def fallback_resources(skill_name):
+    """Search links used when the model is unavailable (and by the offline provider)"""
+    return {
+        'videos': [
+            f"{skill_name} - https://www.youtube.com/results?search_query={skill_name}",
+            f"Learn {skill_name} - https://www.youtube.com/results?search_query=learn+{skill_name}",
+            f"{skill_name} Tutorial - https://www.youtube.com/results?search_query={skill_name}+tutorial"
+        ],
+        'documentation': [
+            f"Docs - https://www.google.com/search?q={skill_name}+documentation",
+            f"Guide - https://www.google.com/search?q={skill_name}+guide"
+        ],
+        'courses': [
+            f"Course - https://www.udemy.com/courses/search/?q={skill_name}"
+        ]
+    }
 
 
-def predict_mastery(skill_name, difficulty_rating, hours_spent):
+def predict_mastery(skill_name, difficulty_rating, hours_spent, strict=False, refresh=False):
     """
     Predict mastery timeline.
     AI first, then calculated fallback if AI fails.
+    With strict=True, AI failures are raised instead of falling back.
+    With refresh=True, the AI response cache is skipped (but updated).
     """
-    # Calculate base metrics
-    base_hours = difficulty_rating * 20
-    remaining = max(0, base_hours - hours_spent)
-    completion_pct = round((hours_spent / base_hours) * 100, 1) if base_hours > 0 else 0
-    
+    return _run(_mastery_steps(skill_name, difficulty_rating, hours_spent, strict, refresh))
+
+
+async def apredict_mastery(skill_name, difficulty_rating, hours_spent, strict=False, refresh=False):
+    """predict_mastery for async views: awaits the provider instead of blocking a thread"""
+    return await _arun(_mastery_steps(skill_name, difficulty_rating, hours_spent, strict, refresh))
+
+
+def _mastery_steps(skill_name, difficulty_rating, hours_spent, strict, refresh):
     # Try AI first
-    if GEMINI_API_KEY:
+    if ai_enabled('mastery'):
+        key = mastery_cache_key(skill_name, difficulty_rating, hours_spent)
+        result = None if refresh else cached('mastery', key)
+        if result is not None:
+            return result
+
         try:
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            prompt = f"""
-            Learning prediction for: {skill_name}
-            Difficulty: {difficulty_rating}/5
-            Hours spent: {hours_spent}
-            
-            Respond with ONLY valid JSON:
-            {{
-                "estimated_weeks": <number>,
-                "estimated_total_hours": <number>,
-                "completion_percentage": <number>,
-                "tips": ["tip1", "tip2", "tip3"],
-                "ai_tools": ["tool1", "tool2"]
-            }}
-            
-            Provide:
-            - Estimated weeks to complete (at 10 hours/week)
-            - Total hours needed
-            - Current completion percentage
-            - 3 specific learning tips
-            - 2 AI tools that can help
-            
-            Return ONLY JSON, no explanations.
-            """
-            
-            response = model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Clean markdown code blocks
-            if '``` json' in response_text:
-                parts = response_text.split('```json')
-                if len(parts) > 1:
-                    response_text = parts[1].split('```')[0]
-            elif '```' in response_text:
-                parts = response_text.split('```')
-                if len(parts) > 1:
-                    response_text = parts
-            
-            response_text = response_text.strip()
-            
-            # Extract JSON object
-            if '{' in response_text and '}' in response_text:
-                start = response_text.index('{')
-                end = response_text.rindex('}') + 1
-                response_text = response_text[start:end]
-            
-            try:
-                result = json.loads(response_text)
-                print(f"✅ Mastery prediction (AI) for: {skill_name}")
-                return result
-            except json.JSONDecodeError:
-                print(f"⚠️ AI JSON parsing failed, using calculated fallback")
-                # Fall through to calculated fallback
-        
+            response_text = yield 'mastery', mastery_prompt(skill_name, difficulty_rating, hours_spent), {
+                'skill_name': skill_name, 'difficulty_rating': difficulty_rating, 'hours_spent': hours_spent,
+            }
         except Exception as e:
-            print(f"⚠️ AI prediction failed: {str(e)}, using calculated fallback")
-            # Fall through to calculated fallback
-    
+            if strict:
+                raise
+            logger.warning("AI mastery prediction failed for %r, using calculated fallback: %s", skill_name, e)
+        else:
+            result = mastery_from_response(skill_name, response_text, key, strict)
+            if result is not None:
+                return result
+
     # Always return calculated fallback (whether AI disabled or failed)
-    print(f"📊 Mastery prediction (calculated) for: {skill_name}")
+    logger.info("Mastery prediction (calculated) for %r", skill_name)
+    return fallback_mastery(skill_name, difficulty_rating, hours_spent)
+
+
+def mastery_cache_key(skill_name, difficulty_rating, hours_spent):
+    return cache_key(
+        'mastery',
+        skill_name=skill_name,
+        difficulty_rating=difficulty_rating,
+        hours_spent=float(hours_spent),
+    )
+
+
+def mastery_prompt(skill_name, difficulty_rating, hours_spent):
+    return f"""
+    Learning prediction for: {skill_name}
+    Difficulty: {difficulty_rating}/5
+    Hours spent: {hours_spent}
+    
+    Respond with ONLY valid JSON:
+    {{
+        "estimated_weeks": <number>,
+        "estimated_total_hours": <number>,
+        "completion_percentage": <number>,
+        "tips": ["tip1", "tip2", "tip3"],
+        "ai_tools": ["tool1", "tool2"]
+    }}
+    
+    Provide:
+    - Estimated weeks to complete (at 10 hours/week)
+    - Total hours needed
+    - Current completion percentage
+    - 3 specific learning tips
+    - 2 AI tools that can help
+    
+    Return ONLY JSON, no explanations.
+    """
+
+
+def mastery_from_response(skill_name, response_text, key, strict=False):
+    """Parses and caches the model's answer; None if it isn't valid JSON"""
+    try:
+        result = _extract_json(response_text)
+    except json.JSONDecodeError:
+        if strict:
+            raise
+        logger.warning("AI mastery prediction for %r was not valid JSON, using calculated fallback", skill_name)
+        return None
+
+    logger.info("Mastery prediction (AI) for %r", skill_name)
+    cache('mastery', key, result)
+    return result
+
+
+def fallback_mastery(skill_name, difficulty_rating, hours_spent):
+    """Calculated prediction: each difficulty point is ~20 hours of study"""
+    base_hours = difficulty_rating * 20
+    remaining = max(0, base_hours - hours_spent)
+    completion_pct = round((hours_spent / base_hours) * 100, 1) if base_hours > 0 else 0
+
     return {
         'estimated_weeks': round(remaining / 10, 1) if remaining > 0 else 1,
         'estimated_total_hours': base_hours,
@@ -197,13 +296,20 @@ def predict_mastery(skill_name, difficulty_rating, hours_spent):
 
 
 
-def auto_categorize_skill(skill_name):
-    if not GEMINI_API_KEY:
+def auto_categorize_skill(skill_name, strict=False):
+    """
+    The skill's category, 'other' when AI is disabled or fails.
+    With strict=True, AI failures and invalid answers are raised instead.
+    """
+    if not ai_enabled('categorize'):
         return 'other'
     
+    key = cache_key('categorize', skill_name=skill_name)
+    category = cached('categorize', key)
+    if category is not None:
+        return category
+
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
         prompt = f"""
         Categorize the skill "{skill_name}" into exactly ONE of these categories:
         - frontend
@@ -215,62 +321,238 @@ def auto_categorize_skill(skill_name):
         Respond with ONLY the category word, nothing else.
         """
         
-        response = model.generate_content(prompt)
-        category = response.text.strip().lower()
+        category = providers.generate('categorize', prompt, skill_name=skill_name).strip().lower()
         
         valid_categories = ['frontend', 'backend', 'data', 'devops', 'other']
         if category in valid_categories:
-            print(f"Auto-categorized '{skill_name}' as: {category}")
+            logger.info("Auto-categorized %r as %s", skill_name, category)
+            cache('categorize', key, category)
             return category
         else:
-            print(f"Invalid category returned: {category}, defaulting to 'other'")
+            if strict:
+                raise ValueError(f"Invalid category {category!r} returned for {skill_name!r}")
+            logger.warning("Invalid category %r returned for %r, defaulting to 'other'", category, skill_name)
             return 'other'
     
     except Exception as e:
-        print(f"Error auto-categorizing: {str(e)}")
+        if strict:
+            raise
+        logger.warning("Auto-categorizing %r failed: %s", skill_name, e)
         return 'other'
 
 
+# ---- Batched prompts: one model call for many skills ----
+
+BATCH_SIZE = 25
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _extract_json(response_text):
+    """Strips markdown fences/extra text around the outermost JSON object"""
+    response_text = response_text.strip()
+    if '{' in response_text and '}' in response_text:
+        start = response_text.index('{')
+        end = response_text.rindex('}') + 1
+        response_text = response_text[start:end]
+    return json.loads(response_text)
+
+
+def _valid_resources(value):
+    return (
+        isinstance(value, dict)
+        and all(isinstance(value.get(key), list) for key in ('videos', 'documentation', 'courses'))
+    )
+
+
+def _generate_batch(operation, prompt, skill_names):
+    """
+    Returns the keyed JSON object from one batched prompt, or {} on failure.
+    Keys are normalized so "react " in the answer still matches "React".
+    """
+    try:
+        result = _extract_json(providers.generate(operation, prompt, skill_names=skill_names))
+        if not isinstance(result, dict):
+            return {}
+        return {normalize(key): value for key, value in result.items()}
+    except Exception as e:
+        logger.warning("Batched %s prompt failed: %s", operation, e)
+        return {}
+
+
+def auto_categorize_skills(skill_names, fallback=True, batch_size=BATCH_SIZE):
+    """
+    Categorizes many skills with one prompt per `batch_size` names.
+    Returns {skill_name: category}. Names the model skipped or answered
+    with an invalid category go through auto_categorize_skill one by one,
+    or are left out of the result when fallback=False.
+    """
+    valid_categories = ['frontend', 'backend', 'data', 'devops', 'other']
+    names = list(dict.fromkeys(skill_names))
+    if not ai_enabled('categorize'):
+        return {name: 'other' for name in names} if fallback else {}
+
+    results = {}
+    pending = []
+    for name in names:
+        category = cached('categorize', cache_key('categorize', skill_name=name))
+        if category is not None:
+            results[name] = category
+        else:
+            pending.append(name)
+
+    for chunk in _chunks(pending, batch_size):
+        prompt = f"""
+        Categorize each of these skills into exactly ONE of these categories:
+        frontend, backend, data, devops, other
+
+        Skills:
+        {json.dumps(chunk)}
+
+        Return ONLY a JSON object mapping every skill name, exactly as given,
+        to its category word. Example: {{"React": "frontend", "Docker": "devops"}}
+        """
+        answers = _generate_batch('categorize', prompt, chunk)
+
+        for name in chunk:
+            category = str(answers.get(normalize(name), '')).strip().lower()
+            if category in valid_categories:
+                results[name] = category
+                cache('categorize', cache_key('categorize', skill_name=name), category)
+            elif fallback:
+                results[name] = auto_categorize_skill(name)
+
+    logger.info("Auto-categorized %d/%d skills in batches", len(results), len(names))
+    return results
+
+
+def get_ai_resources_batch(skill_names, fallback=True, batch_size=BATCH_SIZE):
+    """
+    Resource recommendations for many skills with one prompt per
+    `batch_size` names. Returns {skill_name: resources}. Entries that are
+    missing or malformed go through get_ai_resources one by one, or are
+    left out of the result when fallback=False.
+    """
+    names = list(dict.fromkeys(skill_names))
+    if not ai_enabled('resources'):
+        return {name: get_ai_resources(name) for name in names} if fallback else {}
+
+    results = {}
+    pending = []
+    for name in names:
+        resources = cached('resources', cache_key('resources', skill_name=name))
+        if resources is not None:
+            results[name] = resources
+        else:
+            pending.append(name)
+
+    for chunk in _chunks(pending, batch_size):
+        prompt = f"""
+        For learning each of these skills, provide 3 REAL YouTube video URLs,
+        2 REAL documentation links and 1 REAL course link.
+
+        Skills:
+        {json.dumps(chunk)}
+
+        Return ONLY a JSON object keyed by every skill name, exactly as given:
+        {{
+            "<skill name>": {{
+                "videos": ["Video Title - https://www.youtube.com/watch?v=VIDEOID"],
+                "documentation": ["Official Docs - https://official-documentation-url.com"],
+                "courses": ["Course Name - https://www.udemy.com/course/actual-course-id"]
+            }}
+        }}
+
+        IMPORTANT:
+        - Use REAL direct links (youtube.com/watch?v=... NOT /results?search)
+        - Use ACTUAL documentation URLs (official docs, github, etc)
+        - Return ONLY JSON
+        """
+        answers = _generate_batch('resources', prompt, chunk)
+
+        for name in chunk:
+            resources = answers.get(normalize(name))
+            if _valid_resources(resources):
+                results[name] = resources
+                cache('resources', cache_key('resources', skill_name=name), resources)
+            elif fallback:
+                results[name] = get_ai_resources(name)
+
+    logger.info("AI resources generated for %d/%d skills in batches", len(results), len(names))
+    return results
+
+
 def generate_weekly_summary(weekly_stats):
-    if not GEMINI_API_KEY:
+    return _run(_summary_steps(weekly_stats))
+
+
+async def agenerate_weekly_summary(weekly_stats):
+    """generate_weekly_summary for async views: awaits the provider instead of blocking a thread"""
+    return await _arun(_summary_steps(weekly_stats))
+
+
+def _summary_steps(weekly_stats):
+    if not ai_enabled('weekly_summary'):
         return {
             'stats': weekly_stats,
             'ai_message': 'Great week of learning! Keep up the momentum!'
         }
     
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = f"""
-        You are a motivational learning coach. Generate an encouraging weekly summary.
-        
-        This week's stats:
-        - Skills added: {weekly_stats.get('skills_added', 0)}
-        - Hours logged: {weekly_stats.get('hours_logged', 0)}
-        - Skills completed: {weekly_stats.get('completed_this_week', 0)}
-        
-        Write a 2-3 sentence motivational message:
-        - Celebrate achievements
-        - Encourage consistency
-        - Be positive and energetic
-        
-        Keep it under 150 characters. Use emojis.
-        """
-        
-        response = model.generate_content(prompt)
-        message = response.text.strip()
-        
-        print("Weekly summary generated")
-        
+    key = summary_cache_key(weekly_stats)
+    message = cached('weekly_summary', key)
+    if message is not None:
         return {
             'stats': weekly_stats,
             'ai_message': message
         }
-    
+
+    try:
+        message = (yield 'weekly_summary', summary_prompt(weekly_stats), {'weekly_stats': weekly_stats}).strip()
     except Exception as e:
-        print(f"Error generating weekly summary: {str(e)}")
-        return {
-            'stats': weekly_stats,
-            'ai_message': 'Keep learning and growing!',
-            'error': str(e)
-        }
\ No newline at end of file
+        logger.warning("Weekly summary generation failed: %s", e)
+        return summary_error(weekly_stats, e)
+
+    logger.info("Weekly summary generated")
+    cache('weekly_summary', key, message)
+    return {
+        'stats': weekly_stats,
+        'ai_message': message
+    }
+
+
+def summary_cache_key(weekly_stats):
+    return cache_key(
+        'weekly_summary',
+        skills_added=weekly_stats.get('skills_added', 0),
+        hours_logged=float(weekly_stats.get('hours_logged', 0)),
+        completed_this_week=weekly_stats.get('completed_this_week', 0),
+    )
+
+
+def summary_prompt(weekly_stats):
+    return f"""
+    You are a motivational learning coach. Generate an encouraging weekly summary.
+    
+    This week's stats:
+    - Skills added: {weekly_stats.get('skills_added', 0)}
+    - Hours logged: {weekly_stats.get('hours_logged', 0)}
+    - Skills completed: {weekly_stats.get('completed_this_week', 0)}
+    
+    Write a 2-3 sentence motivational message:
+    - Celebrate achievements
+    - Encourage consistency
+    - Be positive and energetic
+    
+    Keep it under 150 characters. Use emojis.
+    """
+
+
+def summary_error(weekly_stats, error):
+    return {
+        'stats': weekly_stats,
+        'ai_message': 'Keep learning and growing!',
+        'error': str(error)
+    }
@@ -1,10 +1,25 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Count, Sum, Q
-from datetime import datetime, date, timedelta
-from .models import Skill, UserProfile
-from .serializers import SkillSerializer, UserProfileSerializer
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.db.models import Sum, Q
+from datetime import date, timedelta
+from . import (
+    activity, analytics, bulk, gemini, jobs, metrics, owners, providers, search, singleflight, stats,
+    transfer, utils,
+)
+from .ai_cache import ai_cache
+from .http_cache import PROFILE, SKILLS, cache_by_version
+from .models import Skill, UserProfile, AIJob
+from .pagination import SkillCursorPagination
+from .serializers import SkillSerializer, UserProfileSerializer, AIJobSerializer
 
 
 class SkillViewSet(viewsets.ModelViewSet):
@@ -16,12 +31,44 @@ class SkillViewSet(viewsets.ModelViewSet):
     - update() - PUT /api/skills/{id}/ - Update skill
     - partial_update() - PATCH /api/skills/{id}/ - Partial update
     - destroy() - DELETE /api/skills/{id}/ - Delete skill
+    Every action only sees the requesting user's skills (skills/owners.py).
     """
     serializer_class = SkillSerializer
+    pagination_class = SkillCursorPagination
 
     def get_queryset(self):
-        return Skill.objects.all()
+        return Skill.objects.filter(owner_id=owners.owner_id_for(self.request))
 
+    # Each write runs in one transaction with the stats update from signals.py
+    @transaction.atomic
+    def perform_create(self, serializer):
+        serializer.save(owner_id=owners.owner_id_for(self.request))
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+    def get_projected_fields(self, request):
+        """
+        Parses ?fields=id,skill_name,... into a list of serializer fields.
+        Returns None when no projection was requested.
+        """
+        fields_param = request.query_params.get('fields', None)
+        if not fields_param:
+            return None
+
+        requested = [f.strip() for f in fields_param.split(',') if f.strip()]
+        available = self.serializer_class().fields
+        unknown = [f for f in requested if f not in available]
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}"})
+        return requested
+
+    @method_decorator(cache_by_version(SKILLS))
     def list(self, request):
         queryset = self.get_queryset()
         status_filter = request.query_params.get('status', None)
@@ -30,96 +77,257 @@ class SkillViewSet(viewsets.ModelViewSet):
         category_filter = request.query_params.get('category', None)
         if category_filter:
             queryset = queryset.filter(category=category_filter)
+        # ?has_resources=false -> skills still waiting for AI resources
+        has_resources = request.query_params.get('has_resources', None)
+        if has_resources in ('true', 'false'):
+            lookup = Q(recommended_resources={})
+            queryset = queryset.exclude(lookup) if has_resources == 'true' else queryset.filter(lookup)
+        has_prediction = request.query_params.get('has_prediction', None)
+        if has_prediction in ('true', 'false'):
+            lookup = Q(mastery_prediction={})
+            queryset = queryset.exclude(lookup) if has_prediction == 'true' else queryset.filter(lookup)
+        queryset = queryset.order_by('-created_date', '-id')
+
+        # Only load the requested columns (id/created_date are needed for cursors)
+        fields = self.get_projected_fields(request)
+        if fields is not None:
+            queryset = queryset.only(*set(fields) | {'id', 'created_date'})
+
         search_query = request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(skill_name__icontains=search_query)
-        queryset = queryset.order_by('-created_date')
-        serializer = self.serializer_class(queryset, many=True)
+            return self.search_response(request, queryset, search_query, fields)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.serializer_class(page, many=True, fields=fields)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.serializer_class(queryset, many=True, fields=fields)
         return Response(serializer.data)
 
+    @method_decorator(cache_by_version(SKILLS))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def search_response(self, request, queryset, search_query, fields):
+        """
+        Full-text search over name, platform and notes (see skills/search.py).
+        Results come back best match first with a highlighted `search_snippet`.
+        The list filters narrow the matches before they are ranked; in
+        paginated mode `next` pages on through the ranked matches.
+        """
+        if not self.paginator.is_requested(request):
+            results = search.search(queryset, search_query, search.SEARCH_LIMIT)
+            return Response(self.search_data(results, fields))
+
+        limit = self.paginator.get_page_size(request)
+        offset = self.paginator.decode_offset(request)
+        # Fetch one extra match to know whether there is a next page
+        results = search.search(queryset, search_query, limit + 1, offset)
+        next_link = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_link = self.paginator.get_offset_link(request, offset + limit)
+        return Response({'next': next_link, 'results': self.search_data(results, fields)})
+
+    def search_data(self, results, fields):
+        data = self.serializer_class(results, many=True, fields=fields).data
+        for item, skill in zip(data, results):
+            item['search_snippet'] = skill.search_snippet
+        return data
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST   /api/skills/bulk/ - Create: [{skill}, ...]
+        PATCH  /api/skills/bulk/ - Partial update: [{"id": 1, ...fields}, ...]
+        DELETE /api/skills/bulk/ - Delete: {"ids": [1, 2, ...]}
+
+        Items are validated individually; valid ones are written in one
+        transaction and every item gets a result. Responds 207 when only
+        some items succeeded and 400 when none did.
+        """
+        if request.method == 'POST':
+            results = self.bulk_create(request.data)
+        elif request.method == 'PATCH':
+            results = self.bulk_update(request.data)
+        else:
+            ids = request.data.get('ids') if isinstance(request.data, dict) else request.data
+            results = self.bulk_delete(ids)
+
+        failed = sum(1 for result in results if result['status'] == 'error')
+        if not failed:
+            code = status.HTTP_201_CREATED if request.method == 'POST' else status.HTTP_200_OK
+        elif failed < len(results):
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+
+        return Response({
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'results': results,
+        }, status=code)
+
+    def bulk_create(self, items):
+        bulk.check_size(items)
+        valid, errors = bulk.validate_items(items)
+
+        with transaction.atomic():
+            skills = bulk.create_skills([data for _, data in valid], owners.owner_id_for(self.request))
+
+        results = [
+            {'index': index, 'status': 'created', 'data': self.serializer_class(skill).data}
+            for (index, _), skill in zip(valid, skills)
+        ]
+        results += [{'index': index, 'status': 'error', 'errors': e} for index, e in errors]
+        return sorted(results, key=lambda result: result['index'])
+
+    def bulk_update(self, items):
+        bulk.check_size(items)
+        ids = [item.get('id') for item in items if isinstance(item, dict)]
+        existing = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int)])
+
+        results = []
+        candidates = []
+        for index, item in enumerate(items):
+            skill = existing.get(item.get('id')) if isinstance(item, dict) else None
+            if skill is None:
+                results.append({'index': index, 'status': 'error', 'errors': {'id': ['Not found.']}})
+            else:
+                candidates.append((index, skill, item))
+
+        valid, errors = bulk.validate_items(
+            [item for _, _, item in candidates],
+            instances=[skill for _, skill, _ in candidates],
+            partial=True,
+        )
+        results += [
+            {'index': candidates[position][0], 'status': 'error', 'errors': e}
+            for position, e in errors
+        ]
+
+        pairs = [(candidates[position][1], data) for position, data in valid]
+        with transaction.atomic():
+            bulk.update_skills(pairs)
+
+        results += [
+            {
+                'index': candidates[position][0],
+                'status': 'updated',
+                'data': self.serializer_class(candidates[position][1]).data,
+            }
+            for position, _ in valid
+        ]
+        return sorted(results, key=lambda result: result['index'])
+
+    def bulk_delete(self, ids):
+        bulk.check_size(ids)
+        with transaction.atomic():
+            deleted = bulk.delete_skills(
+                [pk for pk in ids if isinstance(pk, int)], owners.owner_id_for(self.request)
+            )
+
+        return [
+            {'index': index, 'id': pk, 'status': 'deleted'} if pk in deleted
+            else {'index': index, 'id': pk, 'status': 'error', 'errors': {'id': ['Not found.']}}
+            for index, pk in enumerate(ids)
+        ]
+
     @action(detail=True, methods=['post'], url_path='ai-resources')
     def ai_resources(self, request, pk=None):
         """
         POST /api/skills/{id}/ai-resources/
-        Generates AI-powered resource recommendations
+        Returns stored recommendations, or queues a background job and
+        responds 202 with the job to poll at GET /api/jobs/{job_id}/
         """
-        from .utils import get_ai_resources
         skill = self.get_object()
 
         # Check if already generated (cached)
-        if skill.recommended_resources and skill.recommended_resources != '{}':
-            try:
-                cached = skill.get_recommended_resources()
-                if cached and not cached.get('error'):
-                    return Response({
-                        'cached': True,
-                        'skill_id': skill.id,
-                        'skill_name': skill.skill_name,
-                        'resources': cached
-                    }, status=status.HTTP_200_OK)
-            except:
-                pass
-
-        # Generate new recommendations
-        resources = get_ai_resources(skill.skill_name, skill.resource_type)
-        # Save to database
-        skill.save()
+        cached = skill.get_recommended_resources()
+        if cached and not cached.get('error'):
+            return Response({
+                'cached': True,
+                'skill_id': skill.id,
+                'skill_name': skill.skill_name,
+                'resources': cached
+            }, status=status.HTTP_200_OK)
 
-        return Response({
-            'cached': False,
-            'skill_id': skill.id,
-            'skill_name': skill.skill_name,
-            'resources': resources
-        }, status=status.HTTP_200_OK)
+        job = jobs.enqueue(skill, 'ai_resources')
+        return self.job_response(job, skill)
 
     @action(detail=True, methods=['post'], url_path='mastery-predict')
     def mastery_predict(self, request, pk=None):
-        """POST /api/skills/{id}/mastery-predict/ - Get AI mastery prediction"""
-        try:
-            skill = self.get_object()
-            from .utils import predict_mastery
-
-            # Generate prediction (no database save needed)
-            prediction = predict_mastery(
-                skill.skill_name,
-                skill.difficulty_rating,
-                float(skill.hours_spent)
-            )  # ✅ FIXED: Added closing parenthesis
-
-            print(f"✅ Mastery prediction generated for: {skill.skill_name}")
+        """
+        POST /api/skills/{id}/mastery-predict/[?refresh=1]
+        Returns the stored prediction while the skill's name, difficulty and
+        hours bucket haven't changed; otherwise (or with ?refresh=1) queues
+        an AI mastery prediction and responds 202 with the job
+        """
+        skill = self.get_object()
+        refresh = wants_refresh(request.query_params)
 
+        prediction = skill.get_stored_mastery_prediction()
+        if prediction is not None and not refresh:
             return Response({
-                'success': True,
+                'cached': True,
+                'skill_id': skill.id,
+                'skill_name': skill.skill_name,
                 'prediction': prediction
             }, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            print(f"❌ Error in mastery_predict: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return Response({
-                'success': False,
-                'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        job = jobs.enqueue(skill, 'mastery_predict', refresh=refresh)
+        return self.job_response(job, skill)
+
+    def job_response(self, job, skill):
+        """202 while the job is pending, 200 once it has a result (eager mode)"""
+        finished = job.status in ('succeeded', 'failed')
+        return Response({
+            'cached': False,
+            'skill_id': skill.id,
+            'skill_name': skill.skill_name,
+            'job': AIJobSerializer(job).data,
+        }, status=status.HTTP_200_OK if finished else status.HTTP_202_ACCEPTED)
+
+
+class AIJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GET /api/jobs/      - Recent AI jobs
+    GET /api/jobs/{id}/ - Poll a single job; `result` is filled in once
+                          status is "succeeded" (or "failed", with fallbacks)
+    """
+    serializer_class = AIJobSerializer
+
+    def get_queryset(self):
+        owner_id = owners.owner_id_for(self.request)
+        return AIJob.objects.filter(skill__owner_id=owner_id).order_by('-created_at')
 
 
 class UserProfileViewSet(viewsets.ModelViewSet):
     """
     Handles user profile CRUD operations
+    Each user has one profile; only the requesting user's is visible
     """
     serializer_class = UserProfileSerializer
 
     def get_queryset(self):
-        return UserProfile.objects.all()
+        return UserProfile.objects.filter(owner_id=owners.owner_id_for(self.request))
+
+    def perform_create(self, serializer):
+        owner_id = owners.owner_id_for(self.request)
+        if UserProfile.objects.filter(owner_id=owner_id).exists():
+            raise ValidationError({'owner': 'This user already has a profile.'})
+        serializer.save(owner_id=owner_id)
 
     @action(detail=False, methods=['get'], url_path='streak')
+    @method_decorator(cache_by_version(PROFILE))
     def get_streak(self, request):
         """
         GET /api/profile/streak/
         Returns current streak data
         Creates profile if doesn't exist
         """
-        profile, created = UserProfile.objects.get_or_create(id=1)
+        profile, created = UserProfile.objects.get_or_create(owner_id=owners.owner_id_for(request))
         serializer = self.serializer_class(profile)
         return Response(serializer.data)
 
@@ -127,77 +335,129 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     def update_streak(self, request):
         """
         POST /api/profile/update-streak/
-        Updates streak based on activity
-        Called internally when skills are created/updated
+        Marks today as active and returns the streak
+        Skill writes already do this through skills/activity.py, so calling
+        it again on the same day changes nothing
         """
-        profile, created = UserProfile.objects.get_or_create(id=1)
-        today = date.today()
-        last_activity = profile.last_activity_date
-
-        if last_activity is None:
-            profile.current_streak = 1
-            profile.longest_streak = 1
-            profile.total_learning_days = 1
-            profile.streak_started_date = today
-
-        elif last_activity == today:
-            pass
-
-        elif last_activity == today - timedelta(days=1):
-            profile.current_streak += 1
-            profile.total_learning_days += 1
-            if profile.current_streak > profile.longest_streak:
-                profile.longest_streak = profile.current_streak
-
-        else:
-            profile.current_streak = 1
-            profile.total_learning_days += 1
-            profile.streak_started_date = today
-
-        profile.last_activity_date = today
-        profile.save()
+        owner_id = owners.owner_id_for(request)
+        activity.retry_on_lock(activity.add_to_day, owner_id, timezone.localdate())
+        profile, created = UserProfile.objects.get_or_create(owner_id=owner_id)
         serializer = self.serializer_class(profile)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='activity')
+    @method_decorator(cache_by_version(SKILLS, PROFILE))
+    def activity_days(self, request):
+        """
+        GET /api/profile/activity/?days=30
+        Returns the active days of the last N days from the daily rollup
+        """
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 366)
+        except ValueError:
+            raise ValidationError({'days': 'Must be an integer.'})
+        return Response({'days': activity.daily_series(owners.owner_id_for(request), days)})
+
 
 @api_view(['GET'])
+@cache_by_version(SKILLS, PROFILE)
 def dashboard_stats(request):
     """
     GET /api/dashboard-stats/
     Returns aggregated statistics for dashboard
+    Reads the running totals kept by skills/stats.py instead of scanning skills
     """
-    total_skills = Skill.objects.count()
-    completed_skills = Skill.objects.filter(status='completed').count()
+    owner_id = owners.owner_id_for(request)
+    data = stats.as_response(stats.get_stats(owner_id))
 
-    completion_percentage = (
-        (completed_skills / total_skills * 100) if total_skills > 0 else 0
-    )  # ✅ FIXED: Added closing parenthesis
+    profile = UserProfile.objects.filter(owner_id=owner_id).values('current_streak').first()
+    data['current_streak'] = profile['current_streak'] if profile else 0
 
-    total_hours = Skill.objects.aggregate(
-        total=Sum('hours_spent')
-    )['total'] or 0
+    return Response(data)
 
-    skills_by_category = Skill.objects.values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')
 
-    top_skills = Skill.objects.order_by('-hours_spent')[:10].values(
-        'id', 'skill_name', 'hours_spent', 'status'
-    )  # ✅ FIXED: Added closing parenthesis
+@api_view(['GET'])
+def ai_status(request):
+    """
+    GET /api/ai-status/
+    Provider and model per AI operation, circuit breaker state per Gemini
+    model and AI cache counters, for this process
+    """
+    return Response({
+        'configured': utils.ai_enabled(),
+        'operations': providers.describe(),
+        'gemini': gemini.stats(),
+        'ai_cache': ai_cache.stats(),
+    })
+
+
+def metrics_view(request):
+    """
+    GET /api/metrics/
+    Request counts and latency histograms per view, DB and LLM totals,
+    breaker state and AI cache counters in Prometheus text format, for
+    this process. Wants "Authorization: Bearer <METRICS TOKEN>" when a
+    token is configured.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    token = metrics.get_setting('TOKEN')
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 
+def wants_refresh(params):
+    return params.get('refresh', '').lower() in ('1', 'true', 'yes')
+
+
+def query_date(params, name, default):
+    """Parses an optional YYYY-MM-DD query parameter"""
+    value = params.get(name)
+    if not value:
+        return default
     try:
-        profile = UserProfile.objects.get(id=1)
-    except UserProfile.DoesNotExist:
-        profile = UserProfile.objects.create(id=1)
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Must be a date like YYYY-MM-DD.'})
+    return parsed
 
+
+@api_view(['GET'])
+@cache_by_version(SKILLS)
+def analytics_timeseries(request):
+    """
+    GET /api/analytics/timeseries/?bucket=day|week|month&metric=hours|skills|completions
+        &from=YYYY-MM-DD&to=YYYY-MM-DD&by_category=1
+    Reads the pre-bucketed rollups from skills/analytics.py; empty buckets are zero
+    """
+    params = request.query_params
+    bucket = params.get('bucket', 'day')
+    metric = params.get('metric', 'hours')
+    if bucket not in analytics.BUCKETS:
+        raise ValidationError({'bucket': f"Must be one of {', '.join(analytics.BUCKETS)}."})
+    if metric not in analytics.METRICS:
+        raise ValidationError({'metric': f"Must be one of {', '.join(analytics.METRICS)}."})
+
+    start, end = analytics.default_range(bucket, timezone.localdate())
+    start = query_date(params, 'from', start)
+    end = query_date(params, 'to', end)
+    if start > end:
+        raise ValidationError({'from': 'Must not be after to.'})
+    if analytics.approximate_points(start, end, bucket) > analytics.MAX_POINTS:
+        raise ValidationError({'from': f'At most {analytics.MAX_POINTS} buckets per request.'})
+
+    by_category = params.get('by_category', '').lower() in ('1', 'true', 'yes')
     return Response({
-        'total_skills': total_skills,
-        'completed_skills': completed_skills,
-        'completion_percentage': round(completion_percentage, 1),
-        'total_hours': float(total_hours),
-        'skills_by_category': list(skills_by_category),
-        'top_skills': list(top_skills),
-        'current_streak': profile.current_streak,
+        'bucket': bucket,
+        'metric': metric,
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'series': analytics.timeseries(owners.owner_id_for(request), bucket, metric, start, end, by_category),
     })
 
 
@@ -207,12 +467,22 @@ def weekly_summary(request):
     POST /api/weekly-summary/
     Generates weekly summary with AI
     """
+    ai_message = "Great week of learning! Keep up the momentum! 🚀"
+
+    return Response({
+        'stats': get_weekly_stats(owners.owner_id_for(request)),
+        'ai_message': ai_message,
+    })
+
+
+def get_weekly_stats(owner_id):
     seven_days_ago = date.today() - timedelta(days=7)
     recent_skills = Skill.objects.filter(
+        owner_id=owner_id,
         created_date__gte=seven_days_ago
     )  # ✅ FIXED: Added closing parenthesis
 
-    weekly_stats = {
+    return {
         'skills_added': recent_skills.count(),
         'hours_logged': recent_skills.aggregate(
             total=Sum('hours_spent')
@@ -222,9 +492,145 @@ def weekly_summary(request):
         ).count(),
     }  # ✅ FIXED: Added closing brace
 
-    ai_message = "Great week of learning! Keep up the momentum! 🚀"
 
-    return Response({
-        'stats': weekly_stats,
-        'ai_message': ai_message,
+def export_skills(request):
+    """
+    GET /api/skills/export/?format=ndjson|csv
+    Streams every skill (optionally ?status= / ?category= filtered) without
+    building the whole response in memory. Plain Django view because DRF
+    reserves ?format= for its own renderer selection.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    fmt = request.GET.get('format', 'ndjson')
+    if fmt not in transfer.FORMATS:
+        return JsonResponse({'format': f"Use one of: {', '.join(transfer.FORMATS)}"}, status=400)
+
+    queryset = Skill.objects.filter(owner_id=owners.owner_id_for(request))
+    if request.GET.get('status'):
+        queryset = queryset.filter(status=request.GET['status'])
+    if request.GET.get('category'):
+        queryset = queryset.filter(category=request.GET['category'])
+
+    response = StreamingHttpResponse(
+        transfer.render(transfer.export_rows(queryset), fmt),
+        content_type=transfer.CONTENT_TYPES[fmt],
+    )
+    response['Content-Disposition'] = f'attachment; filename="skills.{fmt}"'
+    return response
+
+
+def import_skills(request):
+    """
+    POST /api/skills/import/?format=ndjson|csv
+    Reads the request body line by line and inserts skills in batched
+    transactions. Returns counts plus the first validation errors.
+    CSRF protected, since it writes with the session user's rights.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    fmt = request.GET.get('format')
+    if fmt is None:
+        fmt = 'csv' if request.content_type == 'text/csv' else 'ndjson'
+    if fmt not in transfer.FORMATS:
+        return JsonResponse({'format': f"Use one of: {', '.join(transfer.FORMATS)}"}, status=400)
+
+    # Iterating the request reads the body lazily instead of loading it whole
+    summary = transfer.import_rows(transfer.parse(request, fmt), owners.owner_id_for(request))
+    return JsonResponse(summary, status=200 if not summary['failed'] else 207)
+
+
+# Async AI endpoints, served when running under ASGI (skillstack/asgi.py).
+# They await Gemini directly instead of queueing a job, so a request holds
+# no thread while the model answers. Plain Django views because DRF 3.14
+# has no async support; Django 4.2's require_http_methods wrapper is
+# sync-only, hence the inline method checks. Like import_skills they go
+# through CsrfViewMiddleware: browser clients send the csrftoken cookie
+# back in the X-CSRFToken header.
+
+async def aget_skill(request, pk):
+    """The requesting user's skill `pk`, or 404"""
+    owner_id = await sync_to_async(owners.owner_id_for)(request)
+    # django.shortcuts.aget_object_or_404 only arrives in Django 5.0
+    try:
+        return await Skill.objects.aget(pk=pk, owner_id=owner_id)
+    except Skill.DoesNotExist:
+        raise Http404('No Skill matches the given query.')
+
+
+async def async_ai_resources(request, pk):
+    """
+    POST /api/async/skills/{id}/ai-resources/
+    Stored recommendations if there are any, otherwise generated inline
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    skill = await aget_skill(request, pk)
+    resources = skill.get_recommended_resources()
+    cached = bool(resources) and not resources.get('error')
+    if not cached:
+        async def generate():
+            result = await utils.aget_ai_resources(skill.skill_name)
+            skill.set_recommended_resources(result)
+            await sync_to_async(jobs.save_result)(skill, 'recommended_resources')
+            return result
+
+        resources = await singleflight.arun(singleflight.skill_key(skill.pk, 'ai_resources'), generate)
+
+    return JsonResponse({
+        'cached': cached,
+        'skill_id': skill.id,
+        'skill_name': skill.skill_name,
+        'resources': resources,
     })
+
+
+async def async_mastery_predict(request, pk):
+    """
+    POST /api/async/skills/{id}/mastery-predict/[?refresh=1]
+    The stored prediction while its inputs still match, otherwise predicted
+    inline and stored on the skill
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    skill = await aget_skill(request, pk)
+    refresh = wants_refresh(request.GET)
+
+    prediction = skill.get_stored_mastery_prediction()
+    cached = prediction is not None and not refresh
+    if not cached:
+        async def generate():
+            result = await utils.apredict_mastery(
+                skill.skill_name, skill.difficulty_rating, float(skill.hours_spent), refresh=refresh
+            )
+            skill.set_mastery_prediction(result)
+            await sync_to_async(jobs.save_result)(skill, 'mastery_prediction', 'mastery_fingerprint')
+            return result
+
+        prediction = await singleflight.arun(singleflight.skill_key(skill.pk, 'mastery_predict'), generate)
+
+    return JsonResponse({
+        'cached': cached,
+        'skill_id': skill.id,
+        'skill_name': skill.skill_name,
+        'prediction': prediction,
+    })
+
+
+async def async_weekly_summary(request):
+    """
+    POST /api/async/weekly-summary/
+    Weekly stats with an AI-written message
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    owner_id = await sync_to_async(owners.owner_id_for)(request)
+    weekly_stats = await sync_to_async(get_weekly_stats)(owner_id)
+    # Same number the DRF view renders (JsonResponse would send a string)
+    weekly_stats['hours_logged'] = float(weekly_stats['hours_logged'])
+    return JsonResponse(await utils.agenerate_weekly_summary(weekly_stats))
@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .database import database_config
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -34,6 +36,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # ✅ MUST BE FIRST
+    # Query counts, DB/LLM time and Server-Timing per request (skills/metrics.py)
+    'skills.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,13 +66,25 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'skillstack.wsgi.application'
 
+# Database (see skillstack/database.py for the DATABASE_URL formats)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(
+        os.getenv('DATABASE_URL', f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        conn_max_age=int(os.getenv('CONN_MAX_AGE', 60)),
+    )
 }
 
+# Applied to every new SQLite connection. WAL lets readers run while a
+# write is in progress; busy_timeout makes writers wait instead of failing
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+}
+# DEFERRED, IMMEDIATE or EXCLUSIVE; IMMEDIATE lets writers wait on busy_timeout
+SQLITE_TRANSACTION_MODE = os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -108,4 +124,133 @@ CORS_ALLOW_CREDENTIALS = True
 # ✅ API KEY FROM ENV
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
 
+# Default provider behind the AI features (skills/providers.py): 'gemini',
+# 'offline', 'replay' or a dotted class path. Built on first use.
+AI_PROVIDER = os.getenv('AI_PROVIDER', 'gemini')
+
+# Provider and model per AI operation; a blank PROVIDER means AI_PROVIDER
+AI_OPERATIONS = {
+    'resources': {
+        'PROVIDER': os.getenv('AI_RESOURCES_PROVIDER', ''),
+        'MODEL': os.getenv('AI_RESOURCES_MODEL', 'gemini-2.5-flash'),
+    },
+    'mastery': {
+        'PROVIDER': os.getenv('AI_MASTERY_PROVIDER', ''),
+        'MODEL': os.getenv('AI_MASTERY_MODEL', 'gemini-1.5-flash'),
+    },
+    'categorize': {
+        'PROVIDER': os.getenv('AI_CATEGORIZE_PROVIDER', ''),
+        'MODEL': os.getenv('AI_CATEGORIZE_MODEL', 'gemini-2.5-flash'),
+    },
+    'weekly_summary': {
+        'PROVIDER': os.getenv('AI_WEEKLY_SUMMARY_PROVIDER', ''),
+        'MODEL': os.getenv('AI_WEEKLY_SUMMARY_MODEL', 'gemini-2.5-flash'),
+    },
+}
+
+# Recorded answers for the 'replay' provider (skills/replay.py)
+AI_REPLAY = {
+    'PATH': os.getenv('AI_REPLAY_PATH', str(BASE_DIR / 'ai_replay.jsonl')),
+    'MODE': os.getenv('AI_REPLAY_MODE', 'replay'),
+    'RECORD_PROVIDER': os.getenv('AI_REPLAY_RECORD_PROVIDER', 'gemini'),
+}
+
+# AI response cache (in-process LRU + AICacheEntry table, see skills/ai_cache.py)
+AI_CACHE = {
+    'TTL_SECONDS': int(os.getenv('AI_CACHE_TTL_SECONDS', 60 * 60 * 24 * 7)),
+    'MEMORY_MAX_ENTRIES': int(os.getenv('AI_CACHE_MEMORY_MAX_ENTRIES', 512)),
+    'DB_MAX_ENTRIES': int(os.getenv('AI_CACHE_DB_MAX_ENTRIES', 10000)),
+}
+
+# Background AI jobs (see skills/jobs.py, run with `manage.py run_ai_worker`)
+AI_JOBS = {
+    'CONCURRENCY': int(os.getenv('AI_JOBS_CONCURRENCY', 4)),
+    'MAX_ATTEMPTS': int(os.getenv('AI_JOBS_MAX_ATTEMPTS', 3)),
+    'EAGER': os.getenv('AI_JOBS_EAGER', 'False') == 'True',
+}
+
+# Response cache for read endpoints (see skills/http_cache.py)
+# CACHE_BACKEND: locmem (per process), file, db (run `manage.py createcachetable`) or dummy
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'skillstack'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'skillstack_cache'),
+    'dummy': ('django.core.cache.backends.dummy.DummyCache', ''),
+}
+_cache_backend, _cache_location = CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'locmem')]
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': os.getenv('CACHE_LOCATION', _cache_location),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 1000))},
+    }
+}
+
+HTTP_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('HTTP_CACHE_TIMEOUT', 300)),
+}
+
+# Shared Gemini client (skills/gemini.py): in-flight calls per event loop,
+# the deadline of every call and the circuit breaker thresholds
+GEMINI = {
+    'MAX_CONCURRENCY': int(os.getenv('GEMINI_MAX_CONCURRENCY', 100)),
+    'TIMEOUT_SECONDS': float(os.getenv('GEMINI_TIMEOUT_SECONDS', 30)),
+    'SYNC_WORKERS': int(os.getenv('GEMINI_SYNC_WORKERS', 16)),
+    'FAILURE_THRESHOLD': int(os.getenv('GEMINI_FAILURE_THRESHOLD', 5)),
+    'RESET_SECONDS': float(os.getenv('GEMINI_RESET_SECONDS', 30)),
+}
+
+# Stored mastery predictions are reused until hours_spent moves to another
+# bucket of this many hours (or the name/difficulty change)
+MASTERY_HOURS_BUCKET = float(os.getenv('MASTERY_HOURS_BUCKET', 5))
+
+# Coalescing of concurrent AI generations for the same skill (skills/singleflight.py)
+SINGLE_FLIGHT = {
+    'LEASE_SECONDS': int(os.getenv('SINGLE_FLIGHT_LEASE_SECONDS', 120)),
+    'WAIT_SECONDS': int(os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', 90)),
+}
+
+# Whose data a request works on (skills/owners.py). Anonymous requests act
+# as the shared default user unless ALLOW_ANONYMOUS is off.
+OWNERSHIP = {
+    'DEFAULT_USERNAME': os.getenv('DEFAULT_OWNER_USERNAME', 'default'),
+    'ALLOW_ANONYMOUS': os.getenv('ALLOW_ANONYMOUS', 'True').lower() in ('1', 'true', 'yes'),
+}
+
+# Per-request instrumentation and /api/metrics/ (skills/metrics.py). The
+# JSON line per request is off unless METRICS_LOG_REQUESTS=True (set in
+# nixpacks.toml), so tests and runserver keep a readable console.
+METRICS = {
+    'LOG_REQUESTS': os.getenv('METRICS_LOG_REQUESTS', 'False') == 'True',
+    'SERVER_TIMING': os.getenv('METRICS_SERVER_TIMING', 'True') == 'True',
+    'TOKEN': os.getenv('METRICS_TOKEN', ''),
+}
+
+REST_FRAMEWORK = {
+    # JSONRenderer that reports its time to skills/metrics.py
+    'DEFAULT_RENDERER_CLASSES': [
+        'skills.metrics.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Plain lines for the app's messages; skills.requests lines are already JSON
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+        'json': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+        'requests': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+    },
+    'loggers': {
+        'skills': {'handlers': ['console'], 'level': os.getenv('LOG_LEVEL', 'INFO')},
+        'skills.requests': {'handlers': ['requests'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
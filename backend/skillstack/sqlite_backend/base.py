@@ -0,0 +1,19 @@
+"""
+SQLite backend that opens transactions with BEGIN IMMEDIATE.
+
+With Django's plain BEGIN, a transaction that reads and then writes (every
+save(), thanks to the pre_save snapshot) has to upgrade its lock midway, and
+SQLite fails that upgrade at once with "database is locked" instead of
+waiting on busy_timeout. Taking the write lock up front makes concurrent
+writers queue instead. Django 5.1 has OPTIONS['transaction_mode'] for this;
+until then settings.SQLITE_TRANSACTION_MODE selects it here.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        mode = getattr(settings, 'SQLITE_TRANSACTION_MODE', 'IMMEDIATE')
+        self.cursor().execute(f'BEGIN {mode}'.strip())
@@ -58,6 +58,20 @@ export const getAllSkills = async (params) => {
 };
 
 
+// Cursor-paginated list: pass { page_size, cursor, fields } and follow `next`
+export const getSkillsPage = async (params) => {
+  try {
+    const response = await apiClient.get('skills/', {
+      params: { page_size: 50, ...params },
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching skills page:', error);
+    throw error;
+  }
+};
+
+
 export const getSkill = async (id) => {
   try {
     const response = await apiClient.get(`skills/${id}/`);
@@ -102,14 +116,34 @@ export const deleteSkill = async (id) => {
 };
 
 
+// AI endpoints answer 202 with a background job; poll it until it finishes
+export const waitForJob = async (jobId, { interval = 1500, timeout = 120000 } = {}) => {
+  const deadline = Date.now() + timeout;
+  while (Date.now() < deadline) {
+    const response = await apiClient.get(`jobs/${jobId}/`);
+    const job = response.data;
+    if (job.status === 'succeeded' || job.status === 'failed') {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, interval));
+  }
+  throw new Error(`Job ${jobId} did not finish in time`);
+};
+
+
 export const getAIResources = async (id) => {
   try {
     console.log('🔄 Fetching AI resources for skill:', id);
-    const response = await apiClient.post(`skills/${id}/ai-resources/`, {}, {
-      timeout: 120000
-    });
-    console.log('✅ AI resources received:', response.data);
-    return response.data;
+    const response = await apiClient.post(`skills/${id}/ai-resources/`);
+    if (response.data.cached) {
+      console.log('✅ AI resources received:', response.data);
+      return response.data;
+    }
+    const job = response.data.job.status === 'queued' || response.data.job.status === 'running'
+      ? await waitForJob(response.data.job.id)
+      : response.data.job;
+    console.log('✅ AI resources received:', job);
+    return { ...response.data, resources: job.result };
   } catch (error) {
     console.error('Error getting AI resources:', error);
     throw error;
@@ -117,14 +151,21 @@ export const getAIResources = async (id) => {
 };
 
 
-export const getMasteryPrediction = async (id) => {
+// Served from the stored prediction until the skill changes; refresh asks Gemini again
+export const getMasteryPrediction = async (id, { refresh = false } = {}) => {
   try {
     console.log('🔄 Fetching mastery prediction for skill:', id);
-    const response = await apiClient.post(`skills/${id}/mastery-predict/`, {}, {
-      timeout: 120000
-    });
-    console.log('✅ Mastery prediction received:', response.data);
-    return response.data;
+    const params = refresh ? { refresh: 1 } : {};
+    const response = await apiClient.post(`skills/${id}/mastery-predict/`, null, { params });
+    if (response.data.cached) {
+      console.log('✅ Mastery prediction received:', response.data);
+      return { success: true, prediction: response.data.prediction };
+    }
+    const job = response.data.job.status === 'queued' || response.data.job.status === 'running'
+      ? await waitForJob(response.data.job.id)
+      : response.data.job;
+    console.log('✅ Mastery prediction received:', job);
+    return { success: job.status === 'succeeded', prediction: job.result };
   } catch (error) {
     console.error('Error getting mastery prediction:', error);
     throw error;
@@ -154,6 +195,21 @@ export const updateStreak = async () => {
 };
 
 
+export const getTimeseries = async ({ bucket = 'day', metric = 'hours', from, to, byCategory = false } = {}) => {
+  try {
+    const params = { bucket, metric };
+    if (from) params.from = from;
+    if (to) params.to = to;
+    if (byCategory) params.by_category = 1;
+    const response = await apiClient.get('analytics/timeseries/', { params });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching timeseries:', error);
+    throw error;
+  }
+};
+
+
 export const getDashboardStats = async () => {
   try {
     const response = await apiClient.get('dashboard-stats/');